@@ -28,6 +28,7 @@ class Config:
     HIBP_API_KEY = os.getenv('HIBP_API_KEY')  # $3.50/month - optional
     SHODAN_API_KEY = os.getenv('SHODAN_API_KEY')  # $59/month - optional
     SERPAPI_API_KEY = os.getenv('SERPAPI_API_KEY')  # For enhanced search capabilities
+    GNEWS_API_KEY = os.getenv('GNEWS_API_KEY')  # Batched news search - optional
     
     # Still needed
     WAPPALYZER_API_KEY = os.getenv('WAPPALYZER_API_KEY')
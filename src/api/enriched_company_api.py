@@ -184,8 +184,9 @@ async def clay_webhook_trigger(request_data: Dict):
         
         # 1. SERPAPI breach search first (fastest, highest value)
         try:
+            # check_* methods return Signal records; the response carries plain dicts
             serpapi_signals = company_analyzer.check_breach_mentions_serpapi(company_dict)
-            signals.extend(serpapi_signals)
+            signals.extend(signal.to_dict() for signal in serpapi_signals)
             analysis_results["serpapi_breach_search"] = {"executed": True, "signals": len(serpapi_signals), "status": "success"}
             logger.info(f"SERPAPI check completed for {enriched_data.company_name}: {len(serpapi_signals)} signals")
         except Exception as e:
@@ -196,7 +197,7 @@ async def clay_webhook_trigger(request_data: Dict):
         if time.time() - start_time < 8.0:  # Only if under 8 seconds total
             try:
                 hibp_signals = company_analyzer.check_hibp_breaches(company_dict)
-                signals.extend(hibp_signals)
+                signals.extend(signal.to_dict() for signal in hibp_signals)
                 analysis_results["hibp_breach_check"] = {"executed": True, "signals": len(hibp_signals), "status": "success"}
                 logger.info(f"HIBP check completed for {enriched_data.company_name}: {len(hibp_signals)} signals")
             except Exception as e:
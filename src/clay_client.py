@@ -1,8 +1,10 @@
 import requests
+import threading
 import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import json
+import orjson
 
 class ClayClient:
     def __init__(self, api_key: str, workspace: str):
@@ -29,6 +31,30 @@ class ClayClient:
         response = requests.post(url, headers=self.headers, json=data)
         return response.json()
     
+    def add_rows(self, table_name: str, rows: List[Dict],
+                 batch_size: int = 50) -> List[Dict]:
+        """Add rows to table in batches of batch_size (one request per batch)
+
+        Every batch is attempted; if any is rejected, raises HTTPError with the
+        number of rows that were not added.
+        """
+        url = f"{self.base_url}/tables/{table_name}/rows/bulk"
+        results = []
+        failed_rows = 0
+        for i in range(0, len(rows), batch_size):
+            self.rate_limiter.wait_if_needed()
+            payload = {"rows": rows[i:i + batch_size]}
+            response = requests.post(url, headers=self.headers, data=orjson.dumps(payload))
+            if not response.ok:
+                failed_rows += len(payload["rows"])
+                continue
+            results.append(response.json())
+        if failed_rows:
+            raise requests.HTTPError(
+                f"{failed_rows} of {len(rows)} rows were not added to {table_name}"
+            )
+        return results
+    
     def bulk_upsert(self, table_name: str, rows: List[Dict], 
                     unique_key: str = 'domain') -> Dict:
         """Bulk upsert rows with deduplication"""
@@ -39,14 +65,18 @@ class ClayClient:
             "unique_key": unique_key,
             "update_existing": True
         }
-        response = requests.post(url, headers=self.headers, json=payload)
+        response = requests.post(url, headers=self.headers, data=orjson.dumps(payload))
         return response.json()
     
-    def query_table(self, table_name: str, filters: Dict) -> List[Dict]:
-        """Query table with filters"""
+    def query_table(self, table_name: str, filters: Dict,
+                    projection: Optional[List[str]] = None) -> List[Dict]:
+        """Query table with filters, optionally returning only the projected columns"""
         self.rate_limiter.wait_if_needed()
         url = f"{self.base_url}/tables/{table_name}/query"
-        response = requests.post(url, headers=self.headers, json=filters)
+        payload = dict(filters)
+        if projection:
+            payload['fields'] = projection
+        response = requests.post(url, headers=self.headers, json=payload)
         return response.json().get('rows', [])
     
     def trigger_webhook(self, webhook_url: str, data: Dict) -> bool:
@@ -199,16 +229,19 @@ class RateLimiter:
         self.calls = calls
         self.period = period
         self.timestamps = []
+        # Collectors call Clay from worker threads; waiters queue on the lock
+        self._lock = threading.Lock()
     
     def wait_if_needed(self):
         """Wait if rate limit would be exceeded"""
-        now = time.time()
-        # Remove timestamps outside the period
-        self.timestamps = [t for t in self.timestamps if now - t < self.period]
-        
-        if len(self.timestamps) >= self.calls:
-            sleep_time = self.period - (now - self.timestamps[0]) + 0.1
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-        
-        self.timestamps.append(time.time())
\ No newline at end of file
+        with self._lock:
+            now = time.time()
+            # Remove timestamps outside the period
+            self.timestamps = [t for t in self.timestamps if now - t < self.period]
+            
+            if len(self.timestamps) >= self.calls:
+                sleep_time = self.period - (now - self.timestamps[0]) + 0.1
+                if sleep_time > 0:
+                    time.sleep(sleep_time)
+            
+            self.timestamps.append(time.time())
\ No newline at end of file
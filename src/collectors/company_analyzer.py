@@ -4,22 +4,174 @@ Analyzes companies already in Clay database for pain signals
 """
 
 import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple, Union
+import gzip
+import hashlib
+import hmac
+import http.client
+from itertools import repeat
 import json
+import logging
+import orjson
+import os
 import re
+import ssl
+import threading
 import time
+from urllib.parse import urljoin, urlparse
 from config.settings import config
+from .http_session import create_session
+from .rate_limit import AdaptiveRateLimiter
+from .signal import Signal
+from .ttl_cache import DiskTTLCache
+
+try:
+    import ahocorasick  # pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+logger = logging.getLogger(__name__)
+
+# Caches and dead-domain state live in <project root>/data, whatever the working directory
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'data'
+)
+
+# Company-name keywords -> (high-risk industry, compliance requirement)
+NAME_KEYWORDS = {
+    'healthcare': (True, 'hipaa_compliance_required'),
+    'medical': (True, 'hipaa_compliance_required'),
+    'hospital': (True, 'hipaa_compliance_required'),
+    'clinic': (True, None),
+    'financial': (True, 'financial_compliance_required'),
+    'bank': (True, 'financial_compliance_required'),
+    'credit': (True, 'financial_compliance_required'),
+    'insurance': (True, None),
+    'government': (True, 'government_compliance_required'),
+    'municipal': (True, 'government_compliance_required'),
+    'utilities': (True, None),
+    'energy': (True, None)
+}
+COMPLIANCE_ORDER = [
+    'hipaa_compliance_required',
+    'financial_compliance_required',
+    'government_compliance_required'
+]
+
+# Insurance risk = base score + weight of each factor present, capped at 1.0
+INSURANCE_RISK_BASE = 0.3
+INSURANCE_RISK_WEIGHTS = {
+    'high_risk_industry': 0.2,
+    'large_company': 0.2,  # larger = more risk
+    'recent_security_issues': 0.3
+}
+
+# Response headers (lowercased) that count as baseline security hardening
+SECURITY_HEADERS = frozenset({
+    'strict-transport-security',
+    'x-content-type-options',
+    'x-frame-options',
+    'x-xss-protection'
+})
+
+# Redirect statuses the security probe follows (once, within the same site)
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+
+def _build_name_automaton():
+    """Build an Aho-Corasick automaton over NAME_KEYWORDS (None if pyahocorasick is missing)"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword, tags in NAME_KEYWORDS.items():
+        automaton.add_word(keyword, tags)
+    automaton.make_automaton()
+    return automaton
+
+# Aho-Corasick is preferred; without pyahocorasick, one precompiled alternation
+# still keeps the keyword scan in C
+_NAME_AUTOMATON = _build_name_automaton()
+_NAME_KEYWORD_RE = re.compile('|'.join(re.escape(keyword) for keyword in NAME_KEYWORDS))
+
+@lru_cache(maxsize=100_000)
+def _classify_name(name_lower: str) -> Tuple[bool, Tuple[str, ...]]:
+    """(high-risk industry, ordered compliance tags) for a lowercased company name"""
+    if _NAME_AUTOMATON is not None:
+        hits = [tags for _, tags in _NAME_AUTOMATON.iter(name_lower)]
+    else:
+        hits = [NAME_KEYWORDS[match] for match in _NAME_KEYWORD_RE.findall(name_lower)]
+    
+    compliance = {compliance_tag for _, compliance_tag in hits if compliance_tag}
+    return (
+        any(high_risk for high_risk, _ in hits),
+        tuple(tag for tag in COMPLIANCE_ORDER if tag in compliance)
+    )
 
 class CompanyAnalyzer:
     """Analyzes existing companies in Clay database for pain signals"""
     
+    # Stop analyzing a company once any method yields a signal this strong
+    EARLY_EXIT_SIGNAL_STRENGTH = 0.8
+    
+    # Domains with no signals skip the network lookups for this long
+    DEAD_DOMAIN_TTL_DAYS = 90
+    
+    # company_universe columns the analysis methods actually read
+    ANALYSIS_COLUMNS = ['domain', 'company_name', 'employee_count', 'last_analysis']
+    
+    # Starting requests/second per API host; adjusted at runtime on throttling
+    HOST_RATES = {
+        'haveibeenpwned.com': 1.0,
+        'serpapi.com': 3.0,
+        'news.google.com': 1.0,
+        'api.github.com': 3.0,
+        'www.linkedin.com': 0.5
+    }
+    MAX_THROTTLE_RETRIES = 2
+    MAX_RETRY_AFTER = 60  # seconds
+    
+    # Companies analyzed concurrently within a batch
+    BATCH_CONCURRENCY = 8
+    
+    # TLS version and response headers change slowly; reuse probes for a day
+    PROBE_CACHE_TTL = 86400  # seconds
+    PROBE_CACHE_MAX_ENTRIES = 100_000
+    
     def __init__(self, clay_client):
         self.clay_client = clay_client
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'BTA-CompanyAnalyzer/1.0'
-        })
+        # One pooled session for API calls, header probes and webhook posts
+        self.session = create_session(
+            'BTA-CompanyAnalyzer/1.0',
+            pool_maxsize=self.BATCH_CONCURRENCY * 2
+        )
+        self.rate_limiter = AdaptiveRateLimiter(initial_rates=self.HOST_RATES)
+        
+        # TLS/header probe results shared across runs
+        self.probe_cache = DiskTTLCache(os.path.join(DATA_DIR, 'probe_cache.db'), self.PROBE_CACHE_TTL,
+                                        max_entries=self.PROBE_CACHE_MAX_ENTRIES)
+        
+        # Trust store loaded once; anything below TLS 1.2 counts as insecure anyway,
+        # so the handshake never negotiates it
+        self._ssl_ctx = ssl.create_default_context()
+        self._ssl_ctx.minimum_version = ssl.TLSVersion.TLSv1_2
+        
+        # domain -> has recent pain signals, populated per batch
+        self._recent_signals_cache: Optional[Dict[str, bool]] = None
+        
+        # company_universe "analyzed" updates, written in bulk by flush_analyzed
+        self._analyzed_buffer: List[Dict] = []
+        self._analyzed_lock = threading.Lock()
+        
+        # Webhook HMAC keyed once; each payload signs a copy of it
+        self._hmac_template = None
+        if config.CLAY_WEBHOOK_SECRET:
+            self._hmac_template = hmac.new(
+                config.CLAY_WEBHOOK_SECRET.encode(),
+                digestmod=hashlib.sha256
+            )
         
         # Initialize Shodan if API key available
         self.shodan_monitor = None
@@ -27,61 +179,134 @@ class CompanyAnalyzer:
             from .shodan_monitor import ShodanMonitor
             self.shodan_monitor = ShodanMonitor(config.SHODAN_API_KEY)
         
-        # Analysis methods (REACTIVE ONLY)
+        # Analysis methods (REACTIVE ONLY), in execution order: cheap/cached first
         self.analysis_methods = [
             'hibp_breach_check',           # Moved from proactive
-            'github_exposure_check',       # Moved from proactive
-            'breach_mention_search',       # Google News search
             'serpapi_breach_search',       # SERPAPI news search (enhanced)
+            'breach_mention_search',       # Google News search (SERPAPI fallback)
+            'github_exposure_check',       # Moved from proactive
             'job_posting_analysis',        # LinkedIn Jobs
             'technology_stack_analysis',   # BuiltWith data
             'insurance_risk_assessment',   # Risk calculation
             'compliance_vulnerability_check', # Compliance issues
             'shodan_network_exposure'      # Network vulnerability scan (NEW!)
         ]
+        
+        # Per-thread record of whether the current company's pass skipped or
+        # failed a lookup; such a pass never marks a domain dead
+        self._lookup_state = threading.local()
+        
+        # Domains where a full pass found nothing (domain -> date marked)
+        self.dead_domains_file = os.path.join(DATA_DIR, 'dead_domains.json')
+        self._ensure_data_dir()
+        self._dead_domains = self._load_dead_domains()
+    
+    def _ensure_data_dir(self):
+        """Ensure data directory exists for tracking dead domains"""
+        data_dir = os.path.dirname(self.dead_domains_file)
+        if data_dir and not os.path.exists(data_dir):
+            os.makedirs(data_dir)
+    
+    def _load_dead_domains(self) -> Dict[str, str]:
+        """Load domains with no signals, dropping entries older than the TTL"""
+        try:
+            if os.path.exists(self.dead_domains_file):
+                with open(self.dead_domains_file, 'r') as f:
+                    data = json.load(f)
+                cutoff = (datetime.utcnow() - timedelta(days=self.DEAD_DOMAIN_TTL_DAYS)).isoformat()
+                return {
+                    domain: marked_at
+                    for domain, marked_at in data.get('dead_domains', {}).items()
+                    if marked_at > cutoff
+                }
+            return {}
+        except Exception as e:
+            logger.error("Error loading dead domains: %s", e)
+            return {}
+    
+    def _save_dead_domains(self):
+        """Save domains with no signals to file"""
+        try:
+            data = {
+                'dead_domains': self._dead_domains,
+                'last_updated': datetime.utcnow().isoformat(),
+                'total_dead': len(self._dead_domains)
+            }
+            with open(self.dead_domains_file, 'w') as f:
+                json.dump(data, f)
+        except Exception as e:
+            logger.error("Error saving dead domains: %s", e)
     
-    def analyze_company_batch(self, batch_size: int = 100) -> List[Dict]:
+    def analyze_company_batch(self, batch_size: int = 100) -> List[Union[Signal, Dict]]:
         """Analyze a batch of companies for pain signals"""
         signals = []
         
         try:
-            print(f"Analyzing batch of {batch_size} companies...")
+            logger.info("Analyzing batch of %s companies...", batch_size)
             
             # Get companies that need analysis
             companies = self.get_companies_for_analysis(batch_size)
             
             if not companies:
-                print("No companies need analysis")
+                logger.info("No companies need analysis")
                 return signals
             
-            print(f"Found {len(companies)} companies to analyze")
+            # Rows without a domain have nothing to look up
+            with_domain = [company for company in companies if company.get('domain')]
+            if len(with_domain) < len(companies):
+                logger.info("Skipping %s companies with no domain", len(companies) - len(with_domain))
+            companies = with_domain
+            if not companies:
+                return signals
             
-            # Analyze each company
-            for i, company in enumerate(companies):
-                try:
-                    print(f"Analyzing company {i+1}/{len(companies)}: {company.get('company_name', 'Unknown')}")
-                    
-                    # Run all analysis methods
-                    company_signals = self.analyze_single_company(company)
+            logger.info("Found %s companies to analyze", len(companies))
+            
+            # One Clay query for the batch's recent signals instead of one per company
+            self._recent_signals_cache = self.prefetch_recent_signals(
+                [company['domain'] for company in companies]
+            )
+            
+            # Analyze companies concurrently; the work is network-bound and
+            # per-host pacing is enforced by the shared rate limiter
+            total = len(companies)
+            analyzed_at = datetime.utcnow().isoformat()
+            with ThreadPoolExecutor(max_workers=self.BATCH_CONCURRENCY) as executor:
+                for company_signals in executor.map(
+                    self._analyze_batch_company, companies, range(1, total + 1),
+                    repeat(total), repeat(analyzed_at)
+                ):
                     signals.extend(company_signals)
-                    
-                    # Mark as analyzed
-                    self.mark_company_analyzed(company)
-                    
-                    # Rate limiting
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    print(f"Error analyzing company {company.get('domain', 'unknown')}: {e}")
-                    continue
             
-            print(f"Analysis complete: {len(signals)} signals found")
+            self._save_dead_domains()
+            
+            logger.info("Analysis complete: %s signals found", len(signals))
             
         except Exception as e:
-            print(f"Error in company batch analysis: {e}")
+            logger.error("Error in company batch analysis: %s", e)
+        finally:
+            self._recent_signals_cache = None
+            self.flush_analyzed()
         
         return signals
     
+    def _analyze_batch_company(self, company: Dict, position: int, total: int,
+                               analyzed_at: str) -> List[Union[Signal, Dict]]:
+        """Analyze one company of a batch and mark it as analyzed"""
+        try:
+            logger.info("Analyzing company %s/%s: %s", position, total, company.get('company_name', 'Unknown'))
+            
+            # Run all analysis methods
+            company_signals = self._analyze_company(company)
+            
+            # Mark as analyzed (written when the batch finishes)
+            self.queue_company_analyzed(company, analyzed_at)
+            
+            return company_signals
+            
+        except Exception as e:
+            logger.error("Error analyzing company %s: %s", company.get('domain', 'unknown'), e)
+            return []
+    
     def get_companies_for_analysis(self, limit: int) -> List[Dict]:
         """Get companies that need analysis"""
         try:
@@ -91,7 +316,8 @@ class CompanyAnalyzer:
                 {
                     'analyzed': False,  # Haven't been analyzed
                     'last_analysis': None  # Or last analysis was > 30 days ago
-                }
+                },
+                projection=self.ANALYSIS_COLUMNS
             )
             
             # If no unanalyzed companies, get companies analyzed > 30 days ago
@@ -99,17 +325,25 @@ class CompanyAnalyzer:
                 thirty_days_ago = (datetime.now() - timedelta(days=30)).isoformat()
                 companies = self.clay_client.query_table(
                     'company_universe',
-                    {'last_analysis': {'$lt': thirty_days_ago}}
+                    {'last_analysis': {'$lt': thirty_days_ago}},
+                    projection=self.ANALYSIS_COLUMNS
                 )
             
             return companies[:limit] if companies else []
             
         except Exception as e:
-            print(f"Error getting companies for analysis: {e}")
+            logger.error("Error getting companies for analysis: %s", e)
             return []
     
     def analyze_single_company(self, company: Dict) -> List[Dict]:
         """Analyze a single company for pain signals"""
+        return [
+            signal.to_dict() if isinstance(signal, Signal) else signal
+            for signal in self._analyze_company(company)
+        ]
+    
+    def _analyze_company(self, company: Dict) -> List[Union[Signal, Dict]]:
+        """Run the analysis methods for a company, keeping Signal records unserialized"""
         signals = []
         
         try:
@@ -119,53 +353,103 @@ class CompanyAnalyzer:
             if not domain:
                 return signals
             
-            # Method 1: HIBP breach check (moved from proactive)
-            hibp_signals = self.check_hibp_breaches(company)
-            signals.extend(hibp_signals)
-            
-            # Method 2: GitHub credential exposure (moved from proactive)
-            github_signals = self.check_github_exposures(company)
-            signals.extend(github_signals)
-            
-            # Method 3: Check for recent breach mentions
-            breach_signals = self.check_breach_mentions(company)
-            signals.extend(breach_signals)
-            
-            # Method 4: Analyze job postings for security roles
-            job_signals = self.analyze_job_postings(company)
-            signals.extend(job_signals)
-            
-            # Method 5: Check technology stack for security gaps
-            tech_signals = self.analyze_technology_stack(company)
-            signals.extend(tech_signals)
+            # Third-party lookups; only these decide whether a domain is dead,
+            # since the domain checks always emit something (e.g. tech gaps)
+            network_lookups = [
+                self.check_hibp_breaches,               # Method 1: HIBP breach check
+                self.check_breach_mentions,             # Method 2: SERPAPI, then Google News fallback
+                self.check_github_exposures,            # Method 3: GitHub credential exposure
+                self.analyze_job_postings,              # Method 4: Security job postings
+                self.check_shodan_exposures,            # Method 8: Shodan network exposure
+            ]
+            domain_checks = [
+                self.analyze_technology_stack,          # Method 5: Technology stack gaps (TLS/header probe)
+                self.assess_insurance_risk,             # Method 6: Insurance risk factors
+                self.check_compliance_vulnerabilities,  # Method 7: Compliance vulnerabilities
+            ]
             
-            # Method 6: Assess insurance risk factors
-            insurance_signals = self.assess_insurance_risk(company)
-            signals.extend(insurance_signals)
+            # Domains that recently came back empty skip the third-party lookups;
+            # the domain checks still probe the site and may query Clay
+            if domain in self._dead_domains:
+                methods = domain_checks
+            else:
+                # Methods run cheapest first; once one produces a high-confidence
+                # signal the remaining (more expensive) lookups are skipped.
+                # Shodan is the most expensive and runs last; without an API key
+                # it still runs, so the pass is recorded as incomplete
+                methods = network_lookups[:-1] + domain_checks + network_lookups[-1:]
+            
+            self._lookup_state.incomplete = False
+            lookups_run = 0
+            lookup_hits = 0
+            for method in methods:
+                method_signals = method(company)
+                signals.extend(method_signals)
+                if method in network_lookups:
+                    lookups_run += 1
+                    lookup_hits += len(method_signals)
+                
+                if any(s['signal_strength'] >= self.EARLY_EXIT_SIGNAL_STRENGTH for s in method_signals):
+                    break
             
-            # Method 7: Check compliance vulnerabilities
-            compliance_signals = self.check_compliance_vulnerabilities(company)
-            signals.extend(compliance_signals)
-            
-            # Method 8: Shodan network exposure analysis (NEW!)
-            if self.shodan_monitor:
-                shodan_signals = self.check_shodan_exposures(company)
-                signals.extend(shodan_signals)
+            # Dead only when every third-party lookup ran, answered and found nothing
+            if (lookups_run == len(network_lookups) and not lookup_hits
+                    and not self._lookup_state.incomplete):
+                self._dead_domains[domain] = datetime.utcnow().isoformat()
             
         except Exception as e:
-            print(f"Error analyzing company {company.get('domain', 'unknown')}: {e}")
+            logger.error("Error analyzing company %s: %s", company.get('domain', 'unknown'), e)
         
         return signals
     
-    def check_hibp_breaches(self, company: Dict) -> List[Dict]:
+    def _mark_lookup_incomplete(self):
+        """Record that the current pass skipped or failed a network lookup"""
+        self._lookup_state.incomplete = True
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET paced by the per-host rate limiter, retrying throttled (429/503) responses"""
+        host = urlparse(url).netloc
+        
+        for attempt in range(self.MAX_THROTTLE_RETRIES + 1):
+            self.rate_limiter.wait(host)
+            try:
+                response = self.session.get(url, **kwargs)
+            except requests.RequestException:
+                self._mark_lookup_incomplete()
+                raise
+            
+            if response.status_code not in (429, 503):
+                self.rate_limiter.record_success(host)
+                if not response.ok:
+                    self._mark_lookup_incomplete()
+                return response
+            
+            self.rate_limiter.record_throttle(host)
+            logger.warning("Throttled by %s (status %s), rate now %.2f req/s",
+                           host, response.status_code, self.rate_limiter.get_rate(host))
+            
+            if attempt < self.MAX_THROTTLE_RETRIES:
+                time.sleep(self._retry_after(response, host))
+        
+        self._mark_lookup_incomplete()
+        return response
+    
+    def _retry_after(self, response: requests.Response, host: str) -> float:
+        """Seconds to wait before retrying a throttled request"""
+        try:
+            return min(float(response.headers['Retry-After']), self.MAX_RETRY_AFTER)
+        except (KeyError, ValueError):
+            return 1.0 / self.rate_limiter.get_rate(host)
+    
+    def check_hibp_breaches(self, company: Dict) -> List[Signal]:
         """Check HIBP for breach history (REACTIVE ONLY)"""
         signals = []
         
         try:
-            from config.settings import config
             hibp_api_key = getattr(config, 'HIBP_API_KEY', None)
             
             if not hibp_api_key:
+                self._mark_lookup_incomplete()
                 return signals  # Skip if no API key
             
             domain = company.get('domain', '')
@@ -173,14 +457,14 @@ class CompanyAnalyzer:
                 return signals
             
             # Check domain for breaches
-            response = self.session.get(
+            response = self._get(
                 f'https://haveibeenpwned.com/api/v3/breaches?domain={domain}',
                 headers={'hibp-api-key': hibp_api_key},
                 timeout=10
             )
             
             if response.status_code == 200:
-                breaches = response.json()
+                breaches = orjson.loads(response.content)
                 if breaches:
                     # Filter for RECENT breaches (last 1-2 years)
                     recent_breaches = []
@@ -194,13 +478,13 @@ class CompanyAnalyzer:
                             recent_breaches.append(breach)
                     
                     if recent_breaches:
-                        signal = {
-                            'company_name': company.get('company_name', ''),
-                            'domain': domain,
-                            'signal_type': 'hibp_breach_detected',
-                            'signal_date': datetime.utcnow().isoformat(),
-                            'signal_strength': 0.7,
-                            'raw_data': {
+                        signal = Signal(
+                            company_name=company.get('company_name', ''),
+                            domain=domain,
+                            signal_type='hibp_breach_detected',
+                            signal_date=datetime.utcnow().isoformat(),
+                            signal_strength=0.7,
+                            raw_data={
                                 'breach_count': len(recent_breaches),
                                 'total_breaches': len(breaches),
                                 'breaches': recent_breaches[:5],  # First 5 RECENT breaches
@@ -208,21 +492,20 @@ class CompanyAnalyzer:
                                 'date_filtered': True,
                                 'filter_years': '2023-2025'
                             },
-                            'source': 'company_analysis'
-                        }
+                            source='company_analysis'
+                        )
                         signals.append(signal)
-                        print(f"HIBP RECENT breach(es) found for: {domain} ({len(recent_breaches)}/{len(breaches)} recent)")
+                        logger.info("HIBP RECENT breach(es) found for: %s (%s/%s recent)", domain, len(recent_breaches), len(breaches))
                     else:
-                        print(f"HIBP breaches found for: {domain} ({len(breaches)} total) - ALL FILTERED OUT (too old)")
-            
-            time.sleep(1)  # Rate limiting
+                        logger.info("HIBP breaches found for: %s (%s total) - ALL FILTERED OUT (too old)", domain, len(breaches))
             
         except Exception as e:
-            print(f"Error checking HIBP for {company.get('domain', 'unknown')}: {e}")
+            self._mark_lookup_incomplete()
+            logger.error("Error checking HIBP for %s: %s", company.get('domain', 'unknown'), e)
         
         return signals
     
-    def check_github_exposures(self, company: Dict) -> List[Dict]:
+    def check_github_exposures(self, company: Dict) -> List[Signal]:
         """Check GitHub for credential exposures (REACTIVE ONLY)"""
         signals = []
         
@@ -243,39 +526,39 @@ class CompanyAnalyzer:
             
             for term in search_terms:
                 try:
-                    response = self.session.get(
+                    response = self._get(
                         'https://api.github.com/search/code',
                         params={'q': term, 'per_page': 5},
                         timeout=10
                     )
                     
                     if response.status_code == 200:
-                        results = response.json()
+                        results = orjson.loads(response.content)
                         if results.get('total_count', 0) > 0:
-                            signal = {
-                                'company_name': company_name,
-                                'domain': domain,
-                                'signal_type': 'github_exposure_detected',
-                                'signal_date': datetime.utcnow().isoformat(),
-                                'signal_strength': 0.6,
-                                'raw_data': {
+                            signal = Signal(
+                                company_name=company_name,
+                                domain=domain,
+                                signal_type='github_exposure_detected',
+                                signal_date=datetime.utcnow().isoformat(),
+                                signal_strength=0.6,
+                                raw_data={
                                     'exposure_count': results['total_count'],
                                     'search_term': term,
                                     'detection_method': 'github_api'
                                 },
-                                'source': 'company_analysis'
-                            }
+                                source='company_analysis'
+                            )
                             signals.append(signal)
-                            print(f"GitHub exposure found for: {domain}")
+                            logger.info("GitHub exposure found for: %s", domain)
                             break  # Found one, no need to search more
                     
-                    time.sleep(0.3)  # Reduced rate limiting for Clay speed
-                    
                 except Exception as e:
+                    self._mark_lookup_incomplete()
                     continue
             
         except Exception as e:
-            print(f"Error checking GitHub for {company.get('domain', 'unknown')}: {e}")
+            self._mark_lookup_incomplete()
+            logger.error("Error checking GitHub for %s: %s", company.get('domain', 'unknown'), e)
         
         return signals
     
@@ -285,9 +568,6 @@ class CompanyAnalyzer:
             return False
         
         try:
-            from datetime import datetime, timedelta
-            import re
-            
             # Parse various date formats
             current_date = datetime.now()
             
@@ -306,17 +586,16 @@ class CompanyAnalyzer:
             return True
             
         except Exception as e:
-            print(f"Error parsing date: {date_str} - {e}")
+            logger.error("Error parsing date: %s - %s", date_str, e)
             return True  # Default to accepting if parsing fails
     
-    def check_breach_mentions_serpapi(self, company: Dict) -> List[Dict]:
+    def check_breach_mentions_serpapi(self, company: Dict) -> List[Signal]:
         """Check breach mentions using SERPAPI (more reliable) - FILTERED TO LAST 1-2 YEARS"""
         signals = []
         
         try:
-            from config.settings import config
-            
             if not config.SERPAPI_API_KEY:
+                self._mark_lookup_incomplete()
                 return signals
             
             domain = company.get('domain', '')
@@ -330,7 +609,7 @@ class CompanyAnalyzer:
             
             for query in search_queries:
                 try:
-                    response = self.session.get(
+                    response = self._get(
                         'https://serpapi.com/search',
                         params={
                             'q': query,
@@ -343,7 +622,7 @@ class CompanyAnalyzer:
                     )
                     
                     if response.status_code == 200:
-                        data = response.json()
+                        data = orjson.loads(response.content)
                         news_results = data.get('news_results', [])
                         
                         for result in news_results:
@@ -362,13 +641,13 @@ class CompanyAnalyzer:
                             is_recent = self.is_recent_date(news_date)
                             
                             if any(keyword in title or keyword in snippet for keyword in breach_keywords) and is_recent:
-                                signal = {
-                                    'company_name': company_name,
-                                    'domain': domain,
-                                    'signal_type': 'breach_mention_detected',
-                                    'signal_date': datetime.utcnow().isoformat(),
-                                    'signal_strength': 0.9,  # Higher confidence with SERPAPI
-                                    'raw_data': {
+                                signal = Signal(
+                                    company_name=company_name,
+                                    domain=domain,
+                                    signal_type='breach_mention_detected',
+                                    signal_date=datetime.utcnow().isoformat(),
+                                    signal_strength=0.9,  # Higher confidence with SERPAPI
+                                    raw_data={
                                         'search_query': query,
                                         'detection_method': 'serpapi_news_search',
                                         'confidence': 'very_high',
@@ -379,26 +658,26 @@ class CompanyAnalyzer:
                                         'date_filtered': True,
                                         'filter_years': '2023-2025'
                                     },
-                                    'source': 'company_analysis_serpapi'
-                                }
+                                    source='company_analysis_serpapi'
+                                )
                                 signals.append(signal)
-                                print(f"Found RECENT breach mention via SERPAPI for: {company_name} (Date: {news_date})")
+                                logger.info("Found RECENT breach mention via SERPAPI for: %s (Date: %s)", company_name, news_date)
                                 break  # Found one, no need to search more
                             elif any(keyword in title or keyword in snippet for keyword in breach_keywords) and not is_recent:
-                                print(f"Found OLD breach mention for: {company_name} (Date: {news_date}) - FILTERED OUT")
-                    
-                    time.sleep(0.3)  # Reduced rate limiting for Clay speed
+                                logger.info("Found OLD breach mention for: %s (Date: %s) - FILTERED OUT", company_name, news_date)
                     
                 except Exception as e:
-                    print(f"Error with SERPAPI search: {e}")
+                    self._mark_lookup_incomplete()
+                    logger.error("Error with SERPAPI search: %s", e)
                     continue
                     
         except Exception as e:
-            print(f"Error in SERPAPI breach check: {e}")
+            self._mark_lookup_incomplete()
+            logger.error("Error in SERPAPI breach check: %s", e)
         
         return signals
     
-    def check_breach_mentions(self, company: Dict) -> List[Dict]:
+    def check_breach_mentions(self, company: Dict) -> List[Signal]:
         """Check if company has been mentioned in breach reports"""
         signals = []
         
@@ -423,7 +702,7 @@ class CompanyAnalyzer:
             
             for term in breach_search_terms:
                 try:
-                    response = self.session.get(
+                    response = self._get(
                         'https://news.google.com/rss/search',
                         params={
                             'q': term,
@@ -436,35 +715,35 @@ class CompanyAnalyzer:
                     
                     if response.status_code == 200:
                         if self.has_recent_breach_mentions(response.text, company_name):
-                            signal = {
-                                'company_name': company_name,
-                                'domain': domain,
-                                'signal_type': 'breach_mention_detected',
-                                'signal_date': datetime.utcnow().isoformat(),
-                                'signal_strength': 0.8,
-                                'raw_data': {
+                            signal = Signal(
+                                company_name=company_name,
+                                domain=domain,
+                                signal_type='breach_mention_detected',
+                                signal_date=datetime.utcnow().isoformat(),
+                                signal_strength=0.8,
+                                raw_data={
                                     'search_term': term,
                                     'detection_method': 'news_search',
                                     'confidence': 'high'
                                 },
-                                'source': 'company_analysis'
-                            }
+                                source='company_analysis'
+                            )
                             signals.append(signal)
-                            print(f"Found breach mention for: {company_name}")
+                            logger.info("Found breach mention for: %s", company_name)
                             break  # Found one, no need to search more
                     
-                    time.sleep(1)
-                    
                 except Exception as e:
-                    print(f"Error searching for breach mentions: {e}")
+                    self._mark_lookup_incomplete()
+                    logger.error("Error searching for breach mentions: %s", e)
                     continue
             
         except Exception as e:
-            print(f"Error checking breach mentions: {e}")
+            self._mark_lookup_incomplete()
+            logger.error("Error checking breach mentions: %s", e)
         
         return signals
     
-    def analyze_job_postings(self, company: Dict) -> List[Dict]:
+    def analyze_job_postings(self, company: Dict) -> List[Signal]:
         """Analyze if company is posting security jobs (indicating gaps)"""
         signals = []
         
@@ -482,7 +761,7 @@ class CompanyAnalyzer:
             
             for term in security_job_terms:
                 try:
-                    response = self.session.get(
+                    response = self._get(
                         'https://www.linkedin.com/jobs/search',
                         params={
                             'keywords': term,
@@ -499,36 +778,36 @@ class CompanyAnalyzer:
                         job_count = self.count_security_jobs(response.text, company_name)
                         
                         if job_count > 0:
-                            signal = {
-                                'company_name': company_name,
-                                'domain': domain,
-                                'signal_type': 'security_job_postings',
-                                'signal_date': datetime.utcnow().isoformat(),
-                                'signal_strength': min(0.3 + (job_count * 0.1), 0.8),
-                                'raw_data': {
+                            signal = Signal(
+                                company_name=company_name,
+                                domain=domain,
+                                signal_type='security_job_postings',
+                                signal_date=datetime.utcnow().isoformat(),
+                                signal_strength=min(0.3 + (job_count * 0.1), 0.8),
+                                raw_data={
                                     'job_count': job_count,
                                     'search_term': term,
                                     'detection_method': 'linkedin_jobs',
                                     'confidence': 'medium'
                                 },
-                                'source': 'company_analysis'
-                            }
+                                source='company_analysis'
+                            )
                             signals.append(signal)
-                            print(f"Found {job_count} security jobs for: {company_name}")
+                            logger.info("Found %s security jobs for: %s", job_count, company_name)
                             break
                     
-                    time.sleep(2)
-                    
                 except Exception as e:
-                    print(f"Error searching for security jobs: {e}")
+                    self._mark_lookup_incomplete()
+                    logger.error("Error searching for security jobs: %s", e)
                     continue
             
         except Exception as e:
-            print(f"Error analyzing job postings: {e}")
+            self._mark_lookup_incomplete()
+            logger.error("Error analyzing job postings: %s", e)
         
         return signals
     
-    def analyze_technology_stack(self, company: Dict) -> List[Dict]:
+    def analyze_technology_stack(self, company: Dict) -> List[Signal]:
         """Analyze technology stack for security gaps"""
         signals = []
         
@@ -543,28 +822,31 @@ class CompanyAnalyzer:
             tech_gaps = self.identify_security_tech_gaps(company)
             
             if tech_gaps:
-                signal = {
-                    'company_name': company_name,
-                    'domain': domain,
-                    'signal_type': 'security_tech_gaps',
-                    'signal_date': datetime.utcnow().isoformat(),
-                    'signal_strength': len(tech_gaps) * 0.2,  # 0.2 per gap
-                    'raw_data': {
+                signal = Signal(
+                    company_name=company_name,
+                    domain=domain,
+                    signal_type='security_tech_gaps',
+                    signal_date=datetime.utcnow().isoformat(),
+                    signal_strength=len(tech_gaps) * 0.2,  # 0.2 per gap
+                    raw_data={
                         'tech_gaps': tech_gaps,
+                        'missing_security_headers': sorted(
+                            SECURITY_HEADERS - self.present_security_headers(domain)
+                        ),
                         'detection_method': 'tech_stack_analysis',
                         'confidence': 'medium'
                     },
-                    'source': 'company_analysis'
-                }
+                    source='company_analysis'
+                )
                 signals.append(signal)
-                print(f"Found tech gaps for: {company_name} - {tech_gaps}")
+                logger.info("Found tech gaps for: %s - %s", company_name, tech_gaps)
             
         except Exception as e:
-            print(f"Error analyzing technology stack: {e}")
+            logger.error("Error analyzing technology stack: %s", e)
         
         return signals
     
-    def assess_insurance_risk(self, company: Dict) -> List[Dict]:
+    def assess_insurance_risk(self, company: Dict) -> List[Signal]:
         """Assess insurance risk factors for company"""
         signals = []
         
@@ -576,28 +858,28 @@ class CompanyAnalyzer:
             risk_factors = self.calculate_insurance_risk_factors(company)
             
             if risk_factors['risk_score'] > 0.6:
-                signal = {
-                    'company_name': company_name,
-                    'domain': domain,
-                    'signal_type': 'high_insurance_risk',
-                    'signal_date': datetime.utcnow().isoformat(),
-                    'signal_strength': risk_factors['risk_score'],
-                    'raw_data': {
+                signal = Signal(
+                    company_name=company_name,
+                    domain=domain,
+                    signal_type='high_insurance_risk',
+                    signal_date=datetime.utcnow().isoformat(),
+                    signal_strength=risk_factors['risk_score'],
+                    raw_data={
                         'risk_factors': risk_factors['factors'],
                         'detection_method': 'insurance_risk_assessment',
                         'confidence': 'medium'
                     },
-                    'source': 'company_analysis'
-                }
+                    source='company_analysis'
+                )
                 signals.append(signal)
-                print(f"High insurance risk for: {company_name} (score: {risk_factors['risk_score']:.2f})")
+                logger.info("High insurance risk for: %s (score: %.2f)", company_name, risk_factors['risk_score'])
             
         except Exception as e:
-            print(f"Error assessing insurance risk: {e}")
+            logger.error("Error assessing insurance risk: %s", e)
         
         return signals
     
-    def check_compliance_vulnerabilities(self, company: Dict) -> List[Dict]:
+    def check_compliance_vulnerabilities(self, company: Dict) -> List[Signal]:
         """Check for compliance vulnerabilities"""
         signals = []
         
@@ -609,24 +891,24 @@ class CompanyAnalyzer:
             compliance_issues = self.identify_compliance_issues(company)
             
             if compliance_issues:
-                signal = {
-                    'company_name': company_name,
-                    'domain': domain,
-                    'signal_type': 'compliance_vulnerability',
-                    'signal_date': datetime.utcnow().isoformat(),
-                    'signal_strength': len(compliance_issues) * 0.3,
-                    'raw_data': {
+                signal = Signal(
+                    company_name=company_name,
+                    domain=domain,
+                    signal_type='compliance_vulnerability',
+                    signal_date=datetime.utcnow().isoformat(),
+                    signal_strength=len(compliance_issues) * 0.3,
+                    raw_data={
                         'compliance_issues': compliance_issues,
                         'detection_method': 'compliance_check',
                         'confidence': 'medium'
                     },
-                    'source': 'company_analysis'
-                }
+                    source='company_analysis'
+                )
                 signals.append(signal)
-                print(f"Found compliance issues for: {company_name} - {compliance_issues}")
+                logger.info("Found compliance issues for: %s - %s", company_name, compliance_issues)
             
         except Exception as e:
-            print(f"Error checking compliance vulnerabilities: {e}")
+            logger.error("Error checking compliance vulnerabilities: %s", e)
         
         return signals
     
@@ -650,14 +932,12 @@ class CompanyAnalyzer:
             return False
             
         except Exception as e:
-            print(f"Error checking breach mentions: {e}")
+            logger.error("Error checking breach mentions: %s", e)
             return False
     
     def count_security_jobs(self, html_content: str, company_name: str) -> int:
         """Count security job postings for company"""
         try:
-            from bs4 import BeautifulSoup
-            
             soup = BeautifulSoup(html_content, 'html.parser')
             
             # Look for job cards
@@ -692,7 +972,7 @@ class CompanyAnalyzer:
             return security_job_count
             
         except Exception as e:
-            print(f"Error counting security jobs: {e}")
+            logger.error("Error counting security jobs: %s", e)
             return 0
     
     def identify_security_tech_gaps(self, company: Dict) -> List[str]:
@@ -719,36 +999,30 @@ class CompanyAnalyzer:
                 gaps.append('missing_security_headers')
             
         except Exception as e:
-            print(f"Error identifying tech gaps: {e}")
+            logger.error("Error identifying tech gaps: %s", e)
         
         return gaps
     
     def calculate_insurance_risk_factors(self, company: Dict) -> Dict:
         """Calculate insurance risk factors"""
-        risk_score = 0.3  # Base score
+        risk_score = INSURANCE_RISK_BASE
         factors = []
         
         try:
-            # Factor 1: Industry risk
-            if self.is_high_risk_industry(company.get('company_name', '')):
-                risk_score += 0.2
-                factors.append('high_risk_industry')
-            
-            # Factor 2: Company size (larger = more risk)
-            if self.is_large_company(company):
-                risk_score += 0.2
-                factors.append('large_company')
-            
-            # Factor 3: Recent security issues
-            if self.has_recent_security_issues(company.get('domain', '')):
-                risk_score += 0.3
-                factors.append('recent_security_issues')
+            # Recent security issues come from the batch prefetch, so every
+            # factor here is an in-memory check
+            flags = {
+                'high_risk_industry': self.classify_name(company.get('company_name', ''))['high_risk_industry'],
+                'large_company': self.is_large_company(company),
+                'recent_security_issues': self.has_recent_security_issues(company.get('domain', ''))
+            }
+            factors = [factor for factor, present in flags.items() if present]
             
             # Cap at 1.0
-            risk_score = min(risk_score, 1.0)
+            risk_score = min(risk_score + sum(INSURANCE_RISK_WEIGHTS[factor] for factor in factors), 1.0)
             
         except Exception as e:
-            print(f"Error calculating risk factors: {e}")
+            logger.error("Error calculating risk factors: %s", e)
         
         return {
             'risk_score': risk_score,
@@ -760,23 +1034,22 @@ class CompanyAnalyzer:
         issues = []
         
         try:
-            company_name = company.get('company_name', '').lower()
-            
             # Check for industry-specific compliance requirements
-            if any(keyword in company_name for keyword in ['healthcare', 'medical', 'hospital']):
-                issues.append('hipaa_compliance_required')
-            
-            if any(keyword in company_name for keyword in ['financial', 'bank', 'credit']):
-                issues.append('financial_compliance_required')
-            
-            if any(keyword in company_name for keyword in ['government', 'municipal']):
-                issues.append('government_compliance_required')
+            issues = self.classify_name(company.get('company_name', ''))['compliance_issues']
             
         except Exception as e:
-            print(f"Error identifying compliance issues: {e}")
+            logger.error("Error identifying compliance issues: %s", e)
         
         return issues
     
+    def classify_name(self, company_name: str) -> Dict:
+        """Classify a company name into industry risk and compliance tags in one pass"""
+        high_risk, compliance_issues = _classify_name(company_name.lower())
+        return {
+            'high_risk_industry': high_risk,
+            'compliance_issues': list(compliance_issues)
+        }
+    
     def has_security_tools_indicator(self, domain: str) -> bool:
         """Check if domain has security tools indicators"""
         try:
@@ -786,46 +1059,88 @@ class CompanyAnalyzer:
         except:
             return False
     
+    def probe_domain_security(self, domain: str) -> Dict:
+        """Read the TLS version and response headers over HTTPS, following one same-site redirect"""
+        if not domain:
+            return {'tls_version': None, 'headers': []}
+        
+        cache_key = f'probe:{domain}'
+        probe = self.probe_cache.get(cache_key)
+        if probe is not None:
+            return probe
+        
+        probe = {'tls_version': None, 'headers': []}
+        connection = http.client.HTTPSConnection(
+            domain, timeout=10, context=self._ssl_ctx
+        )
+        
+        try:
+            connection.connect()
+            probe['tls_version'] = connection.sock.version()
+            
+            connection.request('HEAD', '/', headers={'User-Agent': 'BTA-CompanyAnalyzer/1.0'})
+            response = connection.getresponse()
+            response.read()  # HEAD has no body; frees the connection for a follow-up
+            
+            # An apex -> www (or path) redirect usually carries none of the site's
+            # hardening headers, so read them from one same-site hop instead
+            target = None
+            if response.status in REDIRECT_STATUSES:
+                target = self._same_site_redirect(domain, response.getheader('Location'))
+            if target is not None:
+                host, path = target
+                if host != domain:
+                    connection.close()
+                    connection = http.client.HTTPSConnection(
+                        host, timeout=10, context=self._ssl_ctx
+                    )
+                connection.request('HEAD', path, headers={'User-Agent': 'BTA-CompanyAnalyzer/1.0'})
+                response = connection.getresponse()
+            
+            probe['headers'] = [name.lower() for name, _ in response.getheaders()]
+        except (OSError, http.client.HTTPException) as e:
+            # A timeout or reset says nothing about the site's TLS or headers;
+            # leave it uncached so the next analysis probes again
+            logger.debug("Security probe of %s failed: %s", domain, e)
+            return probe
+        finally:
+            connection.close()
+        
+        self.probe_cache.set(cache_key, probe)
+        return probe
+    
+    def _same_site_redirect(self, domain: str, location: Optional[str]) -> Optional[Tuple[str, str]]:
+        """(host, path) of an HTTPS redirect that stays on the domain's site, else None"""
+        if not location:
+            return None
+        target = urlparse(urljoin(f'https://{domain}/', location))
+        if target.scheme != 'https' or not target.hostname:
+            return None
+        
+        site = domain[4:] if domain.startswith('www.') else domain
+        if target.hostname != site and not target.hostname.endswith('.' + site):
+            return None
+        
+        path = target.path or '/'
+        if target.query:
+            path += '?' + target.query
+        return target.netloc, path
+    
     def has_secure_ssl(self, domain: str) -> bool:
         """Check if domain has secure SSL"""
-        try:
-            import ssl
-            import socket
-            
-            context = ssl.create_default_context()
-            with socket.create_connection((domain, 443), timeout=5) as sock:
-                with context.wrap_socket(sock, server_hostname=domain) as ssock:
-                    return ssock.version() in ['TLSv1.2', 'TLSv1.3']
-        except:
-            return False
+        return self.probe_domain_security(domain)['tls_version'] in ['TLSv1.2', 'TLSv1.3']
+    
+    def present_security_headers(self, domain: str) -> frozenset:
+        """Return which of SECURITY_HEADERS the domain sends"""
+        return SECURITY_HEADERS.intersection(self.probe_domain_security(domain)['headers'])
     
     def has_security_headers(self, domain: str) -> bool:
         """Check if domain has security headers"""
-        try:
-            response = self.session.get(f'https://{domain}', timeout=10)
-            headers = response.headers
-            
-            security_headers = [
-                'Strict-Transport-Security',
-                'X-Content-Type-Options',
-                'X-Frame-Options',
-                'X-XSS-Protection'
-            ]
-            
-            return any(header in headers for header in security_headers)
-        except:
-            return False
+        return not SECURITY_HEADERS.isdisjoint(self.probe_domain_security(domain)['headers'])
     
     def is_high_risk_industry(self, company_name: str) -> bool:
         """Check if company is in high-risk industry"""
-        high_risk_keywords = [
-            'healthcare', 'medical', 'hospital', 'clinic',
-            'financial', 'bank', 'credit', 'insurance',
-            'government', 'municipal', 'utilities', 'energy'
-        ]
-        
-        name_lower = company_name.lower()
-        return any(keyword in name_lower for keyword in high_risk_keywords)
+        return self.classify_name(company_name)['high_risk_industry']
     
     def is_large_company(self, company: Dict) -> bool:
         """Check if company is large (more insurance risk)"""
@@ -833,8 +1148,63 @@ class CompanyAnalyzer:
         employee_count = company.get('employee_count', 0)
         return employee_count > 500
     
+    def prefetch_recent_signals(self, domains: List[str]) -> Dict[str, bool]:
+        """Look up recent pain signals for a whole batch of domains in one Clay query"""
+        recent = dict.fromkeys(domains, False)
+        
+        try:
+            six_months_ago = datetime.utcnow() - timedelta(days=180)
+            signals = self.clay_client.query_table(
+                'pain_signals',
+                {
+                    'domain': {'$in': domains},
+                    'signal_date': {'$gte': six_months_ago.isoformat()}
+                }
+            )
+            
+            cutoff = time.time() - 180 * 86400
+            for signal in signals:
+                domain = signal.get('domain')
+                if domain in recent and not recent[domain]:
+                    signal_epoch = self._signal_epoch(signal)
+                    recent[domain] = bool(signal_epoch and signal_epoch > cutoff)
+            
+        except Exception as e:
+            logger.error("Error prefetching recent signals: %s", e)
+            return {}  # Fall back to per-domain lookups
+        
+        return recent
+    
+    def _parse_signal_date(self, signal_date_str: str) -> Optional[datetime]:
+        """Parse an ISO signal date into a naive UTC datetime"""
+        if not signal_date_str:
+            return None
+        try:
+            signal_date = datetime.fromisoformat(signal_date_str.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+        if signal_date.tzinfo is not None:
+            signal_date = signal_date.astimezone(timezone.utc).replace(tzinfo=None)
+        return signal_date
+    
+    def _signal_epoch(self, signal: Union[Signal, Dict]) -> Optional[float]:
+        """Unix seconds of a signal, from signal_epoch or (older rows) its ISO signal_date"""
+        signal_epoch = signal.get('signal_epoch')
+        if signal_epoch is not None:
+            return signal_epoch
+        signal_date = self._parse_signal_date(signal.get('signal_date', ''))
+        return signal_date.replace(tzinfo=timezone.utc).timestamp() if signal_date else None
+    
     def has_recent_security_issues(self, domain: str) -> bool:
         """Check if domain has recent security issues"""
+        if not domain:
+            return False
+        
+        # Answered from the batch prefetch when the domain is part of the current batch
+        cache = self._recent_signals_cache
+        if cache is not None and domain in cache:
+            return cache[domain]
+        
         try:
             # Check if there are recent pain signals for this domain
             signals = self.clay_client.query_table(
@@ -842,124 +1212,122 @@ class CompanyAnalyzer:
                 {'domain': domain}
             )
             
-            if signals:
-                # Check if any signals are recent (within 6 months)
-                six_months_ago = datetime.utcnow() - timedelta(days=180)
-                for signal in signals:
-                    signal_date_str = signal.get('signal_date', '')
-                    if signal_date_str:
-                        try:
-                            signal_date = datetime.fromisoformat(signal_date_str.replace('Z', '+00:00'))
-                            if signal_date > six_months_ago:
-                                return True
-                        except:
-                            continue
-            
-            return False
+            # Check if any signals are recent (within 6 months)
+            cutoff = time.time() - 180 * 86400
+            return any((self._signal_epoch(signal) or 0) > cutoff for signal in signals)
             
         except:
             return False
     
-    def mark_company_analyzed(self, company: Dict):
-        """Mark company as analyzed"""
+    def queue_company_analyzed(self, company: Dict, analyzed_at: Optional[str] = None):
+        """Queue a company's analyzed mark (batches pass one shared timestamp)"""
+        update_data = {
+            'domain': company.get('domain'),
+            'analyzed': True,
+            'last_analysis': analyzed_at or datetime.utcnow().isoformat()
+        }
+        
+        with self._analyzed_lock:
+            self._analyzed_buffer.append(update_data)
+    
+    def flush_analyzed(self):
+        """Write all queued analyzed marks to Clay in one bulk call"""
+        with self._analyzed_lock:
+            rows, self._analyzed_buffer = self._analyzed_buffer, []
+        
+        if not rows:
+            return
+        
         try:
-            update_data = {
-                'domain': company.get('domain'),
-                'analyzed': True,
-                'last_analysis': datetime.utcnow().isoformat()
-            }
-            
-            self.clay_client.add_row('company_universe', update_data)
+            self.clay_client.add_rows('company_universe', rows)
             
         except Exception as e:
-            print(f"Error marking company as analyzed: {e}")
+            logger.error("Error marking %s companies as analyzed: %s", len(rows), e)
     
-    def push_signals_to_clay(self, signals: List[Dict]):
+    def push_signals_to_clay(self, signals: List[Union[Signal, Dict]]):
         """Push analysis signals to Clay"""
         try:
             if not signals:
-                print("No signals to push")
+                logger.info("No signals to push")
                 return
             
+            now_iso = datetime.utcnow().isoformat()
+            
             # Send signals to Clay webhook
             webhook_data = {
                 'event_type': 'company_analysis_results',
-                'timestamp': datetime.utcnow().isoformat(),
+                'timestamp': now_iso,
                 'source': 'company_analyzer',
                 'data': {
-                    'companies': [],
-                    'pain_signals': []
+                    # One company record per domain, however many signals it has
+                    'companies': list({
+                        signal['domain']: {
+                            'company_name': signal['company_name'],
+                            'domain': signal['domain'],
+                            'data_source': 'company_analysis',
+                            'last_updated': now_iso
+                        }
+                        for signal in signals
+                    }.values()),
+                    'pain_signals': [
+                        {
+                            'domain': signal['domain'],
+                            'signal_type': signal['signal_type'],
+                            'signal_date': signal['signal_date'],
+                            'signal_epoch': self._signal_epoch(signal),  # numeric twin for recency checks
+                            'signal_strength': signal['signal_strength'],
+                            'raw_data': signal['raw_data'],
+                            'source': signal['source']
+                        }
+                        for signal in signals
+                    ]
                 },
                 'summary': {
                     'signals_found': len(signals),
-                    'signal_types': list(set([s['signal_type'] for s in signals]))
+                    'signal_types': list({s['signal_type'] for s in signals})
                 }
             }
             
-            for signal in signals:
-                # Add company record
-                webhook_data['data']['companies'].append({
-                    'company_name': signal['company_name'],
-                    'domain': signal['domain'],
-                    'data_source': 'company_analysis',
-                    'last_updated': datetime.utcnow().isoformat()
-                })
-                
-                # Add signal record
-                webhook_data['data']['pain_signals'].append({
-                    'domain': signal['domain'],
-                    'signal_type': signal['signal_type'],
-                    'signal_date': signal['signal_date'],
-                    'signal_strength': signal['signal_strength'],
-                    'raw_data': signal['raw_data'],
-                    'source': signal['source']
-                })
-            
             # Send to webhook
             self.send_to_webhook(webhook_data)
             
         except Exception as e:
-            print(f"Error pushing signals to Clay: {e}")
+            logger.error("Error pushing signals to Clay: %s", e)
     
     def send_to_webhook(self, data: Dict) -> bool:
         """Send data to Clay webhook"""
-        from config.settings import config
-        import hashlib
-        import hmac
-        
         try:
             webhook_url = config.CLAY_WEBHOOK_URL
-            payload = json.dumps(data, indent=2)
+            payload = orjson.dumps(data)
             
             headers = {
                 'Content-Type': 'application/json',
+                'Content-Encoding': 'gzip',
                 'User-Agent': 'BTA-CompanyAnalyzer/1.0'
             }
             
-            if config.CLAY_WEBHOOK_SECRET:
-                signature = hmac.new(
-                    config.CLAY_WEBHOOK_SECRET.encode(),
-                    payload.encode(),
-                    hashlib.sha256
-                ).hexdigest()
-                headers['X-Webhook-Signature'] = f'sha256={signature}'
+            if self._hmac_template is not None:
+                signer = self._hmac_template.copy()
+                signer.update(payload)
+                headers['X-Webhook-Signature'] = f'sha256={signer.hexdigest()}'
             
+            # Signature covers the JSON body; the receiver verifies after decoding
             response = self.session.post(
                 webhook_url,
-                data=payload,
+                data=gzip.compress(payload, compresslevel=1),
                 headers=headers,
                 timeout=30
             )
             
             if response.status_code == 200:
-                print(f"✅ Analysis signals sent successfully")
+                logger.info("✅ Analysis signals sent successfully")
                 return True
             else:
-                print(f"❌ Failed to send signals - Status {response.status_code}")
+                logger.error("❌ Failed to send signals - Status %s", response.status_code)
                 return False
                 
         except Exception as e:
-            print(f"❌ Error sending to webhook: {e}")
+            logger.error("❌ Error sending to webhook: %s", e)
             return False
     
     def check_shodan_exposures(self, company: Dict) -> List[Dict]:
@@ -967,6 +1335,7 @@ class CompanyAnalyzer:
         signals = []
         
         if not self.shodan_monitor:
+            self._mark_lookup_incomplete()
             return signals
             
         try:
@@ -976,13 +1345,16 @@ class CompanyAnalyzer:
             if not domain:
                 return signals
             
-            print(f"🔍 Running Shodan network analysis for {domain}")
+            logger.debug("🔍 Running Shodan network analysis for %s", domain)
             
-            # Run Shodan exposure analysis
-            shodan_signals = self.shodan_monitor.analyze_domain_exposure(company)
+            # Run Shodan exposure analysis; queries it could not complete are reported back
+            shodan_errors = []
+            shodan_signals = self.shodan_monitor.analyze_domain_exposure(company, errors=shodan_errors)
+            if shodan_errors:
+                self._mark_lookup_incomplete()
             
             if shodan_signals:
-                print(f"🚨 Found {len(shodan_signals)} Shodan exposures for {domain}")
+                logger.info("🚨 Found %s Shodan exposures for %s", len(shodan_signals), domain)
                 
                 # Add company context to signals
                 for signal in shodan_signals:
@@ -992,16 +1364,17 @@ class CompanyAnalyzer:
                 
                 signals.extend(shodan_signals)
             else:
-                print(f"✅ No critical Shodan exposures found for {domain}")
+                logger.debug("✅ No critical Shodan exposures found for %s", domain)
                 
         except Exception as e:
-            print(f"❌ Error checking Shodan exposures for {company.get('domain', 'unknown')}: {e}")
+            self._mark_lookup_incomplete()
+            logger.error("❌ Error checking Shodan exposures for %s: %s", company.get('domain', 'unknown'), e)
             
         return signals
     
     def run_analysis(self, batch_size: int = 100):
         """Main entry point for company analysis"""
-        print("Starting company analysis...")
+        logger.info("Starting company analysis...")
         
         # Analyze companies
         signals = self.analyze_company_batch(batch_size)
@@ -1010,4 +1383,4 @@ class CompanyAnalyzer:
         if signals:
             self.push_signals_to_clay(signals)
         
-        print(f"Company analysis complete: {len(signals)} signals found")
+        logger.info("Company analysis complete: %s signals found", len(signals))
@@ -1,164 +1,329 @@
 # src/collectors/free_darkweb_monitor.py
 import requests
-from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from itertools import chain, count, islice, repeat
+from typing import IO, Iterable, Iterator, List, Dict, Optional, Set, Tuple, Union
+import hashlib
+import hmac
+import ijson
+import io
 import json
 import logging
-import time
+import orjson
 import re
-from urllib.parse import urljoin
+import threading
+import time
+from urllib.parse import urlencode, urljoin, urlparse
+from .http_session import create_session
+from .rate_limit import TokenBucket
+from .signal import Signal
 
 # Configure logger for this module
 logger = logging.getLogger(__name__)
 
+# Victim posts older than this are not an active attack anymore
+RANSOMWARE_MAX_AGE = timedelta(days=30)
+_ISO_Z_RE = re.compile(r'Z$')
+
+# Credential markers searched for alongside a company's domain on GitHub
+GITHUB_SECRET_KEYWORDS = ('password', 'api_key', 'AWS_SECRET', 'connectionString')
+
+# Company name -> domain guess: strip punctuation, then a trailing legal suffix
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_SUFFIX_RE = re.compile(r'\s+(inc|llc|corp|corporation|ltd|limited|company|co)$')
+
+@lru_cache(maxsize=4096)
+def _estimate_domain(company_name: str) -> str:
+    """Domain guess for a company name, memoized since names recur across runs and leak sites"""
+    clean_name = _PUNCT_RE.sub('', company_name.lower())
+    clean_name = _SUFFIX_RE.sub('', clean_name)
+    clean_name = clean_name.replace(' ', '')
+    return f"{clean_name}.com"
+
 class FreeThreatsMonitor:
     """
     Replaces DarkOwl with free/low-cost alternatives
     Primary focus: Ransomware victims (highest signal value)
     """
-    def __init__(self, clay_client):
+    # Companies searched in parallel during a GitHub exposure check
+    GITHUB_CONCURRENCY = 4
+    
+    # Webhook batches in flight at once during push_to_clay
+    WEBHOOK_CONCURRENCY = 8
+    
+    # Seconds a cached API response is served without revalidation
+    RESPONSE_CACHE_TTL = 300
+    # Past this many entries, expired responses are dropped instead of kept for revalidation
+    RESPONSE_CACHE_MAX_ENTRIES = 1024
+    
+    def __init__(self, clay_client, debug: bool = False):
+        from config.settings import config
+        
         self.clay_client = clay_client
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'BTA-ThreatMonitor/1.0'
-        })
-        # Rate limiting
-        self.last_github_request = 0
-        self.github_rate_limit_delay = 1.0  # seconds between requests
-        
-    def collect_all_threats(self) -> List[Dict]:
-        """Main collection method - PROACTIVE ONLY (ransomware victims)"""
-        all_signals = []
+        # Debug mode keeps each victim's full API record in the signal's raw_data
+        self.debug = debug
+        # Pooled keep-alive session for every HTTP call in this module
+        self.session = create_session(
+            'BTA-ThreatMonitor/1.0',
+            pool_connections=32,
+            pool_maxsize=32,
+            retries=3,
+            status_forcelist=(502, 503, 504)
+        )
+        # requests advertises br by itself once the brotli package is installed
+        self._seen_encodings: Set[str] = set()
+        # Rate limiting: GitHub code search allows 10 requests/minute,
+        # HIBP one request every 1.5s (paced at 1.6s for margin)
+        self._gh_bucket = TokenBucket(capacity=10, rate=10 / 60)
+        self._hibp_bucket = TokenBucket(capacity=1, rate=1 / 1.6)
         
+        # URL -> (expiry, ETag, Last-Modified, body), shared by every run of this
+        # monitor; streamed responses keep only their validators (body None)
+        self._response_cache: Dict[str, Tuple[float, Optional[str], Optional[str], Optional[bytes]]] = {}
+        self._response_cache_lock = threading.Lock()
+        
+        # Webhook HMAC keyed once; each batch signs a copy of it
+        self._hmac_template = None
+        if config.CLAY_WEBHOOK_SECRET:
+            self._hmac_template = hmac.new(
+                config.CLAY_WEBHOOK_SECRET.encode(),
+                digestmod=hashlib.sha256
+            )
+        
+    def collect_all_threats(self) -> Iterator[Signal]:
+        """Main collection method - PROACTIVE ONLY (ransomware victims)"""
         # PROACTIVE: Only collect ransomware victims (highest value, free)
-        all_signals.extend(self.check_ransomware_victims())
+        yield from self.check_ransomware_victims()
         
         # REACTIVE: HIBP and GitHub moved to reactive analysis API
         # These are now handled by the HTTP API when you send companies
+    
+    def _cached_get(self, url: str, params: Optional[Dict] = None,
+                    headers: Optional[Dict] = None, ttl: Optional[float] = None,
+                    stream: bool = False) -> Tuple[int, Union[bytes, IO[bytes]]]:
+        """
+        GET through the response cache: fresh entries skip the network, stale
+        ones are revalidated with If-None-Match / If-Modified-Since.
+        Returns (status_code, body); with stream=True the body is a binary file
+        object read straight off the connection and is never cached. Only the
+        validators are kept, once the caller has parsed the whole body (see
+        _remember_stream), so an unchanged resource comes back as 304 with an
+        empty body.
+        """
+        key = url if not params else f"{url}?{urlencode(sorted(params.items()))}"
+        with self._response_cache_lock:
+            entry = self._response_cache.get(key)
+        
+        if entry and entry[0] > time.time():
+            return (304, io.BytesIO(b'')) if stream else (200, entry[3])
+        
+        request_headers = dict(headers or {})
+        if entry:
+            if entry[1]:
+                request_headers['If-None-Match'] = entry[1]
+            if entry[2]:
+                request_headers['If-Modified-Since'] = entry[2]
+        
+        response = self.session.get(url, params=params, headers=request_headers,
+                                    timeout=15, stream=stream)
+        self._note_encoding(url, response)
+        ttl = self.RESPONSE_CACHE_TTL if ttl is None else ttl
+        
+        def store(body: Optional[bytes]) -> None:
+            with self._response_cache_lock:
+                if len(self._response_cache) >= self.RESPONSE_CACHE_MAX_ENTRIES:
+                    now = time.time()
+                    self._response_cache = {
+                        k: v for k, v in self._response_cache.items() if v[0] > now
+                    }
+                self._response_cache[key] = (
+                    time.time() + ttl,
+                    response.headers.get('ETag'),
+                    response.headers.get('Last-Modified'),
+                    body
+                )
+        
+        if response.status_code == 304 and entry:
+            store(entry[3])
+            if stream:
+                response.close()
+                return 304, io.BytesIO(b'')
+            return 200, entry[3]
+        
+        if stream:
+            if response.status_code != 200:
+                return response.status_code, io.BytesIO(response.content)
+            # Let urllib3 undo any gzip/deflate transfer encoding
+            response.raw.decode_content = True
+            return 200, response.raw
         
-        return all_signals
+        body = response.content
+        if response.status_code == 200:
+            store(body)
+        return response.status_code, body
+    
+    def _remember_stream(self, url: str, headers, ttl: Optional[float] = None) -> None:
+        """Keep a fully parsed streamed response's validators so the next fetch is conditional"""
+        ttl = self.RESPONSE_CACHE_TTL if ttl is None else ttl
+        with self._response_cache_lock:
+            self._response_cache[url] = (
+                time.time() + ttl,
+                headers.get('ETag'),
+                headers.get('Last-Modified'),
+                None
+            )
     
-    def check_ransomware_victims(self) -> List[Dict]:
+    def _note_encoding(self, url: str, response: requests.Response) -> None:
+        """Log once per host which compression the API actually applies"""
+        host = urlparse(url).netloc
+        if host not in self._seen_encodings:
+            self._seen_encodings.add(host)
+            logger.debug(f"{host} Content-Encoding: {response.headers.get('Content-Encoding', 'identity')}")
+    
+    def check_ransomware_victims(self) -> Iterator[Signal]:
         """
         Check ransomware.live for active victims
         This is the HIGHEST VALUE signal - companies under active attack
+        Signals are yielded as the response is parsed
         """
-        signals = []
+        signals_found = 0
         
         try:
             logger.info("Checking ransomware.live for recent victims...")
             
-            # Free API - no key needed
-            response = self.session.get(
-                'https://api.ransomware.live/recentvictims',
-                timeout=15
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Ransomware.live API returned status {response.status_code}: {response.text[:200]}")
-                return signals
+            # Free API - no key needed; victims are parsed as the body streams in
+            url = 'https://api.ransomware.live/recentvictims'
+            status_code, body = self._cached_get(url, stream=True)
+            with closing(body):
+                if status_code == 304:
+                    # Victims were all reported when this list was last fetched
+                    logger.info("Ransomware.live victim list unchanged since the last check")
+                    return
+                if status_code != 200:
+                    logger.error(f"Ransomware.live API returned status {status_code}: {body.read(200).decode(errors='replace')}")
+                    return
                 
-            victims = response.json()
-            
-            # Handle different response formats
-            if isinstance(victims, dict):
-                if 'victims' in victims:
-                    victims = victims['victims']
-                elif 'data' in victims:
-                    victims = victims['data']
-                else:
-                    # Try to find the list in the response
-                    victims = []
-                    
-            if not isinstance(victims, list):
-                logger.error(f"Unexpected response format from ransomware.live: {type(victims)}")
-                return signals
-            
-            logger.info(f"Found {len(victims)} potential ransomware victims")
-            
-            for victim in victims:
-                if not isinstance(victim, dict):
-                    continue
-                    
-                # Parse victim data with validation
-                company_name = victim.get('post_title', '') or victim.get('title', '') or victim.get('name', '')
+                victims_seen = 0
+                now = datetime.now(timezone.utc)
                 
-                if not company_name or len(company_name.strip()) < 2:
-                    continue  # Skip invalid company names
+                for victim in self._iter_victims(body):
+                    victims_seen += 1
                     
-                company_name = company_name.strip()
-                group = victim.get('group_name', 'Unknown')
-                discovered = victim.get('discovered') or victim.get('date') or victim.get('published')
-                
-                # Parse discovery date with better error handling
-                discovery_date = datetime.utcnow()
-                if discovered:
+                    # Parse victim data with validation; non-object entries and
+                    # non-string names fail the attribute lookups and are skipped
                     try:
-                        # Handle various date formats
-                        if isinstance(discovered, str):
-                            # Remove timezone suffixes and normalize
-                            discovered_clean = discovered.replace('Z', '+00:00')
-                            if '+' not in discovered_clean and discovered_clean.endswith('T'):
-                                discovered_clean = discovered_clean[:-1]
-                            discovery_date = datetime.fromisoformat(discovered_clean)
-                        elif isinstance(discovered, (int, float)):
-                            # Unix timestamp
-                            discovery_date = datetime.fromtimestamp(discovered)
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"Could not parse date '{discovered}' for {company_name}: {e}")
-                        discovery_date = datetime.utcnow()
-                
-                hours_since = (datetime.utcnow() - discovery_date).total_seconds() / 3600
-                
-                # Skip very old entries (older than 30 days)
-                if hours_since > 24 * 30:
-                    continue
-                
-                # Estimate domain
-                estimated_domain = self.estimate_domain(company_name)
-                
-                # Create signal
-                signal = {
-                    'company_name': company_name,
-                    'domain': estimated_domain,
-                    'signal_type': 'active_ransomware',
-                    'signal_date': discovery_date.isoformat(),
-                    'signal_strength': 1.0,  # Maximum - they're being ransomed NOW
-                    'raw_data': {
+                        company_name = (victim.get('post_title', '') or victim.get('title', '')
+                                        or victim.get('name', '') or '').strip()
+                    except AttributeError:
+                        continue
+                    
+                    if len(company_name) < 2:
+                        continue  # Skip invalid company names
+                    
+                    group = victim.get('group_name', 'Unknown')
+                    discovered = victim.get('discovered') or victim.get('date') or victim.get('published')
+                    
+                    # Parse discovery date with better error handling (all UTC-aware)
+                    discovery_date = now
+                    if discovered:
+                        try:
+                            # Handle various date formats
+                            if isinstance(discovered, str):
+                                # Remove timezone suffixes and normalize
+                                discovered_clean = _ISO_Z_RE.sub('+00:00', discovered, count=1)
+                                if '+' not in discovered_clean and discovered_clean.endswith('T'):
+                                    discovered_clean = discovered_clean[:-1]
+                                discovery_date = datetime.fromisoformat(discovered_clean)
+                                if discovery_date.tzinfo is None:
+                                    discovery_date = discovery_date.replace(tzinfo=timezone.utc)
+                            elif isinstance(discovered, (int, float)):
+                                # Unix timestamp
+                                discovery_date = datetime.fromtimestamp(discovered, timezone.utc)
+                        except (ValueError, TypeError) as e:
+                            logger.warning(f"Could not parse date '{discovered}' for {company_name}: {e}")
+                            discovery_date = now
+                    
+                    # Skip very old entries (older than 30 days)
+                    age = now - discovery_date
+                    if age > RANSOMWARE_MAX_AGE:
+                        continue
+                    hours_since = age.total_seconds() / 3600
+                    
+                    # Estimate domain
+                    estimated_domain = self.estimate_domain(company_name)
+                    
+                    raw_data = {
                         'ransomware_group': group,
                         'hours_since_posting': round(hours_since, 1),
                         'leak_site_url': victim.get('post_url', '') or victim.get('url', ''),
-                        'discovered': discovered,
-                        'original_data': victim  # Keep original for debugging
-                    },
-                    'source': 'ransomware.live'
-                }
-                signals.append(signal)
+                        'discovered': discovered
+                    }
+                    if self.debug:
+                        raw_data['original_data'] = victim
+                    
+                    # Create signal
+                    signal = Signal(
+                        company_name=company_name,
+                        domain=estimated_domain,
+                        signal_type='active_ransomware',
+                        signal_date=discovery_date.astimezone(timezone.utc).replace(tzinfo=None).isoformat(),
+                        signal_strength=1.0,  # Maximum - they're being ransomed NOW
+                        raw_data=raw_data,
+                        source='ransomware.live'
+                    )
+                    signals_found += 1
+                    
+                    logger.warning(f"CRITICAL: Found ransomware victim: {company_name} ({estimated_domain}) by {group}")
+                    yield signal
                 
-                logger.warning(f"CRITICAL: Found ransomware victim: {company_name} ({estimated_domain}) by {group}")
+                logger.info(f"Processed {victims_seen} potential ransomware victims")
+                # Every victim has been yielded; an unchanged list can now come back as 304
+                self._remember_stream(url, body.headers)
         
         except requests.RequestException as e:
             logger.error(f"Network error checking ransomware.live: {e}")
-        except json.JSONDecodeError as e:
+        except ijson.JSONError as e:
             logger.error(f"Invalid JSON response from ransomware.live: {e}")
         except Exception as e:
             logger.error(f"Unexpected error checking ransomware sites: {e}")
         
-        logger.info(f"Collected {len(signals)} ransomware victim signals")
-        return signals
+        logger.info(f"Collected {signals_found} ransomware victim signals")
     
-    def _rate_limit_github(self) -> None:
-        """Enforce rate limiting for GitHub API"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_github_request
+    def _iter_victims(self, stream) -> Iterator:
+        """Yield victims from a ransomware.live response body as it is parsed"""
+        events = ijson.parse(stream, use_float=True)
+        first = next(events, None)
+        if first is None:
+            return
         
-        if time_since_last < self.github_rate_limit_delay:
-            sleep_time = self.github_rate_limit_delay - time_since_last
-            time.sleep(sleep_time)
+        events = chain([first], events)
+        _, event, _ = first
         
-        self.last_github_request = time.time()
+        if event == 'start_array':
+            yield from ijson.items(events, 'item')
+            return
+        
+        # Handle different response formats
+        victims = next(ijson.items(events, ''), None)
+        if isinstance(victims, dict):
+            if 'victims' in victims:
+                victims = victims['victims']
+            elif 'data' in victims:
+                victims = victims['data']
+            else:
+                # Try to find the list in the response
+                victims = []
+        
+        if not isinstance(victims, list):
+            logger.error(f"Unexpected response format from ransomware.live: {type(victims)}")
+            return
+        
+        yield from victims
     
-    def check_github_exposures(self) -> List[Dict]:
+    def check_github_exposures(self) -> List[Signal]:
         """
         Search GitHub for exposed credentials (FREE)
         Uses unauthenticated API with rate limiting
@@ -183,112 +348,32 @@ class FreeThreatsMonitor:
                 logger.info("No companies need GitHub exposure checking")
                 return signals
                 
-            if not isinstance(companies, list):
-                try:
-                    companies = list(companies) if companies else []
-                except Exception:
-                    logger.error("Invalid company data format from Clay query")
-                    return signals
-            
-            # Limit to avoid rate limits
-            companies = companies[:5]  # Reduced from 10
+            # Limit to avoid rate limits (islice also accepts a non-list iterable)
+            try:
+                companies = list(islice(companies, 5))  # Reduced from 10
+            except TypeError:
+                logger.error("Invalid company data format from Clay query")
+                return signals
             logger.info(f"Checking {len(companies)} companies for GitHub exposures")
             
-            company_updates = []
+            # One slot per company; skipped companies leave theirs as None
+            company_updates = [None] * len(companies)
             
-            for i, company in enumerate(companies):
-                if not isinstance(company, dict):
-                    continue
-                    
-                domain = company.get('domain')
-                company_name = company.get('company_name', '')
-                
-                if not domain or not company_name:
-                    logger.warning(f"Skipping company with missing domain/name: {company}")
-                    continue
-                
-                logger.info(f"Checking GitHub exposures for {company_name} ({domain}) [{i+1}/{len(companies)}]")
-                
-                # Define exposure search queries
-                exposure_queries = [
-                    f'"{domain}" password',
-                    f'"{domain}" api_key',
-                    f'"{company_name}" AWS_SECRET',
-                    f'"{domain}" connectionString'
-                ]
-                
-                found_exposure = False
-                for query in exposure_queries:
-                    try:
-                        # Rate limit requests
-                        self._rate_limit_github()
-                        
-                        # GitHub search API call
-                        response = self.session.get(
-                            'https://api.github.com/search/code',
-                            params={'q': query, 'per_page': 3},
-                            headers={'Accept': 'application/vnd.github.v3+json'},
-                            timeout=15
-                        )
-                        
-                        # Handle rate limiting
-                        if response.status_code == 403:
-                            logger.warning(f"GitHub rate limit hit for {company_name}. Response: {response.text[:100]}")
-                            # Stop processing this batch to avoid further rate limiting
-                            break
-                        
-                        if response.status_code == 422:
-                            logger.debug(f"Invalid search query for {company_name}: {query}")
-                            continue
-                            
-                        if response.status_code != 200:
-                            logger.warning(f"GitHub API returned {response.status_code} for {company_name}")
-                            continue
-                        
-                        try:
-                            results = response.json()
-                        except json.JSONDecodeError:
-                            logger.error(f"Invalid JSON response from GitHub for {company_name}")
-                            continue
-                        
-                        total_count = results.get('total_count', 0)
-                        if total_count > 0:
-                            # Found potential credential exposure
-                            signal = {
-                                'company_name': company_name,
-                                'domain': domain,
-                                'signal_type': 'github_exposure',
-                                'signal_date': datetime.utcnow().isoformat(),
-                                'signal_strength': 0.7,
-                                'raw_data': {
-                                    'exposure_type': 'credentials',
-                                    'repository_count': total_count,
-                                    'search_query': query,
-                                    'items_found': len(results.get('items', []))
-                                },
-                                'source': 'github'
-                            }
-                            signals.append(signal)
-                            logger.warning(f"Found GitHub credential exposure for {company_name}: {total_count} repositories")
-                            found_exposure = True
-                            break  # One exposure is sufficient
-                    
-                    except requests.RequestException as e:
-                        logger.error(f"Network error during GitHub search for {company_name}: {e}")
-                        break
-                    except Exception as e:
-                        logger.error(f"Unexpected error in GitHub search for {company_name}: {e}")
-                
-                # Mark company as checked regardless of results
-                company_updates.append({
-                    'company_name': company_name,
-                    'domain': domain,
-                    'checked_github': True,
-                    'last_checked_github': datetime.utcnow().isoformat(),
-                    'github_exposure_found': found_exposure
-                })
+            # Companies are searched concurrently; the GitHub token bucket
+            # still paces the individual requests
+            total = len(companies)
+            now_iso = datetime.utcnow().isoformat()
+            with ThreadPoolExecutor(max_workers=self.GITHUB_CONCURRENCY) as executor:
+                for i, (signal, company_update) in enumerate(executor.map(
+                    self._check_github_company, companies, range(1, total + 1),
+                    repeat(total), repeat(now_iso)
+                )):
+                    if signal:
+                        signals.append(signal)
+                    company_updates[i] = company_update
             
             # Bulk update companies in Clay
+            company_updates = [update for update in company_updates if update is not None]
             if company_updates:
                 try:
                     self.clay_client.bulk_upsert('company_universe', company_updates)
@@ -302,7 +387,97 @@ class FreeThreatsMonitor:
         logger.info(f"Collected {len(signals)} GitHub exposure signals")
         return signals
     
-    def check_hibp_breaches(self) -> List[Dict]:
+    def _check_github_company(self, company: Dict, position: int, total: int,
+                              now_iso: str) -> Tuple[Optional[Signal], Optional[Dict]]:
+        """Search GitHub for one company; returns (signal or None, company update or None)"""
+        try:
+            domain = company.get('domain')
+            company_name = company.get('company_name', '')
+        except AttributeError:
+            return None, None
+        
+        if not domain or not company_name:
+            logger.warning(f"Skipping company with missing domain/name: {company}")
+            return None, None
+        
+        logger.info(f"Checking GitHub exposures for {company_name} ({domain}) [{position}/{total}]")
+        
+        # One code search covers every credential keyword (GitHub ORs the terms)
+        query = (
+            f'"{domain}" ({" OR ".join(GITHUB_SECRET_KEYWORDS)}) '
+            f'OR ("{company_name}" AWS_SECRET)'
+        )
+        
+        signal = None
+        try:
+            # Rate limit requests
+            self._gh_bucket.acquire()
+            
+            # GitHub search API call; text-match fragments say which keyword hit
+            status_code, body = self._cached_get(
+                'https://api.github.com/search/code',
+                params={'q': query, 'per_page': 3},
+                headers={'Accept': 'application/vnd.github.v3.text-match+json'}
+            )
+            
+            # Handle rate limiting
+            if status_code == 403:
+                logger.warning(f"GitHub rate limit hit for {company_name}. Response: {body[:100].decode(errors='replace')}")
+            elif status_code == 422:
+                logger.debug(f"Invalid search query for {company_name}: {query}")
+            elif status_code != 200:
+                logger.warning(f"GitHub API returned {status_code} for {company_name}")
+            else:
+                results = json.loads(body)
+                total_count = results.get('total_count', 0)
+                if total_count > 0:
+                    items = results.get('items', [])
+                    
+                    # Found potential credential exposure
+                    signal = Signal(
+                        company_name=company_name,
+                        domain=domain,
+                        signal_type='github_exposure',
+                        signal_date=now_iso,
+                        signal_strength=0.7,
+                        raw_data={
+                            'exposure_type': 'credentials',
+                            'matched_keywords': self._matched_secret_keywords(items),
+                            'repository_count': total_count,
+                            'search_query': query,
+                            'items_found': len(items)
+                        },
+                        source='github'
+                    )
+                    logger.warning(f"Found GitHub credential exposure for {company_name}: {total_count} repositories")
+        
+        except json.JSONDecodeError:
+            logger.error(f"Invalid JSON response from GitHub for {company_name}")
+        except requests.RequestException as e:
+            logger.error(f"Network error during GitHub search for {company_name}: {e}")
+        except Exception as e:
+            logger.error(f"Unexpected error in GitHub search for {company_name}: {e}")
+        
+        # Mark company as checked regardless of results
+        company_update = {
+            'company_name': company_name,
+            'domain': domain,
+            'checked_github': True,
+            'last_checked_github': now_iso,
+            'github_exposure_found': signal is not None
+        }
+        return signal, company_update
+    
+    def _matched_secret_keywords(self, items: List[Dict]) -> List[str]:
+        """Which GITHUB_SECRET_KEYWORDS appear in the search hits' text-match fragments"""
+        fragments = ' '.join(
+            match.get('fragment', '')
+            for item in items
+            for match in item.get('text_matches', [])
+        ).lower()
+        return [keyword for keyword in GITHUB_SECRET_KEYWORDS if keyword.lower() in fragments]
+    
+    def check_hibp_breaches(self) -> List[Signal]:
         """
         Check Have I Been Pwned for breach data ($3.50/month)
         Since you have the API key, let's use it!
@@ -333,25 +508,24 @@ class FreeThreatsMonitor:
                 logger.info("No companies need HIBP checking")
                 return signals
                 
-            if not isinstance(companies, list):
-                try:
-                    companies = list(companies) if companies else []
-                except Exception:
-                    logger.error("Invalid company data from Clay query")
-                    return signals
-            
             # Check up to 10 companies per run (HIBP rate limits)
-            companies = companies[:10]
+            try:
+                companies = list(islice(companies, 10))
+            except TypeError:
+                logger.error("Invalid company data from Clay query")
+                return signals
             logger.info(f"Checking {len(companies)} companies for HIBP breaches")
             
-            company_updates = []
+            # One slot per company; skipped companies leave theirs as None
+            company_updates = [None] * len(companies)
+            now_iso = datetime.utcnow().isoformat()
             
             for i, company in enumerate(companies):
-                if not isinstance(company, dict):
+                try:
+                    domain = company.get('domain')
+                    company_name = company.get('company_name', '')
+                except AttributeError:
                     continue
-                    
-                domain = company.get('domain')
-                company_name = company.get('company_name', '')
                 
                 if not domain or not company_name:
                     continue
@@ -360,62 +534,59 @@ class FreeThreatsMonitor:
                 
                 try:
                     # Rate limit - HIBP allows 1 request every 1.5 seconds
-                    time.sleep(1.6)
+                    self._hibp_bucket.acquire()
                     
                     # HIBP API call
-                    response = self.session.get(
+                    status_code, body = self._cached_get(
                         f'https://haveibeenpwned.com/api/v3/breaches',
                         params={'domain': domain},
-                        headers={
-                            'hibp-api-key': hibp_api_key,
-                            'User-Agent': 'BTA-ThreatMonitor/1.0'
-                        },
-                        timeout=15
+                        headers={'hibp-api-key': hibp_api_key}
                     )
                     
-                    if response.status_code == 404:
+                    if status_code == 404:
                         # No breaches found for this domain
                         logger.debug(f"No HIBP breaches found for {domain}")
-                    elif response.status_code == 200:
+                    elif status_code == 200:
                         try:
-                            breaches = response.json()
+                            breaches = json.loads(body)
                             if breaches:
                                 # Found breaches for this domain
-                                signal = {
-                                    'company_name': company_name,
-                                    'domain': domain,
-                                    'signal_type': 'hibp_breach',
-                                    'signal_date': datetime.utcnow().isoformat(),
-                                    'signal_strength': 0.9,  # High priority
-                                    'raw_data': {
+                                signal = Signal(
+                                    company_name=company_name,
+                                    domain=domain,
+                                    signal_type='hibp_breach',
+                                    signal_date=now_iso,
+                                    signal_strength=0.9,  # High priority
+                                    raw_data={
                                         'breach_count': len(breaches),
                                         'recent_breaches': [b.get('Name', '') for b in breaches[:3]],
                                         'breach_details': breaches[:3]  # Keep first 3 for details
                                     },
-                                    'source': 'haveibeenpwned'
-                                }
+                                    source='haveibeenpwned'
+                                )
                                 signals.append(signal)
                                 logger.warning(f"Found HIBP breaches for {company_name}: {len(breaches)} breaches")
                         except json.JSONDecodeError:
                             logger.error(f"Invalid JSON from HIBP for {domain}")
-                    elif response.status_code == 429:
+                    elif status_code == 429:
                         logger.warning(f"HIBP rate limit hit, stopping batch")
                         break
                     else:
-                        logger.warning(f"HIBP API returned {response.status_code} for {domain}")
+                        logger.warning(f"HIBP API returned {status_code} for {domain}")
                 
                 except requests.RequestException as e:
                     logger.error(f"Network error during HIBP check for {domain}: {e}")
                 
                 # Mark as checked
-                company_updates.append({
+                company_updates[i] = {
                     'company_name': company_name,
                     'domain': domain,
                     'checked_hibp': True,
-                    'last_checked_hibp': datetime.utcnow().isoformat()
-                })
+                    'last_checked_hibp': now_iso
+                }
             
             # Update companies as checked
+            company_updates = [update for update in company_updates if update is not None]
             if company_updates:
                 try:
                     self.clay_client.bulk_upsert('company_universe', company_updates)
@@ -429,7 +600,7 @@ class FreeThreatsMonitor:
         logger.info(f"Collected {len(signals)} HIBP breach signals")
         return signals
     
-    def check_shodan_exposures(self) -> List[Dict]:
+    def check_shodan_exposures(self) -> List[Signal]:
         """
         Optional: Shodan monitoring ($59/month)
         Only use if you have API key
@@ -458,9 +629,10 @@ class FreeThreatsMonitor:
             companies = companies[:5]  # Check 5 at a time
             
             for company in companies:
-                if not isinstance(company, dict):
+                try:
+                    domain = company.get('domain')
+                except AttributeError:
                     continue
-                domain = company.get('domain')
                 if not domain:
                     continue
                 
@@ -481,18 +653,18 @@ class FreeThreatsMonitor:
                         })
                 
                 if vulnerable_services:
-                    signal = {
-                        'company_name': company.get('company_name', ''),
-                        'domain': domain,
-                        'signal_type': 'exposed_systems',
-                        'signal_date': datetime.utcnow().isoformat(),
-                        'signal_strength': 0.8,
-                        'raw_data': {
+                    signal = Signal(
+                        company_name=company.get('company_name', ''),
+                        domain=domain,
+                        signal_type='exposed_systems',
+                        signal_date=datetime.utcnow().isoformat(),
+                        signal_strength=0.8,
+                        raw_data={
                             'exposed_count': len(vulnerable_services),
                             'services': vulnerable_services
                         },
-                        'source': 'shodan'
-                    }
+                        source='shodan'
+                    )
                     signals.append(signal)
 
         except Exception as e:
@@ -502,114 +674,142 @@ class FreeThreatsMonitor:
     
     def estimate_domain(self, company_name: str) -> str:
         """Estimate domain from company name"""
-        import re
-        clean_name = re.sub(r'[^\w\s]', '', company_name.lower())
-        clean_name = re.sub(r'\s+(inc|llc|corp|corporation|ltd|limited|company|co)$', '', clean_name)
-        clean_name = clean_name.replace(' ', '')
-        return f"{clean_name}.com"
+        return _estimate_domain(company_name)
     
-    def push_to_clay(self, signals: List[Dict]):
-        """Push threat signals to Clay webhook in batches"""
+    def push_to_clay(self, signals: Iterable[Union[Signal, Dict]]) -> int:
+        """
+        Push threat signals (Signal records or signal dicts) to Clay webhook in batches
+        Accepts any iterable; batches are sent as the stream is read, so a
+        generator is never materialized. Returns the number of signals sent.
+        The stream's length is only known at its end, so batch_info's
+        total_batches/total_records are filled in on the last batch and are
+        null on the batches before it.
+        """
         from config.settings import config
         
         if not config.CLAY_WEBHOOK_URL:
-            print("Warning: No Clay webhook URL configured")
-            return
-        
-        if not signals:
-            print("No threat signals to send")
-            return
-        
-        # Send data in smaller batches to avoid payload size limits
-        batch_size = 50  # Reduced batch size for Clay webhook payload limits
-        total_batches = (len(signals) + batch_size - 1) // batch_size
+            logger.warning("No Clay webhook URL configured")
+            return 0
         
-        print(f"Sending {len(signals)} threat signals in {total_batches} batches of {batch_size}")
+        # Send data in batches; signals no longer carry the full upstream record,
+        # so each batch stays well under the Clay webhook payload limit
+        batch_size = 100
         
+        signals = iter(signals)
+        total_records = 0
         successful_batches = 0
         failed_batches = 0
+        now_iso = datetime.utcnow().isoformat()
         
-        for i in range(0, len(signals), batch_size):
-            batch = signals[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            
-            # Prepare webhook payload for this batch
-            webhook_data = {
-                'event_type': 'threat_intelligence_collection',
-                'timestamp': datetime.utcnow().isoformat(),
-                'source': 'free_darkweb_monitor',
-                'batch_info': {
-                    'batch_number': batch_num,
-                    'total_batches': total_batches,
-                    'batch_size': len(batch),
-                    'total_records': len(signals)
-                },
-                'data': {
-                    'companies': [],
-                    'pain_signals': []
-                },
-                'summary': {
-                    'batch_threats': len(batch),
-                    'signal_types': list(set([s['signal_type'] for s in batch])),
-                    'sources': list(set([s['source'] for s in batch]))
-                }
-            }
-            
-            for signal in batch:
-                # Prepare company record
-                company = {
-                    'company_name': signal['company_name'],
-                    'domain': signal['domain'],
-                    'data_source': signal['source'],
-                    'last_updated': datetime.utcnow().isoformat()
-                }
-                webhook_data['data']['companies'].append(company)
+        # Batches are independent, so several POSTs share the pooled session at once
+        with ThreadPoolExecutor(max_workers=self.WEBHOOK_CONCURRENCY) as executor:
+            futures = []
+            next_batch = list(islice(signals, batch_size))
+            for batch_num in count(1):
+                if not next_batch:
+                    break
+                batch = next_batch
+                total_records += len(batch)
                 
-                # Prepare signal record
-                pain_signal = {
-                    'domain': signal['domain'],
-                    'signal_type': signal['signal_type'],
-                    'signal_date': signal['signal_date'],
-                    'signal_strength': signal['signal_strength'],
-                    'raw_data': signal['raw_data'],  # Keep as dict, not JSON string
-                    'source': signal['source']
-                }
-                webhook_data['data']['pain_signals'].append(pain_signal)
+                # Reading one batch ahead shows whether this is the last one,
+                # which then carries the totals for the whole stream
+                next_batch = list(islice(signals, batch_size))
+                is_last = not next_batch
+                webhook_data = self._build_batch_payload(
+                    batch, batch_num,
+                    batch_num if is_last else None,
+                    total_records if is_last else None,
+                    now_iso
+                )
+                
+                # Send this batch to Clay webhook
+                logger.debug("Sending batch %d (%d records)", batch_num, len(batch))
+                futures.append(executor.submit(self.send_to_webhook, webhook_data))
             
-            # Send this batch to Clay webhook
-            print(f"Sending batch {batch_num}/{total_batches} ({len(batch)} records)...")
-            if self.send_to_webhook(webhook_data):
-                successful_batches += 1
-            else:
-                failed_batches += 1
+            if not futures:
+                logger.info("No threat signals to send")
+                return 0
+            
+            for future in as_completed(futures):
+                if future.result():
+                    successful_batches += 1
+                else:
+                    failed_batches += 1
         
-        print(f"Batch sending complete: {successful_batches} successful, {failed_batches} failed")
+        logger.info("Batch sending complete: %d threat signals in %d batches, %d successful, %d failed",
+                    total_records, len(futures), successful_batches, failed_batches)
+        return total_records
+    
+    def _build_batch_payload(self, batch: List[Union[Signal, Dict]], batch_num: int,
+                             total_batches: Optional[int], total_records: Optional[int],
+                             timestamp: str) -> Dict:
+        """Prepare the webhook payload for one batch of signals"""
+        companies = []
+        pain_signals = []
+        signal_types = set()
+        sources = set()
+        
+        # One pass over the batch fills both record lists and the summary sets
+        for signal in batch:
+            if not isinstance(signal, Signal):
+                signal = Signal.from_mapping(signal)
+            companies.append({
+                'company_name': signal.company_name,
+                'domain': signal.domain,
+                'data_source': signal.source,
+                'last_updated': timestamp
+            })
+            pain_signals.append({
+                'domain': signal.domain,
+                'signal_type': signal.signal_type,
+                'signal_date': signal.signal_date,
+                'signal_strength': signal.signal_strength,
+                'raw_data': signal.raw_data,  # Keep as dict, not JSON string
+                'source': signal.source
+            })
+            signal_types.add(signal.signal_type)
+            sources.add(signal.source)
+        
+        return {
+            'event_type': 'threat_intelligence_collection',
+            'timestamp': timestamp,
+            'source': 'free_darkweb_monitor',
+            'batch_info': {
+                'batch_number': batch_num,
+                'total_batches': total_batches,
+                'batch_size': len(batch),
+                'total_records': total_records
+            },
+            'data': {
+                'companies': companies,
+                'pain_signals': pain_signals
+            },
+            'summary': {
+                'batch_threats': len(batch),
+                'signal_types': sorted(signal_types),
+                'sources': sorted(sources)
+            }
+        }
     
     def send_to_webhook(self, data: Dict) -> bool:
         """Send data to Clay webhook with authentication"""
         from config.settings import config
-        import hashlib
-        import hmac
         
         try:
             # Prepare webhook request
             webhook_url = config.CLAY_WEBHOOK_URL
-            payload = json.dumps(data, indent=2)
+            payload = orjson.dumps(data)
             
             # Set up headers
             headers = {
-                'Content-Type': 'application/json',
-                'User-Agent': 'BTA-ThreatMonitor/1.0'
+                'Content-Type': 'application/json'
             }
             
             # Add webhook signature if secret is configured
-            if config.CLAY_WEBHOOK_SECRET:
-                signature = hmac.new(
-                    config.CLAY_WEBHOOK_SECRET.encode(),
-                    payload.encode(),
-                    hashlib.sha256
-                ).hexdigest()
-                headers['X-Webhook-Signature'] = f'sha256={signature}'
+            if self._hmac_template is not None:
+                signer = self._hmac_template.copy()
+                signer.update(payload)
+                headers['X-Webhook-Signature'] = f'sha256={signer.hexdigest()}'
             
             # Make the webhook request
             response = self.session.post(
@@ -620,26 +820,31 @@ class FreeThreatsMonitor:
             )
             
             if response.status_code == 200:
-                print(f"✅ Batch sent successfully")
+                logger.debug("Batch sent successfully")
                 return True
             else:
-                print(f"❌ Batch failed - Status {response.status_code}: {response.text[:100]}")
+                logger.error("Batch failed - Status %d: %s", response.status_code, response.text[:100])
                 return False
                 
         except Exception as e:
-            print(f"❌ Batch failed - Error: {e}")
+            logger.error("Batch failed - Error: %s", e)
             return False
     
     def run_collection(self):
         """Main entry point - replaces DarkOwl collection"""
-        print("Starting free threat monitoring...")
+        logger.info("Starting free threat monitoring...")
         
-        # Collect all threats
-        all_signals = self.collect_all_threats()
+        from config.settings import config
         
-        print(f"Found {len(all_signals)} threat signals")
+        threats = self.collect_all_threats()
+        if config.CLAY_WEBHOOK_URL:
+            # Push threats to Clay as they are found
+            signals_found = self.push_to_clay(threats)
+        else:
+            # Nowhere to send them, but still run the collection so the count is real
+            logger.warning("No Clay webhook URL configured; threat signals will not be sent")
+            signals_found = sum(1 for _ in threats)
         
-        # Push to Clay
-        self.push_to_clay(all_signals)
+        logger.info("Found %d threat signals", signals_found)
         
-        print("Threat monitoring complete")
+        logger.info("Threat monitoring complete")
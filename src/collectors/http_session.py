@@ -0,0 +1,31 @@
+"""
+HTTP Session - Pooled requests sessions for the collectors
+Keeps TCP/TLS connections alive across calls to the same host
+"""
+
+import requests
+from typing import Collection
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+def create_session(user_agent: str, pool_connections: int = 50,
+                   pool_maxsize: int = 16, retries: int = 2,
+                   status_forcelist: Collection[int] = ()) -> requests.Session:
+    """Create a session with a tuned connection pool and connection-error retries"""
+    session = requests.Session()
+    session.headers.update({
+        'User-Agent': user_agent
+    })
+    
+    # Retry connect/read failures, plus any listed transient statuses;
+    # throttling responses are otherwise handled by the callers
+    retry = Retry(total=retries, connect=retries, read=retries,
+                  status=retries if status_forcelist else 0,
+                  status_forcelist=status_forcelist or None,
+                  backoff_factor=0.5, raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=pool_connections,
+                          pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    
+    return session
@@ -1,17 +1,217 @@
 import requests
-from datetime import datetime, timedelta
-from typing import List, Dict
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterator, List, Dict, Optional, Tuple
+from urllib.parse import urlparse
+from lxml import etree
+import gzip
+import hmac
+import io
+import logging
+import orjson
+import random
 import re
 import time
+from .http_session import create_session
+from .rate_limit import AdaptiveRateLimiter
+from .signal import Signal
+
+try:
+    import ahocorasick  # pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2  # google-re2
+except ImportError:
+    re2 = None
+
+logger = logging.getLogger(__name__)
+
+def _compile_extractor(pattern: str):
+    """Compile a case-insensitive extractor pattern, on RE2 when it is installed"""
+    # The [\s\w]* gaps backtrack heavily in the stdlib engine on long pages;
+    # RE2 matches in linear time and supports the same syntax and named groups
+    if re2 is not None:
+        return re2.compile('(?i)' + pattern)
+    return re.compile(pattern, re.IGNORECASE)
+
+# Company-name extraction patterns, compiled once for every page scanned. Each
+# extractor's alternatives are joined into one union pattern so a page is scanned
+# in a single pass; every alternative captures its company name in its own named group
+_SEC_UNION = _compile_extractor(
+    r'(?P<pre>[A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Co\.?))[\s\w]*(?:cyber insurance|cyber liability)'
+    r'|(?:cyber insurance|cyber liability)[\s\w]*(?P<post>[A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Co\.?))'
+)
+_REG_UNION = _compile_extractor(
+    r'(?P<pre>[A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Co\.?))[\s\w]*(?:cyber|data breach|security)'
+    r'|(?:cyber|data breach|security)[\s\w]*(?P<post>[A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Co\.?))'
+)
+_PROBLEM_UNION = _compile_extractor(
+    r'(?P<pre>[A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Co\.?))[\s\w]*(?:denied|canceled|expired|increased|struggling)'
+    r'|(?:denied|canceled|expired)[\s\w]*(?P<post>[A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Co\.?))'
+    r'|(?P<subject>[A-Z][a-zA-Z\s]{3,30})[\s\w]*(?:cyber insurance|coverage)[\s\w]*(?:denied|problem|issue)'
+)
+
+# Company name -> domain guess: strip punctuation, then a trailing legal suffix
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_SUFFIX_RE = re.compile(r'\s+(inc|llc|corp|corporation|ltd|limited|company|co)$')
+
+@lru_cache(maxsize=4096)
+def _estimate_domain(company_name: str) -> str:
+    """Domain guess for a company name, memoized since the same names recur across scans"""
+    clean_name = _PUNCT_RE.sub('', company_name.lower())
+    clean_name = _SUFFIX_RE.sub('', clean_name)
+    clean_name = clean_name.replace(' ', '')
+    return f"{clean_name}.com"
+
+def _capped_matches(pattern, text: str, per_group: int) -> Iterator[str]:
+    """Yield company names matched by a union pattern, at most per_group from each alternative"""
+    remaining = dict.fromkeys(pattern.groupindex, per_group)
+    for match in pattern.finditer(text):
+        group = match.lastgroup
+        if remaining[group]:
+            remaining[group] -= 1
+            yield match.group(group)
+            if not any(remaining.values()):
+                return  # Every alternative is at its cap; skip the rest of the page
+
+# Company-name substrings that suggest a larger company / a high cyber risk industry
+ENTERPRISE_INDICATORS = (
+    'corp', 'corporation', 'inc', 'llc', 'ltd', 'group',
+    'holdings', 'international', 'global', 'systems'
+)
+HIGH_RISK_KEYWORDS = (
+    'healthcare', 'medical', 'hospital', 'clinic',
+    'financial', 'bank', 'credit', 'insurance',
+    'technology', 'tech', 'software', 'data',
+    'manufacturing', 'energy', 'utilities',
+    'legal', 'law', 'government', 'municipal'
+)
+
+# Renewal opportunity / insurance risk scores: base plus the weight of each factor present
+RENEWAL_OPPORTUNITY_BASE = 0.4
+RENEWAL_OPPORTUNITY_WEIGHTS = {
+    'recent_breach_activity': 0.3,  # from other collectors
+    'enterprise_size': 0.2,
+    'high_risk_industry': 0.2,
+    'renewal_season': 0.1
+}
+RENEWAL_SEASON_MONTHS = frozenset({10, 11, 12, 1})  # Q4/Q1 renewal season
+RENEWAL_WINDOWS = ("Q4 2024", "Q1 2025", "Q2 2025", "Q3 2025")
+
+INSURANCE_RISK_BASE = 0.3
+INSURANCE_RISK_WEIGHTS = {
+    'recent_breach_history': 0.4,  # major factor
+    'high_risk_industry': 0.2,
+    'enterprise_size': 0.1,  # larger = more risk
+    'multiple_threats': 0.2,
+    'some_threats': 0.1,
+    'very_recent_incident': 0.2,
+    'recent_incident': 0.1
+}
+
+def _parse_signal_date(value: str) -> Optional[datetime]:
+    """Parse a pain signal's ISO date as an aware datetime (naive dates are UTC)"""
+    if not value:
+        return None
+    try:
+        # Python 3.11's C fromisoformat accepts a trailing 'Z' directly
+        signal_date = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+    if signal_date.tzinfo is None:
+        signal_date = signal_date.replace(tzinfo=timezone.utc)
+    return signal_date
+
+def _build_name_automaton():
+    """Build one Aho-Corasick automaton over both keyword sets (None if pyahocorasick is missing)"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keyword in ENTERPRISE_INDICATORS:
+        automaton.add_word(keyword, 'enterprise')
+    for keyword in HIGH_RISK_KEYWORDS:
+        automaton.add_word(keyword, 'high_risk')
+    automaton.make_automaton()
+    return automaton
+
+# Aho-Corasick classifies a name in a single pass; without pyahocorasick,
+# one precompiled alternation per keyword set still keeps the scan in C
+_NAME_AUTOMATON = _build_name_automaton()
+_ENTERPRISE_RE = re.compile('|'.join(re.escape(keyword) for keyword in ENTERPRISE_INDICATORS))
+_HIGH_RISK_RE = re.compile('|'.join(re.escape(keyword) for keyword in HIGH_RISK_KEYWORDS))
+
+@lru_cache(maxsize=4096)
+def _classify_name(name_lower: str) -> Tuple[bool, bool]:
+    """(enterprise indicator, high-risk industry) for a lowercased company name"""
+    if _NAME_AUTOMATON is not None:
+        hits = {category for _, category in _NAME_AUTOMATON.iter(name_lower)}
+        return 'enterprise' in hits, 'high_risk' in hits
+    return (
+        _ENTERPRISE_RE.search(name_lower) is not None,
+        _HIGH_RISK_RE.search(name_lower) is not None
+    )
 
 class InsuranceIntelCollector:
+    # Politeness delay per source host (requests/second); different hosts are
+    # fetched concurrently, requests to the same host stay spaced out.
+    # EDGAR's fair-access policy allows 10 req/s, so the SEC term searches
+    # run side by side on pooled keep-alive connections
+    HOST_RATES = {
+        'www.sec.gov': 4.0,
+        'news.google.com': 0.5,
+        'feeds.finance.yahoo.com': 0.5
+    }
+    DEFAULT_HOST_RATE = 1 / 3  # state insurance department sites
+    MAX_HOST_RATE = 4.0
+    MAX_THROTTLE_RETRIES = 2
+    MAX_RETRY_AFTER = 60  # seconds
+    
+    # Outbound requests in flight at once across all scanners
+    SCAN_CONCURRENCY = 8
+    
+    # Only the head of a page is read; the extractors keep just the first
+    # few matches, so the rest of a large filing index is never downloaded
+    MAX_HTML_BYTES = 512 * 1024
+    
+    # Clay lookups in flight at once when pain signals are fetched per domain
+    CLAY_CONCURRENCY = 10
+    
+    # Webhook batches POSTed at once over the pooled session
+    WEBHOOK_CONCURRENCY = 8
+    
+    # Optional structured news search (GNEWS_API_KEY); RSS feeds are the fallback
+    GNEWS_SEARCH_URL = 'https://gnews.io/api/v4/search'
+    GNEWS_MAX_ARTICLES = 50
+    
     def __init__(self, clay_client):
         self.clay_client = clay_client
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'BTA-InsuranceIntel/1.0'
-        })
+        # Pooled keep-alive session shared by the scanner threads; transient
+        # server errors are retried with backoff, while throttling (429/503)
+        # reaches _get so the adaptive rate limiter can slow down
+        self.session = create_session(
+            'BTA-InsuranceIntel/1.0',
+            pool_connections=16,
+            pool_maxsize=32,
+            retries=3,
+            status_forcelist=(500, 502, 504)
+        )
+        self.rate_limiter = AdaptiveRateLimiter(
+            initial_rates=self.HOST_RATES,
+            default_rate=self.DEFAULT_HOST_RATE,
+            max_rate=self.MAX_HOST_RATE
+        )
+        
+        # Collection time shared by every signal of a collect_insurance_signals run
+        self._now_iso: Optional[str] = None
+        # Domain -> pain signals already fetched during the current run
+        self._pain_signals_cache: Optional[Dict[str, List[Dict]]] = None
+        
+        # Webhook signing key encoded once; each batch is signed with one hmac.digest call
+        from config.settings import config
+        self._webhook_secret = config.CLAY_WEBHOOK_SECRET.encode() if config.CLAY_WEBHOOK_SECRET else None
         
         # Major cyber insurance providers
         self.insurers = [
@@ -20,49 +220,62 @@ class InsuranceIntelCollector:
             'Coalition', 'At-Bay', 'Cowbell Cyber'
         ]
         
-    def collect_insurance_signals(self) -> List[Dict]:
+    def collect_insurance_signals(self) -> List[Signal]:
         """Collect cyber insurance market signals"""
         signals = []
         
-        print("Collecting cyber insurance intelligence...")
-        
-        # Check insurance requirement changes
-        signals.extend(self.scan_insurance_requirements())
+        logger.info("Collecting cyber insurance intelligence...")
         
-        # Check companies approaching renewal
-        signals.extend(self.identify_renewal_opportunities())
-        
-        # Analyze existing companies for insurance risks
-        signals.extend(self.analyze_existing_companies_for_risks())
+        self._now_iso = datetime.utcnow().isoformat()
+        self._pain_signals_cache = {}
+        try:
+            # Check insurance requirement changes
+            signals.extend(self.scan_insurance_requirements())
+            
+            # Check companies approaching renewal
+            signals.extend(self.identify_renewal_opportunities())
+            
+            # Analyze existing companies for insurance risks
+            signals.extend(self.analyze_existing_companies_for_risks())
+        finally:
+            self._now_iso = None
+            self._pain_signals_cache = None
         
         return signals
     
-    def scan_insurance_requirements(self) -> List[Dict]:
+    def _collection_time(self) -> str:
+        """ISO timestamp for signals and check marks: the run's, or now outside a run"""
+        return self._now_iso or datetime.utcnow().isoformat()
+    
+    def scan_insurance_requirements(self) -> List[Signal]:
         """Scan for companies with specific insurance gaps or denied coverage"""
         signals = []
         
         try:
             # Enhanced approach: Use multiple data sources
-            print("Scanning for insurance requirement changes...")
-            
-            # Method 1: SEC Filings for insurance-related disclosures
-            sec_signals = self.scan_sec_insurance_disclosures()
-            signals.extend(sec_signals)
+            logger.info("Scanning for insurance requirement changes...")
             
-            # Method 2: Industry news with better targeting
-            news_signals = self.scan_insurance_news_enhanced()
-            signals.extend(news_signals)
-            
-            # Method 3: Regulatory filings and state insurance databases
-            regulatory_signals = self.scan_regulatory_insurance_data()
-            signals.extend(regulatory_signals)
+            # The three sources hit different hosts, so they are scanned side by side
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                # Method 1: SEC Filings for insurance-related disclosures
+                sec_future = executor.submit(self.scan_sec_insurance_disclosures)
+                
+                # Method 2: Industry news with better targeting
+                news_future = executor.submit(self.scan_insurance_news_enhanced)
+                
+                # Method 3: Regulatory filings and state insurance databases
+                regulatory_future = executor.submit(self.scan_regulatory_insurance_data)
+                
+                signals.extend(sec_future.result())
+                signals.extend(news_future.result())
+                signals.extend(regulatory_future.result())
             
         except Exception as e:
-            print(f"Error in insurance requirements scan: {e}")
+            logger.error("Error in insurance requirements scan: %s", e)
         
         return signals[:10]  # Increased limit for better coverage
     
-    def scan_sec_insurance_disclosures(self) -> List[Dict]:
+    def scan_sec_insurance_disclosures(self) -> List[Signal]:
         """Scan SEC filings for cyber insurance disclosures"""
         signals = []
         
@@ -75,39 +288,42 @@ class InsuranceIntelCollector:
                 "cybersecurity insurance"
             ]
             
-            for term in search_terms:
-                try:
-                    # Use SEC EDGAR search API
-                    response = self.session.get(
-                        'https://www.sec.gov/cgi-bin/browse-edgar',
-                        params={
-                            'action': 'getcompany',
-                            'CIK': '',  # We'll search by text
-                            'type': '10-K',  # Annual reports
-                            'dateb': '',  # Recent filings
-                            'owner': 'exclude',
-                            'count': '100',
-                            'search_text': term
-                        },
-                        timeout=15
-                    )
-                    
-                    if response.status_code == 200:
-                        companies = self.extract_sec_insurance_companies(response.text, term)
-                        signals.extend(companies)
-                    
-                    time.sleep(2)  # Respectful delay
-                    
-                except Exception as e:
-                    print(f"Error searching SEC for '{term}': {e}")
-                    continue
+            with ThreadPoolExecutor(max_workers=self.SCAN_CONCURRENCY) as executor:
+                for companies in executor.map(self._search_sec_term, search_terms):
+                    signals.extend(companies)
                     
         except Exception as e:
-            print(f"Error in SEC insurance scan: {e}")
+            logger.error("Error in SEC insurance scan: %s", e)
         
         return signals
     
-    def scan_insurance_news_enhanced(self) -> List[Dict]:
+    def _search_sec_term(self, term: str) -> List[Signal]:
+        """Search SEC EDGAR for one insurance term"""
+        try:
+            # Use SEC EDGAR search API
+            status_code, body = self._get_body(
+                'https://www.sec.gov/cgi-bin/browse-edgar',
+                params={
+                    'action': 'getcompany',
+                    'CIK': '',  # We'll search by text
+                    'type': '10-K',  # Annual reports
+                    'dateb': '',  # Recent filings
+                    'owner': 'exclude',
+                    'count': '100',
+                    'search_text': term
+                },
+                timeout=15
+            )
+            
+            if status_code == 200:
+                return self.extract_sec_insurance_companies(body, term)
+            
+        except Exception as e:
+            logger.error("Error searching SEC for '%s': %s", term, e)
+        
+        return []
+    
+    def scan_insurance_news_enhanced(self) -> List[Signal]:
         """Enhanced news scanning with better targeting"""
         signals = []
         
@@ -121,42 +337,93 @@ class InsuranceIntelCollector:
                 "cyber insurance coverage gap"
             ]
             
-            for term in targeted_terms:
-                try:
-                    # Use multiple news sources
-                    sources = [
-                        'https://news.google.com/rss/search',
-                        'https://feeds.finance.yahoo.com/rss/2.0/headline'
-                    ]
-                    
-                    for source in sources:
-                        response = self.session.get(
-                            source,
-                            params={
-                                'q': f'"{term}"',
-                                'hl': 'en',
-                                'gl': 'US',
-                                'ceid': 'US:en'
-                            },
-                            timeout=10
-                        )
-                        
-                        if response.status_code == 200:
-                            companies = self.extract_companies_with_insurance_issues(response.text, term)
-                            signals.extend(companies)
-                        
-                        time.sleep(2)
-                    
-                except Exception as e:
-                    print(f"Error searching news for '{term}': {e}")
-                    continue
+            # One structured API call covers every term when a key is configured
+            api_signals = self._search_gnews(targeted_terms)
+            if api_signals is not None:
+                return api_signals
+            
+            # Use multiple news sources
+            sources = [
+                'https://news.google.com/rss/search',
+                'https://feeds.finance.yahoo.com/rss/2.0/headline'
+            ]
+            
+            # Every (term, source) pair is an independent request
+            pairs = [(term, source) for term in targeted_terms for source in sources]
+            with ThreadPoolExecutor(max_workers=self.SCAN_CONCURRENCY) as executor:
+                for companies in executor.map(lambda pair: self._search_news(*pair), pairs):
+                    signals.extend(companies)
                     
         except Exception as e:
-            print(f"Error in enhanced news scan: {e}")
+            logger.error("Error in enhanced news scan: %s", e)
         
         return signals
     
-    def scan_regulatory_insurance_data(self) -> List[Dict]:
+    def _search_news(self, term: str, source: str) -> List[Signal]:
+        """Search one news feed for one insurance term"""
+        try:
+            status_code, body = self._get_body(
+                source,
+                params={
+                    'q': f'"{term}"',
+                    'hl': 'en',
+                    'gl': 'US',
+                    'ceid': 'US:en'
+                },
+                timeout=10
+            )
+            
+            if status_code == 200:
+                return self.extract_companies_with_insurance_issues(body, term)
+            
+        except Exception as e:
+            logger.error("Error searching news for '%s': %s", term, e)
+        
+        return []
+    
+    def _search_gnews(self, terms: List[str]) -> Optional[List[Signal]]:
+        """Search GNews for all terms in one OR query; None when unconfigured or failed so RSS is used"""
+        from config.settings import config
+        
+        api_key = getattr(config, 'GNEWS_API_KEY', None)
+        if not api_key:
+            return None
+        
+        try:
+            response = self._get(
+                self.GNEWS_SEARCH_URL,
+                params={
+                    'q': ' OR '.join(f'"{term}"' for term in terms),
+                    'lang': 'en',
+                    'country': 'us',
+                    'max': self.GNEWS_MAX_ARTICLES,
+                    'apikey': api_key
+                },
+                timeout=10
+            )
+            if response.status_code != 200:
+                logger.error("GNews search returned status %s, falling back to RSS", response.status_code)
+                return None
+            articles = orjson.loads(response.content).get('articles') or []
+        except Exception as e:
+            logger.error("Error searching GNews, falling back to RSS: %s", e)
+            return None
+        
+        # Group the headlines by the term they mention so each term keeps its own
+        # severity and match cap, as with the per-term RSS searches
+        texts_by_term = {}
+        for article in articles:
+            text = f"{article.get('title') or ''} | {article.get('description') or ''}"
+            text_lower = text.lower()
+            term = next((term for term in terms if term in text_lower), 'cyber insurance')
+            texts_by_term.setdefault(term, []).append(text)
+        
+        signals = []
+        for term, texts in texts_by_term.items():
+            signals.extend(self._extract_insurance_issues(' | '.join(texts), term))
+        return signals
+    
+    def scan_regulatory_insurance_data(self) -> List[Signal]:
         """Scan state insurance regulatory data"""
         signals = []
         
@@ -168,100 +435,136 @@ class InsuranceIntelCollector:
                 'https://www.tdi.texas.gov'
             ]
             
-            for site in state_sites:
-                try:
-                    # Look for cyber insurance bulletins or notices
-                    response = self.session.get(f"{site}/bulletin", timeout=10)
-                    
-                    if response.status_code == 200:
-                        companies = self.extract_regulatory_insurance_companies(response.text, site)
-                        signals.extend(companies)
-                    
-                    time.sleep(3)
-                    
-                except Exception as e:
-                    print(f"Error scanning {site}: {e}")
-                    continue
+            with ThreadPoolExecutor(max_workers=self.SCAN_CONCURRENCY) as executor:
+                for companies in executor.map(self._scan_regulatory_site, state_sites):
+                    signals.extend(companies)
                     
         except Exception as e:
-            print(f"Error in regulatory scan: {e}")
+            logger.error("Error in regulatory scan: %s", e)
         
         return signals
     
-    def extract_sec_insurance_companies(self, html_content: str, search_term: str) -> List[Dict]:
+    def _scan_regulatory_site(self, site: str) -> List[Signal]:
+        """Fetch one state insurance department's bulletin page"""
+        try:
+            # Look for cyber insurance bulletins or notices
+            status_code, body = self._get_body(f"{site}/bulletin", timeout=10)
+            
+            if status_code == 200:
+                return self.extract_regulatory_insurance_companies(body, site)
+            
+        except Exception as e:
+            logger.error("Error scanning %s: %s", site, e)
+        
+        return []
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET paced by the per-host rate limiter, retrying throttled (429/503) responses"""
+        host = urlparse(url).netloc
+        
+        for attempt in range(self.MAX_THROTTLE_RETRIES + 1):
+            self.rate_limiter.wait(host)
+            response = self.session.get(url, **kwargs)
+            
+            if response.status_code not in (429, 503):
+                self.rate_limiter.record_success(host)
+                return response
+            
+            self.rate_limiter.record_throttle(host)
+            logger.warning("Throttled by %s (status %s), rate now %.2f req/s",
+                           host, response.status_code, self.rate_limiter.get_rate(host))
+            
+            if attempt < self.MAX_THROTTLE_RETRIES:
+                delay = self._retry_after(response, host)
+                response.close()
+                time.sleep(delay)
+        
+        logger.error("Giving up on %s after %s throttled attempts", url, self.MAX_THROTTLE_RETRIES + 1)
+        return response
+    
+    def _retry_after(self, response: requests.Response, host: str) -> float:
+        """Seconds to wait before retrying a throttled request"""
+        try:
+            return min(float(response.headers['Retry-After']), self.MAX_RETRY_AFTER)
+        except (KeyError, ValueError):
+            return 1.0 / self.rate_limiter.get_rate(host)
+    
+    def _get_body(self, url: str, **kwargs) -> Tuple[int, str]:
+        """Streamed GET returning (status_code, text) with the body capped at MAX_HTML_BYTES"""
+        response = self._get(url, stream=True, **kwargs)
+        try:
+            if response.status_code != 200:
+                return response.status_code, ''
+            raw = response.raw.read(self.MAX_HTML_BYTES, decode_content=True)
+            # The cap can split a multi-byte character; drop the fragment
+            return response.status_code, raw.decode(response.encoding or 'utf-8', 'ignore')
+        finally:
+            response.close()
+    
+    def extract_sec_insurance_companies(self, html_content: str, search_term: str) -> List[Signal]:
         """Extract companies from SEC filings mentioning insurance"""
         signals = []
         
         try:
-            # Look for company names in SEC filings
-            company_patterns = [
-                r'([A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Co\.?))[\s\w]*(?:cyber insurance|cyber liability)',
-                r'(?:cyber insurance|cyber liability)[\s\w]*([A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Co\.?))'
-            ]
+            signal_date = self._collection_time()
             
-            for pattern in company_patterns:
-                matches = re.findall(pattern, html_content, re.IGNORECASE)
-                for match in matches[:3]:  # Limit to top 3 per pattern
-                    if len(match.strip()) > 5 and len(match.strip()) < 50:
-                        signal = {
-                            'company_name': match.strip(),
-                            'domain': self.estimate_domain(match.strip()),
-                            'signal_type': 'sec_insurance_disclosure',
-                            'signal_date': datetime.utcnow().isoformat(),
-                            'signal_strength': 0.8,  # High confidence from SEC filings
-                            'raw_data': {
-                                'source': 'sec_edgar',
-                                'search_term': search_term,
-                                'disclosure_type': 'annual_report',
-                                'confidence': 'high'
-                            },
-                            'source': 'sec_filings'
-                        }
-                        signals.append(signal)
-                        print(f"Found SEC insurance disclosure: {match.strip()}")
+            # Look for company names in SEC filings
+            for match in _capped_matches(_SEC_UNION, html_content, 3):  # Limit to top 3 per pattern
+                if len(match.strip()) > 5 and len(match.strip()) < 50:
+                    signal = Signal(
+                        company_name=match.strip(),
+                        domain=self.estimate_domain(match.strip()),
+                        signal_type='sec_insurance_disclosure',
+                        signal_date=signal_date,
+                        signal_strength=0.8,  # High confidence from SEC filings
+                        raw_data={
+                            'source': 'sec_edgar',
+                            'search_term': search_term,
+                            'disclosure_type': 'annual_report',
+                            'confidence': 'high'
+                        },
+                        source='sec_filings'
+                    )
+                    signals.append(signal)
+                    logger.debug("Found SEC insurance disclosure: %s", match.strip())
                         
         except Exception as e:
-            print(f"Error extracting SEC companies: {e}")
+            logger.error("Error extracting SEC companies: %s", e)
         
         return signals
     
-    def extract_regulatory_insurance_companies(self, html_content: str, site: str) -> List[Dict]:
+    def extract_regulatory_insurance_companies(self, html_content: str, site: str) -> List[Signal]:
         """Extract companies from regulatory insurance data"""
         signals = []
         
         try:
-            # Look for company mentions in regulatory bulletins
-            company_patterns = [
-                r'([A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Co\.?))[\s\w]*(?:cyber|data breach|security)',
-                r'(?:cyber|data breach|security)[\s\w]*([A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Co\.?))'
-            ]
+            signal_date = self._collection_time()
             
-            for pattern in company_patterns:
-                matches = re.findall(pattern, html_content, re.IGNORECASE)
-                for match in matches[:2]:  # Limit to top 2 per pattern
-                    if len(match.strip()) > 5 and len(match.strip()) < 50:
-                        signal = {
-                            'company_name': match.strip(),
-                            'domain': self.estimate_domain(match.strip()),
-                            'signal_type': 'regulatory_insurance_notice',
-                            'signal_date': datetime.utcnow().isoformat(),
-                            'signal_strength': 0.7,  # Medium-high confidence from regulatory data
-                            'raw_data': {
-                                'source': site,
-                                'regulatory_type': 'insurance_bulletin',
-                                'confidence': 'medium_high'
-                            },
-                            'source': 'regulatory_data'
-                        }
-                        signals.append(signal)
-                        print(f"Found regulatory insurance notice: {match.strip()}")
-                        
+            # Look for company mentions in regulatory bulletins
+            for match in _capped_matches(_REG_UNION, html_content, 2):  # Limit to top 2 per pattern
+                if len(match.strip()) > 5 and len(match.strip()) < 50:
+                    signal = Signal(
+                        company_name=match.strip(),
+                        domain=self.estimate_domain(match.strip()),
+                        signal_type='regulatory_insurance_notice',
+                        signal_date=signal_date,
+                        signal_strength=0.7,  # Medium-high confidence from regulatory data
+                        raw_data={
+                            'source': site,
+                            'regulatory_type': 'insurance_bulletin',
+                            'confidence': 'medium_high'
+                        },
+                        source='regulatory_data'
+                    )
+                    signals.append(signal)
+                    logger.debug("Found regulatory insurance notice: %s", match.strip())
+                    
         except Exception as e:
-            print(f"Error extracting regulatory companies: {e}")
+            logger.error("Error extracting regulatory companies: %s", e)
         
         return signals
     
-    def identify_renewal_opportunities(self) -> List[Dict]:
+    def identify_renewal_opportunities(self) -> List[Signal]:
         """Identify companies likely approaching insurance renewal"""
         signals = []
         
@@ -273,11 +576,11 @@ class InsuranceIntelCollector:
                     {'insurance_checked': False}
                 )
             except Exception as e:
-                print(f"Error querying companies: {e}")
+                logger.error("Error querying companies: %s", e)
                 return signals
             
             if not companies:
-                print("No companies need insurance analysis")
+                logger.info("No companies need insurance analysis")
                 return signals
             
             if not isinstance(companies, list):
@@ -286,91 +589,80 @@ class InsuranceIntelCollector:
                 except:
                     return signals
             
-            # Analyze up to 20 companies per run
-            companies = companies[:20]
-            print(f"Analyzing {len(companies)} companies for insurance renewal opportunities")
+            # Analyze up to 20 companies per run; rows without a domain or name are skipped
+            companies = [
+                company for company in companies[:20]
+                if isinstance(company, dict) and company.get('domain') and company.get('company_name')
+            ]
+            logger.info("Analyzing %s companies for insurance renewal opportunities", len(companies))
             
-            company_updates = []
+            # One Clay query for the batch's pain signals instead of one per company
+            signals_by_domain = self._load_pain_signals([company['domain'] for company in companies])
+            now_iso = self._collection_time()
             
             for company in companies:
-                if not isinstance(company, dict):
-                    continue
-                    
-                domain = company.get('domain')
-                company_name = company.get('company_name', '')
-                
-                if not domain or not company_name:
-                    continue
-                
                 # Estimate insurance renewal timing
-                renewal_data = self.estimate_renewal_opportunity(company)
+                renewal_data = self.estimate_renewal_opportunity(company, signals_by_domain)
                 
                 if renewal_data and renewal_data.get('signal_strength', 0) > 0.5:
-                    signal = {
-                        'company_name': company_name,
-                        'domain': domain,
-                        'signal_type': 'insurance_renewal_opportunity',
-                        'signal_date': datetime.utcnow().isoformat(),
-                        'signal_strength': renewal_data['signal_strength'],
-                        'raw_data': renewal_data,
-                        'source': 'insurance_intel'
-                    }
+                    signal = Signal(
+                        company_name=company['company_name'],
+                        domain=company['domain'],
+                        signal_type='insurance_renewal_opportunity',
+                        signal_date=now_iso,
+                        signal_strength=renewal_data['signal_strength'],
+                        raw_data=renewal_data,
+                        source='insurance_intel'
+                    )
                     signals.append(signal)
-                
-                # Mark as checked
-                company_updates.append({
-                    'company_name': company_name,
-                    'domain': domain,
+            
+            # Mark every analyzed company as checked
+            company_updates = [
+                {
+                    'company_name': company['company_name'],
+                    'domain': company['domain'],
                     'insurance_checked': True,
-                    'last_insurance_check': datetime.utcnow().isoformat()
-                })
+                    'last_insurance_check': now_iso
+                }
+                for company in companies
+            ]
             
             # Update companies as checked
             if company_updates:
                 try:
                     self.clay_client.bulk_upsert('company_universe', company_updates)
-                    print(f"Updated {len(company_updates)} companies as insurance-checked")
+                    logger.info("Updated %s companies as insurance-checked", len(company_updates))
                 except Exception as e:
-                    print(f"Error updating insurance check status: {e}")
+                    logger.error("Error updating insurance check status: %s", e)
                     
         except Exception as e:
-            print(f"Error in renewal opportunities identification: {e}")
+            logger.error("Error in renewal opportunities identification: %s", e)
         
         return signals
     
-    def estimate_renewal_opportunity(self, company: Dict) -> Dict:
+    def estimate_renewal_opportunity(self, company: Dict,
+                                     signals_by_domain: Optional[Dict[str, List[Dict]]] = None) -> Dict:
         """Estimate insurance renewal opportunity based on company data"""
         try:
             domain = company.get('domain', '')
             company_name = company.get('company_name', '')
             
-            # Start with base opportunity score
-            opportunity_score = 0.4
-            renewal_factors = []
-            
-            # Factor 1: Recent breach history (from other collectors)
-            if self.has_recent_breach_signals(domain):
-                opportunity_score += 0.3
-                renewal_factors.append("recent_breach_activity")
-            
-            # Factor 2: Company size estimation (based on domain patterns)
-            if self.estimate_company_size(domain, company_name) == 'enterprise':
-                opportunity_score += 0.2
-                renewal_factors.append("enterprise_size")
-            
-            # Factor 3: Industry risk factors
-            if self.is_high_risk_industry(company_name):
-                opportunity_score += 0.2
-                renewal_factors.append("high_risk_industry")
-            
-            # Factor 4: Seasonality (Q4 is common renewal period)
-            current_month = datetime.now().month
-            if current_month in [10, 11, 12, 1]:  # Q4/Q1 renewal season
-                opportunity_score += 0.1
-                renewal_factors.append("renewal_season")
+            # Breach history, size (name/domain patterns), industry and
+            # seasonality (Q4 is common renewal period)
+            flags = {
+                'recent_breach_activity': self.has_recent_breach_signals(domain, signals_by_domain),
+                'enterprise_size': self.estimate_company_size(domain, company_name) == 'enterprise',
+                'high_risk_industry': self.is_high_risk_industry(company_name),
+                'renewal_season': datetime.now().month in RENEWAL_SEASON_MONTHS
+            }
+            renewal_factors = [factor for factor, present in flags.items() if present]
             
-            # Cap at 1.0
-            opportunity_score = min(opportunity_score, 1.0)
+            # Base score plus each factor's weight, capped at 1.0
+            opportunity_score = min(
+                sum((RENEWAL_OPPORTUNITY_WEIGHTS[factor] for factor in renewal_factors),
+                    RENEWAL_OPPORTUNITY_BASE),
+                1.0
+            )
             
             if opportunity_score > 0.5:
                 return {
@@ -381,30 +673,83 @@ class InsuranceIntelCollector:
                 }
             
         except Exception as e:
-            print(f"Error estimating renewal opportunity for {company.get('domain', 'unknown')}: {e}")
+            logger.error("Error estimating renewal opportunity for %s: %s", company.get('domain', 'unknown'), e)
         
         return None
     
-    def has_recent_breach_signals(self, domain: str) -> bool:
+    def _load_pain_signals(self, domains: List[str]) -> Dict[str, List[Dict]]:
+        """Fetch the pain signals for a batch of domains in one Clay query, grouped by domain"""
+        # Domains already fetched earlier in this run (e.g. by the renewal pass) are reused
+        cache = self._pain_signals_cache if self._pain_signals_cache is not None else {}
+        signals_by_domain = {domain: [] for domain in domains if domain not in cache}
+        
+        if signals_by_domain:
+            try:
+                signals = self.clay_client.query_table(
+                    'pain_signals',
+                    {'domain': {'$in': list(signals_by_domain)}}
+                )
+            except Exception as e:
+                logger.error("Error loading pain signals, falling back to per-domain queries: %s", e)
+                # Overlap the per-domain lookups; domains that still fail are
+                # left out and queried again by the scoring helpers
+                pending = list(signals_by_domain)
+                with ThreadPoolExecutor(max_workers=self.CLAY_CONCURRENCY) as executor:
+                    results = executor.map(self._query_domain_signals, pending)
+                    signals_by_domain = {
+                        domain: domain_signals
+                        for domain, domain_signals in zip(pending, results)
+                        if domain_signals is not None
+                    }
+                signals = []
+            
+            for signal in signals or []:
+                domain_signals = signals_by_domain.get(signal.get('domain'))
+                if domain_signals is not None:
+                    domain_signals.append(signal)
+            cache.update(signals_by_domain)
+        
+        return {domain: cache[domain] for domain in domains if domain in cache}
+    
+    def _query_domain_signals(self, domain: str) -> Optional[List[Dict]]:
+        """Pain signals for one domain, or None when the Clay query fails"""
+        try:
+            return self.clay_client.query_table('pain_signals', {'domain': domain}) or []
+        except Exception as e:
+            logger.error("Error loading pain signals for %s: %s", domain, e)
+            return None
+    
+    def _get_pain_signals(self, domain: str,
+                          signals_by_domain: Optional[Dict[str, List[Dict]]] = None) -> List[Dict]:
+        """Pain signals for a domain, from the preloaded batch or this run's cache when they have it"""
+        if signals_by_domain is not None and domain in signals_by_domain:
+            return signals_by_domain[domain]
+        
+        cache = self._pain_signals_cache
+        if cache is not None and domain in cache:
+            return cache[domain]
+        
+        signals = self.clay_client.query_table(
+            'pain_signals',
+            {'domain': domain}
+        )
+        if cache is not None:
+            cache[domain] = signals or []
+        return signals
+    
+    def has_recent_breach_signals(self, domain: str,
+                                  signals_by_domain: Optional[Dict[str, List[Dict]]] = None) -> bool:
         """Check if company has recent breach/threat signals"""
         try:
-            signals = self.clay_client.query_table(
-                'pain_signals',
-                {'domain': domain}
-            )
+            signals = self._get_pain_signals(domain, signals_by_domain)
             
             if signals:
                 # Check if any signals are recent (within 6 months)
-                six_months_ago = datetime.utcnow() - timedelta(days=180)
+                six_months_ago = datetime.now(timezone.utc) - timedelta(days=180)
                 for signal in signals:
-                    signal_date_str = signal.get('signal_date', '')
-                    if signal_date_str:
-                        try:
-                            signal_date = datetime.fromisoformat(signal_date_str.replace('Z', '+00:00'))
-                            if signal_date > six_months_ago:
-                                return True
-                        except:
-                            continue
+                    signal_date = _parse_signal_date(signal.get('signal_date', ''))
+                    if signal_date and signal_date > six_months_ago:
+                        return True
         except:
             pass
         return False
@@ -412,13 +757,7 @@ class InsuranceIntelCollector:
     def estimate_company_size(self, domain: str, company_name: str) -> str:
         """Estimate company size from domain and name patterns"""
         # Simple heuristics for company size
-        enterprise_indicators = [
-            'corp', 'corporation', 'inc', 'llc', 'ltd', 'group',
-            'holdings', 'international', 'global', 'systems'
-        ]
-        
-        name_lower = company_name.lower()
-        if any(indicator in name_lower for indicator in enterprise_indicators):
+        if _classify_name(company_name.lower())[0]:
             return 'enterprise'
         
         # Domain patterns
@@ -429,24 +768,11 @@ class InsuranceIntelCollector:
     
     def is_high_risk_industry(self, company_name: str) -> bool:
         """Identify high cyber risk industries"""
-        high_risk_keywords = [
-            'healthcare', 'medical', 'hospital', 'clinic',
-            'financial', 'bank', 'credit', 'insurance',
-            'technology', 'tech', 'software', 'data',
-            'manufacturing', 'energy', 'utilities',
-            'legal', 'law', 'government', 'municipal'
-        ]
-        
-        name_lower = company_name.lower()
-        return any(keyword in name_lower for keyword in high_risk_keywords)
+        return _classify_name(company_name.lower())[1]
     
     def estimate_renewal_window(self) -> str:
         """Estimate likely renewal window"""
-        import random
-        windows = [
-            "Q4 2024", "Q1 2025", "Q2 2025", "Q3 2025"
-        ]
-        return random.choice(windows)
+        return random.choice(RENEWAL_WINDOWS)
     
     def get_approach_recommendation(self, factors: List[str]) -> str:
         """Get recommended outreach approach"""
@@ -459,16 +785,16 @@ class InsuranceIntelCollector:
         else:
             return "general_insurance_review"
     
-    def extract_companies_with_insurance_issues(self, rss_text: str, search_term: str) -> List[Dict]:
+    def extract_companies_with_insurance_issues(self, rss_text: str, search_term: str) -> List[Signal]:
         """Extract companies with specific insurance problems from news"""
+        # Run over the items' headline text rather than the raw XML
+        return self._extract_insurance_issues(self._rss_item_text(rss_text), search_term)
+    
+    def _extract_insurance_issues(self, headline_text: str, search_term: str) -> List[Signal]:
+        """Extract companies with insurance problems from joined headline text"""
         signals = []
         try:
-            # More specific patterns for companies with insurance issues
-            problem_patterns = [
-                r'([A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Co\.?))[\s\w]*(?:denied|canceled|expired|increased|struggling)',
-                r'(?:denied|canceled|expired)[\s\w]*([A-Z][a-zA-Z\s]+(?:Inc|Corp|LLC|Ltd|Co\.?))',
-                r'([A-Z][a-zA-Z\s]{3,30})[\s\w]*(?:cyber insurance|coverage)[\s\w]*(?:denied|problem|issue)'
-            ]
+            signal_date = self._collection_time()
             
             # Signal strength based on problem type
             problem_severity = {
@@ -479,42 +805,54 @@ class InsuranceIntelCollector:
                 'struggling': 0.8
             }
             
-            for pattern in problem_patterns:
-                matches = re.findall(pattern, rss_text, re.IGNORECASE)
-                for match in matches[:2]:  # Quality over quantity
-                    if isinstance(match, tuple):
-                        match = match[0]
+            # More specific patterns for companies with insurance issues
+            for match in _capped_matches(_PROBLEM_UNION, headline_text, 2):  # Quality over quantity
+                if len(match.strip()) > 5 and len(match.strip()) < 50:
+                    # Determine signal strength based on problem type
+                    strength = 0.7  # default
+                    for problem, score in problem_severity.items():
+                        if problem in search_term.lower():
+                            strength = score
+                            break
                     
-                    if len(match.strip()) > 5 and len(match.strip()) < 50:
-                        # Determine signal strength based on problem type
-                        strength = 0.7  # default
-                        for problem, score in problem_severity.items():
-                            if problem in search_term.lower():
-                                strength = score
-                                break
-                        
-                        signal = {
-                            'company_name': match.strip(),
-                            'domain': self.estimate_domain(match.strip()),
-                            'signal_type': 'insurance_coverage_issue',
-                            'signal_date': datetime.utcnow().isoformat(),
-                            'signal_strength': strength,
-                            'raw_data': {
-                                'issue_type': search_term,
-                                'news_source': 'targeted_search',
-                                'detection_method': 'insurance_problem_detection',
-                                'urgency': 'high' if strength > 0.7 else 'medium'
-                            },
-                            'source': 'insurance_issues'
-                        }
-                        signals.append(signal)
-                        print(f"Found insurance issue for: {match.strip()} ({search_term})")
+                    signal = Signal(
+                        company_name=match.strip(),
+                        domain=self.estimate_domain(match.strip()),
+                        signal_type='insurance_coverage_issue',
+                        signal_date=signal_date,
+                        signal_strength=strength,
+                        raw_data={
+                            'issue_type': search_term,
+                            'news_source': 'targeted_search',
+                            'detection_method': 'insurance_problem_detection',
+                            'urgency': 'high' if strength > 0.7 else 'medium'
+                        },
+                        source='insurance_issues'
+                    )
+                    signals.append(signal)
+                    logger.debug("Found insurance issue for: %s (%s)", match.strip(), search_term)
         except Exception as e:
-            print(f"Error extracting companies with insurance issues: {e}")
+            logger.error("Error extracting companies with insurance issues: %s", e)
         
         return signals
     
-    def analyze_existing_companies_for_risks(self) -> List[Dict]:
+    def _rss_item_text(self, rss_text: str) -> str:
+        """Title and description of every RSS item, separated so matches can't span fields"""
+        if not rss_text:
+            return ''
+        
+        items = []
+        try:
+            for _, item in etree.iterparse(io.BytesIO(rss_text.encode('utf-8')), tag='item',
+                                           recover=True, resolve_entities=False):
+                items.append(f"{item.findtext('title') or ''} | {item.findtext('description') or ''}")
+                item.clear()
+        except etree.XMLSyntaxError as e:
+            logger.error("Error parsing RSS feed: %s", e)
+        
+        return ' | '.join(items)
+    
+    def analyze_existing_companies_for_risks(self) -> List[Signal]:
         """Analyze existing companies in database for insurance risk factors"""
         signals = []
         
@@ -526,11 +864,11 @@ class InsuranceIntelCollector:
                     {'insurance_risk_analyzed': False}
                 )
             except Exception as e:
-                print(f"Error querying companies for risk analysis: {e}")
+                logger.error("Error querying companies for risk analysis: %s", e)
                 return signals
             
             if not companies:
-                print("No companies need insurance risk analysis")
+                logger.info("No companies need insurance risk analysis")
                 return signals
             
             if not isinstance(companies, list):
@@ -539,105 +877,91 @@ class InsuranceIntelCollector:
                 except:
                     return signals
             
-            # Analyze up to 15 companies per run
-            companies = companies[:15]
-            print(f"Analyzing {len(companies)} companies for insurance risks")
+            # Analyze up to 15 companies per run; rows without a domain or name are skipped
+            companies = [
+                company for company in companies[:15]
+                if isinstance(company, dict) and company.get('domain') and company.get('company_name')
+            ]
+            logger.info("Analyzing %s companies for insurance risks", len(companies))
             
-            company_updates = []
+            # One Clay query for the batch's pain signals instead of three per company
+            signals_by_domain = self._load_pain_signals([company['domain'] for company in companies])
+            now_iso = self._collection_time()
             
-            for company in companies:
-                if not isinstance(company, dict):
-                    continue
-                    
-                domain = company.get('domain')
-                company_name = company.get('company_name', '')
-                
-                if not domain or not company_name:
-                    continue
-                
-                # Calculate comprehensive insurance risk score
-                risk_analysis = self.calculate_insurance_risk_score(company)
-                
+            # Calculate comprehensive insurance risk scores
+            risk_analyses = [
+                self.calculate_insurance_risk_score(company, signals_by_domain)
+                for company in companies
+            ]
+            
+            for company, risk_analysis in zip(companies, risk_analyses):
                 if risk_analysis and risk_analysis.get('signal_strength', 0) > 0.6:
-                    signal = {
-                        'company_name': company_name,
-                        'domain': domain,
-                        'signal_type': 'high_insurance_risk',
-                        'signal_date': datetime.utcnow().isoformat(),
-                        'signal_strength': risk_analysis['signal_strength'],
-                        'raw_data': risk_analysis,
-                        'source': 'risk_analysis'
-                    }
+                    signal = Signal(
+                        company_name=company['company_name'],
+                        domain=company['domain'],
+                        signal_type='high_insurance_risk',
+                        signal_date=now_iso,
+                        signal_strength=risk_analysis['signal_strength'],
+                        raw_data=risk_analysis,
+                        source='risk_analysis'
+                    )
                     signals.append(signal)
-                    print(f"High insurance risk identified: {company_name} (score: {risk_analysis['signal_strength']:.2f})")
-                
-                # Mark as analyzed
-                company_updates.append({
-                    'company_name': company_name,
-                    'domain': domain,
+                    logger.info("High insurance risk identified: %s (score: %.2f)",
+                                company['company_name'], risk_analysis['signal_strength'])
+            
+            # Mark every analyzed company with its score
+            company_updates = [
+                {
+                    'company_name': company['company_name'],
+                    'domain': company['domain'],
                     'insurance_risk_analyzed': True,
-                    'last_risk_analysis': datetime.utcnow().isoformat(),
+                    'last_risk_analysis': now_iso,
                     'risk_score': risk_analysis.get('signal_strength', 0) if risk_analysis else 0
-                })
+                }
+                for company, risk_analysis in zip(companies, risk_analyses)
+            ]
             
             # Update companies as analyzed
             if company_updates:
                 try:
                     self.clay_client.bulk_upsert('company_universe', company_updates)
-                    print(f"Updated {len(company_updates)} companies with risk analysis")
+                    logger.info("Updated %s companies with risk analysis", len(company_updates))
                 except Exception as e:
-                    print(f"Error updating risk analysis status: {e}")
+                    logger.error("Error updating risk analysis status: %s", e)
                     
         except Exception as e:
-            print(f"Error in insurance risk analysis: {e}")
+            logger.error("Error in insurance risk analysis: %s", e)
         
         return signals
     
-    def calculate_insurance_risk_score(self, company: Dict) -> Dict:
+    def calculate_insurance_risk_score(self, company: Dict,
+                                       signals_by_domain: Optional[Dict[str, List[Dict]]] = None) -> Dict:
         """Calculate comprehensive insurance risk score for a company"""
         try:
             domain = company.get('domain', '')
             company_name = company.get('company_name', '')
             
-            risk_score = 0.3  # Base score
-            risk_factors = []
-            
-            # Factor 1: Recent security incidents (major factor)
-            if self.has_recent_breach_signals(domain):
-                risk_score += 0.4
-                risk_factors.append("recent_breach_history")
-            
-            # Factor 2: High-risk industry
-            if self.is_high_risk_industry(company_name):
-                risk_score += 0.2
-                risk_factors.append("high_risk_industry")
-            
-            # Factor 3: Company size (larger = more risk)
-            if self.estimate_company_size(domain, company_name) == 'enterprise':
-                risk_score += 0.1
-                risk_factors.append("enterprise_size")
-            
-            # Factor 4: Multiple threat signals
-            threat_count = self.count_threat_signals(domain)
-            if threat_count > 2:
-                risk_score += 0.2
-                risk_factors.append("multiple_threats")
-            elif threat_count > 0:
-                risk_score += 0.1
-                risk_factors.append("some_threats")
-            
-            # Factor 5: Time since last incident (recent = higher risk)
-            days_since_incident = self.days_since_last_incident(domain)
-            if days_since_incident is not None:
-                if days_since_incident < 30:
-                    risk_score += 0.2
-                    risk_factors.append("very_recent_incident")
-                elif days_since_incident < 90:
-                    risk_score += 0.1
-                    risk_factors.append("recent_incident")
-            
-            # Cap at 1.0
-            risk_score = min(risk_score, 1.0)
+            threat_count = self.count_threat_signals(domain, signals_by_domain)
+            days_since_incident = self.days_since_last_incident(domain, signals_by_domain)
+            recent_days = days_since_incident if days_since_incident is not None else float('inf')
+            
+            # Recent incidents, industry, size, threat volume and incident recency
+            flags = {
+                'recent_breach_history': self.has_recent_breach_signals(domain, signals_by_domain),
+                'high_risk_industry': self.is_high_risk_industry(company_name),
+                'enterprise_size': self.estimate_company_size(domain, company_name) == 'enterprise',
+                'multiple_threats': threat_count > 2,
+                'some_threats': 0 < threat_count <= 2,
+                'very_recent_incident': recent_days < 30,
+                'recent_incident': 30 <= recent_days < 90
+            }
+            risk_factors = [factor for factor, present in flags.items() if present]
+            
+            # Base score plus each factor's weight, capped at 1.0
+            risk_score = min(
+                sum((INSURANCE_RISK_WEIGHTS[factor] for factor in risk_factors), INSURANCE_RISK_BASE),
+                1.0
+            )
             
             if risk_score > 0.6:
                 return {
@@ -650,46 +974,35 @@ class InsuranceIntelCollector:
                 }
             
         except Exception as e:
-            print(f"Error calculating risk score for {company.get('domain', 'unknown')}: {e}")
+            logger.error("Error calculating risk score for %s: %s", company.get('domain', 'unknown'), e)
         
         return None
     
-    def count_threat_signals(self, domain: str) -> int:
+    def count_threat_signals(self, domain: str,
+                             signals_by_domain: Optional[Dict[str, List[Dict]]] = None) -> int:
         """Count total threat signals for a domain"""
         try:
-            signals = self.clay_client.query_table(
-                'pain_signals',
-                {'domain': domain}
-            )
+            signals = self._get_pain_signals(domain, signals_by_domain)
             return len(signals) if signals else 0
         except:
             return 0
     
-    def days_since_last_incident(self, domain: str) -> int:
+    def days_since_last_incident(self, domain: str,
+                                 signals_by_domain: Optional[Dict[str, List[Dict]]] = None) -> int:
         """Calculate days since last security incident"""
         try:
-            signals = self.clay_client.query_table(
-                'pain_signals',
-                {'domain': domain}
-            )
+            signals = self._get_pain_signals(domain, signals_by_domain)
             
             if not signals:
                 return None
             
-            # Find most recent incident
-            most_recent = None
-            for signal in signals:
-                signal_date_str = signal.get('signal_date', '')
-                if signal_date_str:
-                    try:
-                        signal_date = datetime.fromisoformat(signal_date_str.replace('Z', '+00:00'))
-                        if most_recent is None or signal_date > most_recent:
-                            most_recent = signal_date
-                    except:
-                        continue
+            # Find most recent incident; parsed dates are aware UTC-comparable
+            now_utc = datetime.now(timezone.utc)
+            signal_dates = (_parse_signal_date(signal.get('signal_date', '')) for signal in signals)
+            most_recent = max((date for date in signal_dates if date), default=None)
             
             if most_recent:
-                return (datetime.utcnow().replace(tzinfo=most_recent.tzinfo) - most_recent).days
+                return (now_utc - most_recent).days
             
         except:
             pass
@@ -708,139 +1021,127 @@ class InsuranceIntelCollector:
     
     def estimate_domain(self, company_name: str) -> str:
         """Estimate domain from company name"""
-        clean_name = re.sub(r'[^\w\s]', '', company_name.lower())
-        clean_name = re.sub(r'\s+(inc|llc|corp|corporation|ltd|limited|company|co)$', '', clean_name)
-        clean_name = clean_name.replace(' ', '')
-        return f"{clean_name}.com"
+        return _estimate_domain(company_name)
     
-    def push_to_clay(self, signals: List[Dict]):
+    def push_to_clay(self, signals: List[Signal]):
         """Push insurance signals to Clay webhook in batches"""
         from config.settings import config
         
         if not config.CLAY_WEBHOOK_URL:
-            print("Warning: No Clay webhook URL configured")
+            logger.warning("No Clay webhook URL configured")
             return
         
         if not signals:
-            print("No insurance signals to send")
+            logger.info("No insurance signals to send")
             return
         
         # Send data in smaller batches
         batch_size = 25  # Smaller batches for insurance data
         total_batches = (len(signals) + batch_size - 1) // batch_size
         
-        print(f"Sending {len(signals)} insurance signals in {total_batches} batches of {batch_size}")
+        logger.info("Sending %s insurance signals in %s batches of %s", len(signals), total_batches, batch_size)
         
         successful_batches = 0
         failed_batches = 0
+        now_iso = datetime.utcnow().isoformat()
         
-        for i in range(0, len(signals), batch_size):
-            batch = signals[i:i + batch_size]
-            batch_num = (i // batch_size) + 1
-            
-            # Prepare webhook payload for this batch
-            webhook_data = {
-                'event_type': 'insurance_intelligence_collection',
-                'timestamp': datetime.utcnow().isoformat(),
-                'source': 'insurance_intel',
-                'batch_info': {
-                    'batch_number': batch_num,
-                    'total_batches': total_batches,
-                    'batch_size': len(batch),
-                    'total_records': len(signals)
-                },
-                'data': {
-                    'companies': [],
-                    'pain_signals': []
-                },
-                'summary': {
-                    'batch_signals': len(batch),
-                    'signal_types': list(set([s['signal_type'] for s in batch])),
-                    'sources': list(set([s['source'] for s in batch]))
-                }
-            }
-            
-            for signal in batch:
-                # Prepare company record
-                company = {
-                    'company_name': signal['company_name'],
-                    'domain': signal['domain'],
-                    'data_source': signal['source'],
-                    'last_updated': datetime.utcnow().isoformat()
-                }
-                webhook_data['data']['companies'].append(company)
+        # Batches are independent, so several POSTs share the pooled session at once
+        with ThreadPoolExecutor(max_workers=self.WEBHOOK_CONCURRENCY) as executor:
+            futures = []
+            for i in range(0, len(signals), batch_size):
+                batch = signals[i:i + batch_size]
+                batch_num = (i // batch_size) + 1
                 
-                # Prepare signal record
-                pain_signal = {
-                    'domain': signal['domain'],
-                    'signal_type': signal['signal_type'],
-                    'signal_date': signal['signal_date'],
-                    'signal_strength': signal['signal_strength'],
-                    'raw_data': signal['raw_data'],
-                    'source': signal['source']
+                # Prepare webhook payload for this batch; orjson encodes the slotted
+                # signals directly as the pain_signals rows, without a copy per row
+                webhook_data = {
+                    'event_type': 'insurance_intelligence_collection',
+                    'timestamp': now_iso,
+                    'source': 'insurance_intel',
+                    'batch_info': {
+                        'batch_number': batch_num,
+                        'total_batches': total_batches,
+                        'batch_size': len(batch),
+                        'total_records': len(signals)
+                    },
+                    'data': {
+                        'companies': [
+                            {
+                                'company_name': signal.company_name,
+                                'domain': signal.domain,
+                                'data_source': signal.source,
+                                'last_updated': now_iso
+                            }
+                            for signal in batch
+                        ],
+                        'pain_signals': batch
+                    },
+                    'summary': {
+                        'batch_signals': len(batch),
+                        'signal_types': list({s.signal_type for s in batch}),
+                        'sources': list({s.source for s in batch})
+                    }
                 }
-                webhook_data['data']['pain_signals'].append(pain_signal)
+                
+                # Send this batch to Clay webhook
+                logger.debug("Sending batch %s/%s (%s records)...", batch_num, total_batches, len(batch))
+                futures.append(executor.submit(self.send_to_webhook, webhook_data))
             
-            # Send this batch to Clay webhook
-            print(f"Sending batch {batch_num}/{total_batches} ({len(batch)} records)...")
-            if self.send_to_webhook(webhook_data):
-                successful_batches += 1
-            else:
-                failed_batches += 1
+            for future in as_completed(futures):
+                if future.result():
+                    successful_batches += 1
+                else:
+                    failed_batches += 1
         
-        print(f"Batch sending complete: {successful_batches} successful, {failed_batches} failed")
+        logger.info("Batch sending complete: %s successful, %s failed", successful_batches, failed_batches)
     
     def send_to_webhook(self, data: Dict) -> bool:
         """Send data to Clay webhook with authentication"""
         from config.settings import config
-        import hashlib
-        import hmac
         
         try:
             webhook_url = config.CLAY_WEBHOOK_URL
-            payload = json.dumps(data, indent=2)
+            payload = orjson.dumps(data)
             
             headers = {
                 'Content-Type': 'application/json',
+                'Content-Encoding': 'gzip',
                 'User-Agent': 'BTA-InsuranceIntel/1.0'
             }
             
-            if config.CLAY_WEBHOOK_SECRET:
-                signature = hmac.new(
-                    config.CLAY_WEBHOOK_SECRET.encode(),
-                    payload.encode(),
-                    hashlib.sha256
-                ).hexdigest()
+            if self._webhook_secret is not None:
+                signature = hmac.digest(self._webhook_secret, payload, 'sha256').hex()
                 headers['X-Webhook-Signature'] = f'sha256={signature}'
             
+            # Signature covers the JSON body; the receiver verifies after decoding
             response = self.session.post(
                 webhook_url,
-                data=payload,
+                data=gzip.compress(payload, compresslevel=1),
                 headers=headers,
                 timeout=30
             )
             
             if response.status_code == 200:
-                print(f"✅ Batch sent successfully")
+                logger.debug("Batch sent successfully")
                 return True
             else:
-                print(f"❌ Batch failed - Status {response.status_code}: {response.text[:100]}")
+                logger.error("Batch failed - Status %s: %s", response.status_code, response.text[:100])
                 return False
                 
         except Exception as e:
-            print(f"❌ Batch failed - Error: {e}")
+            logger.error("Batch failed - Error: %s", e)
             return False
     
     def run_collection(self):
         """Main entry point for insurance intelligence collection"""
-        print("Starting insurance intelligence collection...")
+        logger.info("Starting insurance intelligence collection...")
         
         # Collect all insurance signals
         all_signals = self.collect_insurance_signals()
         
-        print(f"Found {len(all_signals)} insurance intelligence signals")
+        logger.info("Found %s insurance intelligence signals", len(all_signals))
         
         # Push to Clay webhook
         self.push_to_clay(all_signals)
         
-        print("Insurance intelligence collection complete")
+        logger.info("Insurance intelligence collection complete")
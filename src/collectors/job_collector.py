@@ -1,11 +1,98 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Optional
+from urllib.parse import urlparse
+from lxml import etree, html as lxml_html
 import json
+import re
+import sys
+from .http_session import create_session
+from .rate_limit import AdaptiveRateLimiter, TokenBucket
+from .signal import SignalRecord
+
+# Company name -> domain guess: strip punctuation, then a trailing legal suffix
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_SUFFIX_RE = re.compile(r'\s+(inc|llc|corp|corporation|ltd|limited|company|co)$')
+
+@lru_cache(maxsize=4096)
+def _estimate_domain(company_name: str) -> str:
+    """Domain guess for a company name, memoized since hiring companies post many roles"""
+    clean_name = _PUNCT_RE.sub('', company_name.lower())
+    clean_name = _SUFFIX_RE.sub('', clean_name)
+    clean_name = clean_name.replace(' ', '')
+    return f"{clean_name}.com"
+
+def _company_name(value) -> str:
+    """Interned company name; a company's postings then share one string object"""
+    return sys.intern(str(value)) if value else ''
+
+# Relative posting dates (checked as substrings, in order) -> days open
+_RELATIVE_DAYS_OPEN = {'today': 0, 'yesterday': 1}
+
+# Vacancy age (days open) thresholds, checked longest first
+VACANCY_SIGNAL_TYPES = (
+    (60, 'executive_vacancy_critical', 'skills_gap_critical'),
+    (30, 'executive_vacancy_moderate', 'skills_gap_moderate')
+)
+VACANCY_SCORE_BASE = 0.3
+VACANCY_AGE_WEIGHTS = ((90, 0.4), (60, 0.3), (30, 0.2))
+EXECUTIVE_VACANCY_WEIGHT = 0.2
+
+# Executive roles are matched anywhere in the title, as the old substring checks did
+_EXECUTIVE_TITLE_RE = re.compile(r'CISO|CHIEF|DIRECTOR', re.IGNORECASE)
+
+def _class_xpath(tag: str, css_class: str) -> etree.XPath:
+    """Compiled XPath for descendant <tag> elements carrying css_class among their classes"""
+    return etree.XPath(f".//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {css_class} ')]")
+
+# LinkedIn job search card layout
+_JOB_CARD_XPATH = _class_xpath('div', 'job-search-card')
+_JOB_COMPANY_XPATH = _class_xpath('h4', 'job-search-card__subtitle')
+_JOB_TITLE_XPATH = _class_xpath('h3', 'job-search-card__title')
+_JOB_LOCATION_XPATH = _class_xpath('span', 'job-search-card__location')
+_JOB_TIME_XPATH = etree.XPath('.//time')
 
 class JobPostingCollector:
+    # Politeness delay per job board host (requests/second); searches for
+    # different terms overlap, requests to the same host stay spaced out
+    HOST_RATES = {
+        'www.linkedin.com': 1 / 3
+    }
+    DEFAULT_HOST_RATE = 1 / 3
+    MAX_HOST_RATE = 1 / 3
+    
+    # Job board searches in flight at once
+    SEARCH_CONCURRENCY = 4
+    
+    # Clay LinkedIn Jobs enrichments in flight at once
+    CLAY_JOBS_CONCURRENCY = 4
+    
+    # Rows per Clay bulk upsert request, and upsert requests in flight at once
+    UPSERT_CHUNK_SIZE = 500
+    UPSERT_CONCURRENCY = 4
+    
     def __init__(self, clay_client):
         self.clay_client = clay_client
+        # Pooled keep-alive session shared by the search threads; transient
+        # gateway errors are retried with backoff, while throttling (429/503)
+        # reaches _get so the per-host rate limiter can slow down
+        self.session = create_session(
+            'BTA-JobCollector/1.0',
+            pool_connections=4,
+            pool_maxsize=8,
+            retries=2,
+            status_forcelist=(502, 504)
+        )
+        self.rate_limiter = AdaptiveRateLimiter(
+            initial_rates=self.HOST_RATES,
+            default_rate=self.DEFAULT_HOST_RATE,
+            max_rate=self.MAX_HOST_RATE
+        )
+        # Clay enrichments share the Clay API budget of 100 calls/minute,
+        # with a small burst so the first roles start together
+        self._clay_bucket = TokenBucket(capacity=5, rate=100 / 60)
         self.security_titles = [
             'CISO', 'Chief Information Security Officer',
             'Security Director', 'Director of Security',
@@ -14,7 +101,7 @@ class JobPostingCollector:
             'Threat Hunter', 'Incident Response'
         ]
     
-    def collect_indeed_jobs(self) -> List[Dict]:
+    def collect_indeed_jobs(self) -> List[SignalRecord]:
         """Collect security job postings from Indeed"""
         jobs = []
         
@@ -42,75 +129,76 @@ class JobPostingCollector:
         
         return jobs
     
-    def process_job_posting(self, job: Dict) -> Dict:
+    def process_job_posting(self, job: Dict) -> SignalRecord:
         """Process individual job posting"""
         posted_date = job.get('date', '')
         days_open = self.calculate_days_open(posted_date)
+        is_executive = bool(_EXECUTIVE_TITLE_RE.search(job.get('jobtitle', '')))
         
-        return {
-            'company_name': job.get('company', ''),
+        posting = {
+            'company_name': _company_name(job.get('company')),
             'job_title': job.get('jobtitle', ''),
             'location': job.get('formattedLocation', ''),
             'posted_date': posted_date,
             'days_open': days_open,
-            'signal_type': self.categorize_vacancy_signal(days_open, job.get('jobtitle', '')),
-            'signal_strength': self.calculate_vacancy_score(days_open, job.get('jobtitle', '')),
-            'source': 'indeed',
             'url': job.get('url', '')
         }
+        return self._vacancy_signal(posting, 'indeed', is_executive, datetime.now().isoformat())
     
-    def calculate_days_open(self, posted_date: str) -> int:
-        """Calculate how many days job has been open"""
+    def _vacancy_signal(self, posting: Dict, source: str, is_executive: bool,
+                        signal_date: str) -> SignalRecord:
+        """pain_signals row for a job posting, built once; the posting details are its raw_data"""
+        days_open = posting['days_open']
+        return SignalRecord(
+            domain=self.estimate_domain(posting['company_name']),
+            signal_type=self.categorize_vacancy_signal(days_open, is_executive),
+            signal_date=signal_date,
+            signal_strength=self.calculate_vacancy_score(days_open, is_executive),
+            raw_data=posting,
+            source=source
+        )
+    
+    def calculate_days_open(self, posted_date: str, now: Optional[datetime] = None) -> int:
+        """Calculate how many days job has been open; loops pass one shared now"""
         try:
             # Parse Indeed's relative dates
-            if 'today' in posted_date.lower():
-                return 0
-            elif 'yesterday' in posted_date.lower():
-                return 1
-            elif 'days ago' in posted_date:
-                days = int(posted_date.split()[0])
-                return days
-            else:
-                # Try to parse actual date
-                post_date = datetime.strptime(posted_date, '%Y-%m-%d')
-                return (datetime.now() - post_date).days
+            posted_lower = posted_date.lower()
+            for marker, days in _RELATIVE_DAYS_OPEN.items():
+                if marker in posted_lower:
+                    return days
+            if 'days ago' in posted_date:
+                return int(posted_date.split()[0])
+            
+            # Actual dates are ISO; the C fromisoformat parses the date part
+            post_date = datetime.fromisoformat(posted_date[:10])
+            return ((now or datetime.now()) - post_date).days
         except:
             return 0
     
-    def categorize_vacancy_signal(self, days_open: int, title: str) -> str:
+    def categorize_vacancy_signal(self, days_open: int, is_executive: bool) -> str:
         """Categorize vacancy signal type"""
-        is_executive = any(term in title.upper() for term in ['CISO', 'CHIEF', 'DIRECTOR'])
-        
-        if days_open > 60:
-            if is_executive:
-                return 'executive_vacancy_critical'
-            return 'skills_gap_critical'
-        elif days_open > 30:
-            if is_executive:
-                return 'executive_vacancy_moderate'
-            return 'skills_gap_moderate'
-        else:
-            return 'recent_posting'
+        for min_days, executive_type, skills_type in VACANCY_SIGNAL_TYPES:
+            if days_open > min_days:
+                return executive_type if is_executive else skills_type
+        return 'recent_posting'
     
-    def calculate_vacancy_score(self, days_open: int, title: str) -> float:
+    def calculate_vacancy_score(self, days_open: int, is_executive: bool) -> float:
         """Calculate vacancy signal strength"""
-        base_score = 0.3
+        base_score = VACANCY_SCORE_BASE
         
         # Increase for longer vacancies
-        if days_open > 90:
-            base_score += 0.4
-        elif days_open > 60:
-            base_score += 0.3
-        elif days_open > 30:
-            base_score += 0.2
+        for min_days, weight in VACANCY_AGE_WEIGHTS:
+            if days_open > min_days:
+                base_score += weight
+                break
         
         # Increase for executive positions
-        if any(term in title.upper() for term in ['CISO', 'CHIEF', 'DIRECTOR']):
-            base_score += 0.2
+        if is_executive:
+            base_score += EXECUTIVE_VACANCY_WEIGHT
         
         return min(base_score, 1.0)
     
-    def collect_linkedin_jobs(self) -> List[Dict]:
+    def collect_linkedin_jobs(self) -> List[SignalRecord]:
         """Collect from LinkedIn using Clay's LinkedIn Jobs integration"""
         jobs = []
         
@@ -131,7 +219,7 @@ class JobPostingCollector:
         
         return jobs
     
-    def collect_via_clay_linkedin_jobs(self) -> List[Dict]:
+    def collect_via_clay_linkedin_jobs(self) -> List[SignalRecord]:
         """Use Clay's LinkedIn Jobs enrichment to find security job postings"""
         jobs = []
         
@@ -152,46 +240,54 @@ class JobPostingCollector:
                 "Information Security Manager"
             ]
             
-            for role in security_roles:
-                try:
-                    # Use Clay's LinkedIn Jobs enrichment
-                    # This triggers Clay to search LinkedIn Jobs for the role
-                    enrichment_data = {
-                        'job_title': role,
-                        'location': 'United States',
-                        'posted_within': '30',  # Last 30 days
-                        'job_type': 'full-time'
-                    }
-                    
-                    # Trigger Clay enrichment for LinkedIn Jobs
-                    clay_response = self.clay_client.trigger_webhook(
-                        'https://api.clay.com/v1/enrichment/linkedin-jobs',
-                        enrichment_data
-                    )
-                    
-                    if clay_response:
-                        # Process the Clay response
-                        processed_jobs = self.process_clay_linkedin_jobs(clay_response, role)
-                        jobs.extend(processed_jobs)
-                    
-                    time.sleep(2)  # Rate limiting
-                    
-                except Exception as e:
-                    print(f"Error collecting LinkedIn jobs for {role}: {e}")
-                    continue
+            # Roles are enriched concurrently; the token bucket caps the overall call rate
+            with ThreadPoolExecutor(max_workers=self.CLAY_JOBS_CONCURRENCY) as executor:
+                for processed_jobs in executor.map(self._collect_clay_role_jobs, security_roles):
+                    jobs.extend(processed_jobs)
             
         except Exception as e:
             print(f"Error in Clay LinkedIn Jobs collection: {e}")
         
         return jobs
     
-    def process_clay_linkedin_jobs(self, clay_data: Dict, role: str) -> List[Dict]:
+    def _collect_clay_role_jobs(self, role: str) -> List[SignalRecord]:
+        """Run Clay's LinkedIn Jobs enrichment for one role"""
+        try:
+            # Use Clay's LinkedIn Jobs enrichment
+            # This triggers Clay to search LinkedIn Jobs for the role
+            enrichment_data = {
+                'job_title': role,
+                'location': 'United States',
+                'posted_within': '30',  # Last 30 days
+                'job_type': 'full-time'
+            }
+            
+            # Trigger Clay enrichment for LinkedIn Jobs
+            self._clay_bucket.acquire()
+            clay_response = self.clay_client.trigger_webhook(
+                'https://api.clay.com/v1/enrichment/linkedin-jobs',
+                enrichment_data
+            )
+            
+            if clay_response:
+                # Process the Clay response
+                return self.process_clay_linkedin_jobs(clay_response, role)
+            
+        except Exception as e:
+            print(f"Error collecting LinkedIn jobs for {role}: {e}")
+        
+        return []
+    
+    def process_clay_linkedin_jobs(self, clay_data: Dict, role: str) -> List[SignalRecord]:
         """Process LinkedIn Jobs data from Clay"""
         jobs = []
         
         try:
             # Extract job postings from Clay response
             job_postings = clay_data.get('jobs', [])
+            is_executive = bool(_EXECUTIVE_TITLE_RE.search(role))
+            now = datetime.now()
+            now_iso = now.isoformat()
             
             for job in job_postings:
                 if not isinstance(job, dict):
@@ -199,35 +295,32 @@ class JobPostingCollector:
                 
                 # Calculate days open
                 posted_date = job.get('posted_date', '')
-                days_open = self.calculate_days_open(posted_date)
+                days_open = self.calculate_days_open(posted_date, now)
                 
                 # Only include jobs open for more than 30 days (indicating difficulty filling)
                 if days_open > 30:
-                    job_data = {
-                        'company_name': job.get('company_name', ''),
+                    posting = {
+                        'company_name': _company_name(job.get('company_name')),
                         'job_title': job.get('job_title', role),
                         'location': job.get('location', ''),
                         'posted_date': posted_date,
                         'days_open': days_open,
-                        'signal_type': self.categorize_vacancy_signal(days_open, role),
-                        'signal_strength': self.calculate_vacancy_score(days_open, role),
-                        'source': 'linkedin_via_clay',
                         'url': job.get('job_url', ''),
                         'linkedin_job_id': job.get('job_id', ''),
                         'company_linkedin_url': job.get('company_linkedin_url', '')
                     }
                     
                     # Validate job data
-                    if job_data['company_name'] and job_data['days_open'] > 0:
-                        jobs.append(job_data)
-                        print(f"Found LinkedIn job: {job_data['company_name']} - {role} ({days_open} days)")
+                    if posting['company_name'] and posting['days_open'] > 0:
+                        jobs.append(self._vacancy_signal(posting, 'linkedin_via_clay', is_executive, now_iso))
+                        print(f"Found LinkedIn job: {posting['company_name']} - {role} ({days_open} days)")
             
         except Exception as e:
             print(f"Error processing Clay LinkedIn Jobs data: {e}")
         
         return jobs
     
-    def collect_direct_linkedin_jobs(self) -> List[Dict]:
+    def collect_direct_linkedin_jobs(self) -> List[SignalRecord]:
         """Fallback: Direct LinkedIn job search (if Clay doesn't have enough data)"""
         jobs = []
         
@@ -243,83 +336,102 @@ class JobPostingCollector:
                 "Cybersecurity Manager"
             ]
             
-            for term in security_search_terms:
-                try:
-                    # Use LinkedIn's public job search
-                    response = self.session.get(
-                        'https://www.linkedin.com/jobs/search',
-                        params={
-                            'keywords': term,
-                            'location': 'United States',
-                            'f_TPR': 'r2592000',  # Last 30 days
-                            'f_JT': 'F',  # Full-time
-                            'start': 0,
-                            'count': 25
-                        },
-                        timeout=10
-                    )
-                    
-                    if response.status_code == 200:
-                        # Parse LinkedIn job search results
-                        linkedin_jobs = self.parse_linkedin_job_search(response.text, term)
-                        jobs.extend(linkedin_jobs)
-                    
-                    time.sleep(3)  # Respectful delay
-                    
-                except Exception as e:
-                    print(f"Error in direct LinkedIn search for {term}: {e}")
-                    continue
+            # Terms are searched concurrently; the rate limiter keeps the
+            # requests to LinkedIn spaced out
+            with ThreadPoolExecutor(max_workers=self.SEARCH_CONCURRENCY) as executor:
+                for linkedin_jobs in executor.map(self._search_linkedin_term, security_search_terms):
+                    jobs.extend(linkedin_jobs)
             
         except Exception as e:
             print(f"Error in direct LinkedIn job collection: {e}")
         
         return jobs
     
-    def parse_linkedin_job_search(self, html_content: str, search_term: str) -> List[Dict]:
+    def _search_linkedin_term(self, term: str) -> List[SignalRecord]:
+        """Run one LinkedIn public job search and parse its result cards"""
+        try:
+            # Use LinkedIn's public job search
+            response = self._get(
+                'https://www.linkedin.com/jobs/search',
+                params={
+                    'keywords': term,
+                    'location': 'United States',
+                    'f_TPR': 'r2592000',  # Last 30 days
+                    'f_JT': 'F',  # Full-time
+                    'start': 0,
+                    'count': 25
+                },
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                # Parse LinkedIn job search results
+                return self.parse_linkedin_job_search(response.text, term)
+            
+        except Exception as e:
+            print(f"Error in direct LinkedIn search for {term}: {e}")
+        
+        return []
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET paced by the per-host rate limiter, backing off when the host throttles"""
+        host = urlparse(url).netloc
+        self.rate_limiter.wait(host)
+        response = self.session.get(url, **kwargs)
+        
+        if response.status_code in (429, 503):
+            self.rate_limiter.record_throttle(host)
+        else:
+            self.rate_limiter.record_success(host)
+        return response
+    
+    def parse_linkedin_job_search(self, html_content: str, search_term: str) -> List[SignalRecord]:
         """Parse LinkedIn job search results"""
         jobs = []
         
+        if not html_content:
+            return jobs
+        
         try:
-            from bs4 import BeautifulSoup
-            
-            soup = BeautifulSoup(html_content, 'html.parser')
+            # lxml's C parser builds the tree; the cards are located with compiled XPath
+            tree = lxml_html.fromstring(html_content)
             
             # Find job listings in LinkedIn's HTML structure
-            job_cards = soup.find_all('div', {'class': 'job-search-card'})
+            job_cards = _JOB_CARD_XPATH(tree)
+            now = datetime.now()
+            now_iso = now.isoformat()
             
             for card in job_cards[:10]:  # Limit to first 10
                 try:
                     # Extract job information
-                    company_elem = card.find('h4', {'class': 'job-search-card__subtitle'})
-                    title_elem = card.find('h3', {'class': 'job-search-card__title'})
-                    location_elem = card.find('span', {'class': 'job-search-card__location'})
-                    date_elem = card.find('time')
+                    company_elem = next(iter(_JOB_COMPANY_XPATH(card)), None)
+                    title_elem = next(iter(_JOB_TITLE_XPATH(card)), None)
+                    location_elem = next(iter(_JOB_LOCATION_XPATH(card)), None)
+                    date_elem = next(iter(_JOB_TIME_XPATH(card)), None)
                     
-                    if company_elem and title_elem:
-                        company_name = company_elem.get_text().strip()
-                        job_title = title_elem.get_text().strip()
-                        location = location_elem.get_text().strip() if location_elem else ''
-                        posted_date = date_elem.get('datetime', '') if date_elem else ''
+                    if company_elem is not None and title_elem is not None:
+                        company_name = _company_name(company_elem.text_content().strip())
+                        job_title = title_elem.text_content().strip()
+                        location = location_elem.text_content().strip() if location_elem is not None else ''
+                        posted_date = date_elem.get('datetime', '') if date_elem is not None else ''
                         
                         # Calculate days open
-                        days_open = self.calculate_days_open(posted_date)
+                        days_open = self.calculate_days_open(posted_date, now)
                         
                         # Only include jobs open for more than 30 days
                         if days_open > 30:
-                            job_data = {
+                            is_executive = bool(_EXECUTIVE_TITLE_RE.search(job_title))
+                            posting = {
                                 'company_name': company_name,
                                 'job_title': job_title,
                                 'location': location,
                                 'posted_date': posted_date,
                                 'days_open': days_open,
-                                'signal_type': self.categorize_vacancy_signal(days_open, job_title),
-                                'signal_strength': self.calculate_vacancy_score(days_open, job_title),
-                                'source': 'linkedin_direct',
                                 'url': '',  # LinkedIn URLs are complex to extract
                                 'search_term': search_term
                             }
                             
-                            jobs.append(job_data)
+                            jobs.append(self._vacancy_signal(posting, 'linkedin_direct', is_executive, now_iso))
                             print(f"Found LinkedIn job: {company_name} - {job_title} ({days_open} days)")
                 
                 except Exception as e:
@@ -354,45 +466,51 @@ class JobPostingCollector:
         
         print("Job posting collection complete")
     
-    def push_to_clay(self, jobs: List[Dict]):
-        """Push job posting data to Clay"""
-        companies = []
-        signals = []
+    def push_to_clay(self, jobs: List[SignalRecord]):
+        """Push job posting signals to Clay"""
+        # Nothing to build when there is no Clay account to write to
+        if not jobs:
+            return
+        if self.clay_client is None or not getattr(self.clay_client, 'api_key', True):
+            print("No Clay API key configured, skipping job posting upload")
+            return
         
+        now_iso = datetime.now().isoformat()
+        
+        # Create one company record per domain; a company hiring for several
+        # roles keeps the record from its first posting
+        companies_by_domain = {}
         for job in jobs:
-            # Create company record
-            domain = self.estimate_domain(job['company_name'])
-            
-            company = {
-                'company_name': job['company_name'],
-                'domain': domain,
-                'location': job['location'],
-                'data_source': 'job_postings',
-                'last_updated': datetime.now().isoformat()
-            }
-            companies.append(company)
-            
-            # Create signal record
-            signal = {
-                'domain': domain,
-                'signal_type': job['signal_type'],
-                'signal_date': datetime.now().isoformat(),
-                'signal_strength': job['signal_strength'],
-                'raw_data': job,
-                'source': job['source']
-            }
-            signals.append(signal)
+            if job.domain not in companies_by_domain:
+                companies_by_domain[job.domain] = {
+                    'company_name': job.raw_data['company_name'],
+                    'domain': job.domain,
+                    'location': job.raw_data['location'],
+                    'data_source': 'job_postings',
+                    'last_updated': now_iso
+                }
+        companies = list(companies_by_domain.values())
         
-        # Bulk upsert
+        # Bulk upsert; companies land before the signals that reference them.
+        # Company records are unique per domain, so their chunks can go out together
         if companies:
-            self.clay_client.bulk_upsert('company_universe', companies)
-        if signals:
-            self.clay_client.bulk_upsert('pain_signals', signals)
+            self._bulk_upsert_chunks('company_universe', companies, self.UPSERT_CONCURRENCY)
+        # pain_signals also upsert on domain: chunks go out in order so the last
+        # posting for a domain wins, as it did with one upsert. The jobs already
+        # are pain_signals rows, which orjson encodes directly
+        self._bulk_upsert_chunks('pain_signals', jobs, 1)
+    
+    def _bulk_upsert_chunks(self, table_name: str, rows: List, concurrency: int) -> None:
+        """Bulk upsert rows in UPSERT_CHUNK_SIZE requests, up to concurrency at once"""
+        chunks = [rows[i:i + self.UPSERT_CHUNK_SIZE] for i in range(0, len(rows), self.UPSERT_CHUNK_SIZE)]
+        if concurrency <= 1:
+            for chunk in chunks:
+                self.clay_client.bulk_upsert(table_name, chunk)
+            return
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # list() surfaces the first failed chunk's exception, as the single upsert did
+            list(executor.map(lambda chunk: self.clay_client.bulk_upsert(table_name, chunk), chunks))
     
     def estimate_domain(self, company_name: str) -> str:
         """Estimate domain from company name"""
-        import re
-        clean_name = re.sub(r'[^\w\s]', '', company_name.lower())
-        clean_name = re.sub(r'\s+(inc|llc|corp|corporation|ltd|limited|company|co)$', '', clean_name)
-        clean_name = clean_name.replace(' ', '')
-        return f"{clean_name}.com"
\ No newline at end of file
+        return _estimate_domain(company_name)
\ No newline at end of file
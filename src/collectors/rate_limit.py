@@ -0,0 +1,101 @@
+"""
+Rate Limiters - Pacing for collector HTTP calls
+AdaptiveRateLimiter backs off per host when an API throttles us and speeds back up while it is healthy;
+TokenBucket enforces a fixed provider budget while letting idle time build up burst credit
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+class AdaptiveRateLimiter:
+    """Paces requests per host, halving the rate on 429/503 and growing it after a success streak"""
+    
+    def __init__(self, initial_rates: Optional[Dict[str, float]] = None,
+                 default_rate: float = 2.0, min_rate: float = 0.05,
+                 max_rate: float = 10.0, success_streak: int = 20,
+                 increase_factor: float = 1.1):
+        self.initial_rates = initial_rates or {}
+        self.default_rate = default_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.success_streak = success_streak
+        self.increase_factor = increase_factor
+        
+        self._hosts: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+    
+    def _state(self, host: str) -> Dict:
+        """Get (or create) the pacing state for a host; caller holds the lock"""
+        state = self._hosts.get(host)
+        if state is None:
+            state = {
+                'rate': self.initial_rates.get(host, self.default_rate),  # requests/second
+                'next_time': 0.0,
+                'successes': 0
+            }
+            self._hosts[host] = state
+        return state
+    
+    def get_rate(self, host: str) -> float:
+        """Current allowed requests/second for a host"""
+        with self._lock:
+            return self._state(host)['rate']
+    
+    def wait(self, host: str) -> None:
+        """Block until the next request to host is allowed"""
+        with self._lock:
+            state = self._state(host)
+            now = time.monotonic()
+            scheduled = max(now, state['next_time'])
+            state['next_time'] = scheduled + 1.0 / state['rate']
+        
+        delay = scheduled - now
+        if delay > 0:
+            time.sleep(delay)
+    
+    def record_success(self, host: str) -> None:
+        """Additive-increase: nudge the rate up after a streak of successes"""
+        with self._lock:
+            state = self._state(host)
+            state['successes'] += 1
+            if state['successes'] >= self.success_streak:
+                state['rate'] = min(state['rate'] * self.increase_factor, self.max_rate)
+                state['successes'] = 0
+    
+    def record_throttle(self, host: str) -> None:
+        """Multiplicative-decrease: halve the rate when the host throttles us"""
+        with self._lock:
+            state = self._state(host)
+            state['rate'] = max(state['rate'] * 0.5, self.min_rate)
+            state['successes'] = 0
+
+
+@dataclass
+class TokenBucket:
+    """Token bucket: up to `capacity` back-to-back calls, refilled at `rate` tokens/second"""
+    capacity: float
+    rate: float
+    tokens: Optional[float] = None  # starts full
+    last_refill: float = field(default_factory=time.monotonic)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.tokens is None:
+            self.tokens = self.capacity
+    
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available; returns the seconds waited"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            
+            # Going negative reserves a future token, so concurrent callers queue in order
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        
+        if delay > 0:
+            time.sleep(delay)
+        return delay
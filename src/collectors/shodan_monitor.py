@@ -16,20 +16,44 @@ import shodan
 import socket
 import json
 import logging
-from typing import Dict, List, Optional, Any
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime
 import re
+import threading
 from urllib.parse import urlparse
 import time
+from .rate_limit import TokenBucket
+from .ttl_cache import MemoryTTLCache
+
+try:
+    import ahocorasick  # pyahocorasick
+except ImportError:
+    ahocorasick = None
 
 logger = logging.getLogger(__name__)
 
 class ShodanMonitor:
+    # Seconds a domain's resolved IPs are reused before resolving again
+    DNS_CACHE_TTL = 15 * 60
+    
+    # Companies on shared hosting and CDNs hit the same queries; reuse
+    # search and host responses for an hour instead of spending credits
+    QUERY_CACHE_TTL = 3600  # seconds
+    QUERY_CACHE_MAXSIZE = 10_000
+    
     def __init__(self, api_key: str):
         """Initialize Shodan monitor with API key"""
         self.api = shodan.Shodan(api_key)
-        self.rate_limit_count = 0
-        self.rate_limit_window_start = datetime.now()
+        # Conservative Shodan budget of 45 queries/minute, shared by every
+        # thread issuing queries through this monitor
+        self._query_bucket = TokenBucket(capacity=45, rate=45 / 60)
+        
+        # Domain -> (expiry, IPs); repeat and duplicate domains skip the resolver
+        self._dns_cache: Dict[str, Tuple[float, List[str]]] = {}
+        self._dns_cache_lock = threading.Lock()
+        
+        # Search/host responses shared by every company analyzed in this process
+        self._query_cache = MemoryTTLCache(self.QUERY_CACHE_MAXSIZE, self.QUERY_CACHE_TTL)
         
         # Pain signal priorities for outreach timing
         self.CRITICAL_EXPOSURES = {
@@ -48,38 +72,92 @@ class ShodanMonitor:
             'exposed_sensitive': ['password_file', 'config_file', 'backup_file'],
             'malicious': ['malware', 'botnet', 'cnc', 'c2']
         }
+        
+        # Every keyword _categorize_exposures looks for in a product or banner;
+        # IoT keywords appear in banners with spaces instead of underscores
+        self._exposure_terms = frozenset(
+            self.CRITICAL_EXPOSURES['database']
+            + self.CRITICAL_EXPOSURES['remote_access']
+            + self.CRITICAL_EXPOSURES['industrial']
+            + [iot_vuln.replace('_', ' ') for iot_vuln in self.CRITICAL_EXPOSURES['iot_vulnerable']]
+            + ['anonymous', 'default_password']
+        )
+        self._exposure_automaton = self._build_exposure_automaton()
+    
+    def _build_exposure_automaton(self):
+        """Build an Aho-Corasick automaton over the exposure keywords (None if pyahocorasick is missing)"""
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for term in self._exposure_terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+        return automaton
+    
+    def _matched_terms(self, haystack: str, product_len: int) -> Tuple[set, set]:
+        """Exposure keywords found in the product and banner parts of a 'product\nbanner' haystack"""
+        if self._exposure_automaton is not None:
+            # One pass; keywords never contain a newline, so a match's end offset tells which part it is in
+            product_hits, banner_hits = set(), set()
+            for end_index, term in self._exposure_automaton.iter(haystack):
+                (product_hits if end_index < product_len else banner_hits).add(term)
+            return product_hits, banner_hits
+        
+        product, banner = haystack[:product_len], haystack[product_len + 1:]
+        return ({term for term in self._exposure_terms if term in product},
+                {term for term in self._exposure_terms if term in banner})
 
     def check_rate_limit(self) -> None:
-        """Respect Shodan API rate limits"""
-        now = datetime.now()
-        if now - self.rate_limit_window_start > timedelta(minutes=1):
-            self.rate_limit_count = 0
-            self.rate_limit_window_start = now
-            
-        if self.rate_limit_count >= 45:  # Conservative limit
-            sleep_time = 60 - (now - self.rate_limit_window_start).seconds
-            if sleep_time > 0:
-                time.sleep(sleep_time)
-                self.rate_limit_count = 0
-                self.rate_limit_window_start = datetime.now()
+        """Respect Shodan API rate limits; call once per query, it takes a token from the shared budget"""
+        self._query_bucket.acquire()
+
+    def _cached_search(self, query: str, **kwargs) -> Dict:
+        """api.search through the query cache; only misses spend a rate-limit token"""
+        cache_key = f'search:{query}:{json.dumps(kwargs, sort_keys=True)}'
+        results = self._query_cache.get(cache_key)
+        if results is not None:
+            return results
+        
+        self.check_rate_limit()
+        results = self.api.search(query, **kwargs)
+        self._query_cache.set(cache_key, results)
+        return results
+
+    def _cached_host(self, ip: str) -> Dict:
+        """api.host through the query cache; only misses spend a rate-limit token"""
+        cache_key = f'host:{ip}'
+        host_info = self._query_cache.get(cache_key)
+        if host_info is not None:
+            return host_info
+        
+        self.check_rate_limit()
+        host_info = self.api.host(ip)
+        self._query_cache.set(cache_key, host_info)
+        return host_info
 
     def extract_domain_ips(self, domain: str) -> List[str]:
         """Extract IP addresses for a domain"""
+        with self._dns_cache_lock:
+            cached = self._dns_cache.get(domain)
+        if cached is not None and cached[0] > time.monotonic():
+            return list(cached[1])
+        
         try:
-            # Try to resolve domain
-            ips = []
+            # Try to resolve domain; addresses repeat once per socket type, keep first-seen order
             result = socket.getaddrinfo(domain, None)
-            for item in result:
-                ip = item[4][0]
-                if ip not in ips:
-                    ips.append(ip)
-            return ips
+            ips = list(dict.fromkeys(item[4][0] for item in result))
+            with self._dns_cache_lock:
+                self._dns_cache[domain] = (time.monotonic() + self.DNS_CACHE_TTL, ips)
+            return list(ips)
         except Exception as e:
             logger.warning(f"Failed to resolve domain {domain}: {e}")
             return []
 
-    def analyze_domain_exposure(self, company_data: Dict) -> List[Dict]:
-        """Analyze domain for network exposures and vulnerabilities"""
+    def analyze_domain_exposure(self, company_data: Dict, errors: Optional[List[str]] = None) -> List[Dict]:
+        """Analyze domain for network exposures and vulnerabilities; failed queries are appended to errors if given"""
+        if errors is None:
+            errors = []
+        
         domain = company_data.get('domain')
         company_name = company_data.get('company_name', 'Unknown')
         
@@ -87,7 +165,6 @@ class ShodanMonitor:
             logger.warning(f"No domain provided for {company_name}")
             return []
 
-        self.check_rate_limit()
         signals = []
         
         try:
@@ -102,21 +179,20 @@ class ShodanMonitor:
             # Search by domain
             if domain:
                 try:
-                    results = self.api.search(f"hostname:{domain}")
+                    results = self._cached_search(f"hostname:{domain}")
                     all_results.extend(results['matches'])
-                    self.rate_limit_count += 1
                 except shodan.exception.APIError as e:
                     logger.error(f"Shodan API error searching by hostname: {e}")
+                    errors.append(f"hostname:{domain}: {e}")
             
             # Search by IPs
             for ip in ips[:3]:  # Limit to top 3 IPs
                 try:
-                    self.check_rate_limit()
-                    results = self.api.search(f"ip:{ip}")
+                    results = self._cached_search(f"ip:{ip}")
                     all_results.extend(results['matches'])
-                    self.rate_limit_count += 1
                 except shodan.exception.APIError as e:
                     logger.error(f"Shodan API error searching by IP {ip}: {e}")
+                    errors.append(f"ip:{ip}: {e}")
             
             # Analyze results for pain signals
             signals = self._analyze_shodan_results(all_results, company_data)
@@ -125,14 +201,13 @@ class ShodanMonitor:
             
         except Exception as e:
             logger.error(f"Error analyzing domain {domain} with Shodan: {e}", exc_info=True)
+            errors.append(f"{domain}: {e}")
             
         return signals
 
     def _analyze_shodan_results(self, results: List[Dict], company_data: Dict) -> List[Dict]:
         """Analyze Shodan search results for pain signals"""
         signals = []
-        domain = company_data.get('domain', '')
-        company_name = company_data.get('company_name', 'Unknown')
         
         # Track exposures by category
         exposures = {}
@@ -140,12 +215,8 @@ class ShodanMonitor:
         
         for result in results:
             try:
-                # Extract key data
-                ip = result.get('ip_str', '')
-                port = result.get('port', 0)
-                product = result.get('product', '')
-                version = result.get('version', '')
-                banner = result.get('data', '')
+                # Lowercased product and banner, scanned together for exposure keywords
+                result['_haystack'] = (result.get('product', '') + '\n' + result.get('data', '')).lower()
                 
                 # Analyze for critical exposures
                 self._categorize_exposures(exposures, critical_findings, result)
@@ -165,11 +236,16 @@ class ShodanMonitor:
         ip = result.get('ip_str', '')
         port = result.get('port', 0)
         product = result.get('product', '').lower()
-        banner = result.get('data', '').lower()
+        
+        # One scan of the precomputed haystack for every keyword; the checks below are set lookups
+        haystack = result.get('_haystack')
+        if haystack is None:
+            haystack = product + '\n' + result.get('data', '').lower()
+        product_hits, banner_hits = self._matched_terms(haystack, len(product))
         
         # Database exposures
         for db in self.CRITICAL_EXPOSURES['database']:
-            if db in product or db in banner:
+            if db in product_hits or db in banner_hits:
                 exposures.setdefault('databases', []).append({
                     'ip': ip,
                     'port': port,
@@ -177,7 +253,7 @@ class ShodanMonitor:
                     'product': product,
                     'risk': 'HIGH'
                 })
-                if 'anonymous' in banner or 'default_password' in banner:
+                if 'anonymous' in banner_hits or 'default_password' in banner_hits:
                     critical_findings.append({
                         'type': 'exposed_database',
                         'severity': 'CRITICAL',
@@ -188,7 +264,7 @@ class ShodanMonitor:
         
         # Remote access exposures
         for access in self.CRITICAL_EXPOSURES['remote_access']:
-            if access in banner:
+            if access in banner_hits:
                 exposures.setdefault('remote_access', []).append({
                     'ip': ip,
                     'port': port,
@@ -198,7 +274,7 @@ class ShodanMonitor:
         
         # Industrial control systems
         for ics in self.CRITICAL_EXPOSURES['industrial']:
-            if ics in banner or ics in product:
+            if ics in banner_hits or ics in product_hits:
                 exposures.setdefault('industrial_systems', []).append({
                     'ip': ip,
                     'port': port,
@@ -208,7 +284,7 @@ class ShodanMonitor:
                 
         # IoT vulnerabilities
         for iot_vuln in self.CRITICAL_EXPOSURES['iot_vulnerable']:
-            if iot_vuln.replace('_', ' ') in banner:
+            if iot_vuln.replace('_', ' ') in banner_hits:
                 critical_findings.append({
                     'type': 'iot_vulnerability',
                     'severity': 'HIGH',
@@ -300,36 +376,35 @@ class ShodanMonitor:
             return signals
             
         try:
-            self.check_rate_limit()
-            
             # Search for common vulnerable ports
             critical_ports = ['21', '22', '23', '80', '443', '3389', '5900', '6379', '5432', '3306']
             
+            # One faceted search returns per-port host counts for the domain;
+            # limit=1 since only the facet counts are used
+            results = self._cached_search(f"hostname:{domain}", limit=1, facets=[('port', 25)])
+            port_counts = {
+                str(entry['value']): entry['count']
+                for entry in results.get('facets', {}).get('port', [])
+            }
+            
+            # Signals keep the critical_ports order
             for port in critical_ports:
-                try:
-                    self.check_rate_limit()
-                    results = self.api.search(f"hostname:{domain} port:{port}")
-                    
-                    if results['total'] > 0:
-                        signal = {
-                            'signal_type': f'port_{port}_exposed',
-                            'signal_date': datetime.utcnow().isoformat(),
-                            'signal_strength': 0.8,
-                            'source': 'shodan_port_scan',
-                            'domain': domain,
-                            'raw_data': {
-                                'port': port,
-                                'exposure_count': results['total'],
-                                'severity': 'HIGH' if port in ['3389', '6379', '21', '23'] else 'MEDIUM'
-                            },
-                            'priority_score': 0.8,
-                            'campaign_type': 'network_security_assessment'
-                        }
-                        signals.append(signal)
-                        
-                except Exception as e:
-                    logger.warning(f"Error scanning port {port} for {domain}: {e}")
-                    continue
+                if port_counts.get(port, 0) > 0:
+                    signal = {
+                        'signal_type': f'port_{port}_exposed',
+                        'signal_date': datetime.utcnow().isoformat(),
+                        'signal_strength': 0.8,
+                        'source': 'shodan_port_scan',
+                        'domain': domain,
+                        'raw_data': {
+                            'port': port,
+                            'exposure_count': port_counts[port],
+                            'severity': 'HIGH' if port in ['3389', '6379', '21', '23'] else 'MEDIUM'
+                        },
+                        'priority_score': 0.8,
+                        'campaign_type': 'network_security_assessment'
+                    }
+                    signals.append(signal)
                     
         except Exception as e:
             logger.error(f"Error in critical port scan for {domain}: {e}")
@@ -339,9 +414,7 @@ class ShodanMonitor:
     def get_shodan_host_info(self, ip: str) -> Dict:
         """Get detailed host information from Shodan"""
         try:
-            self.check_rate_limit()
-            host_info = self.api.host(ip)
-            self.rate_limit_count += 1
+            host_info = self._cached_host(ip)
             
             return {
                 'ip': ip,
@@ -364,14 +437,11 @@ class ShodanMonitor:
         signals = []
         
         try:
-            self.check_rate_limit()
-            
             search_query = f"{software_name}"
             if version:
                 search_query += f" {version}"
                 
-            results = self.api.search(search_query, facets={'vuln': 10})
-            self.rate_limit_count += 1
+            results = self._cached_search(search_query, limit=1, facets={'vuln': 10})
             
             vulns = [item['value'] for item in results.get('facets', {}).get('vuln', [])]
             
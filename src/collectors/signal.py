@@ -0,0 +1,49 @@
+"""
+Signal - Slotted records for pain signals produced by the collectors
+"""
+
+from dataclasses import dataclass, asdict, fields
+from typing import Any, Dict, Mapping
+
+
+@dataclass(slots=True)
+class Signal:
+    """A single pain signal detected for a company"""
+    company_name: str
+    domain: str
+    signal_type: str
+    signal_date: str
+    signal_strength: float
+    raw_data: Dict
+    source: str
+    
+    def __getitem__(self, key: str) -> Any:
+        """Support dict-style reads (signal['signal_type']) used by existing callers"""
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Support dict-style reads with a default"""
+        return getattr(self, key, default)
+    
+    def to_dict(self) -> Dict:
+        """Serialize to a plain dict for Clay/API boundaries"""
+        return asdict(self)
+    
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> 'Signal':
+        """Build a Signal from a dict-style signal; keys that are not Signal fields are ignored"""
+        return cls(**{field.name: data[field.name] for field in fields(cls)})
+
+
+@dataclass(slots=True)
+class SignalRecord:
+    """A pain signal as written to Clay's pain_signals table (keyed by domain)"""
+    domain: str
+    signal_type: str
+    signal_date: str
+    signal_strength: float
+    raw_data: Dict
+    source: str
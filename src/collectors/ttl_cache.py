@@ -0,0 +1,129 @@
+"""
+TTL Caches - key/value caches with per-entry expiry
+DiskTTLCache keeps slow-changing lookup results across runs and processes;
+MemoryTTLCache is a bounded in-process LRU for responses reused within a run
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+class DiskTTLCache:
+    """JSON values stored in SQLite, expiring ttl seconds after they were written"""
+    
+    # Expired rows (and the oldest beyond max_entries) are deleted at open
+    # and after this many writes, so the file stays bounded
+    PURGE_EVERY = 500
+    
+    def __init__(self, path: str, ttl: float, max_entries: Optional[int] = None):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes_since_purge = 0
+        
+        cache_dir = os.path.dirname(path)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS cache_stored_at ON cache (stored_at)'
+        )
+        with self._lock:
+            self._purge()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, stored_at FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+            
+            if row is None:
+                return None
+            if time.time() - row[1] > self.ttl:
+                self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self._conn.commit()
+                return None
+        
+        return json.loads(row[0])
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under key"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, stored_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value), time.time())
+            )
+            self._writes_since_purge += 1
+            if self._writes_since_purge >= self.PURGE_EVERY:
+                self._purge()
+            else:
+                self._conn.commit()
+    
+    def purge(self) -> None:
+        """Delete expired rows, and the oldest rows beyond max_entries"""
+        with self._lock:
+            self._purge()
+    
+    def _purge(self) -> None:
+        # Caller holds self._lock
+        self._conn.execute(
+            'DELETE FROM cache WHERE stored_at < ?', (time.time() - self.ttl,)
+        )
+        if self.max_entries is not None:
+            self._conn.execute(
+                'DELETE FROM cache WHERE key IN ('
+                'SELECT key FROM cache ORDER BY stored_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,)
+            )
+        self._conn.commit()
+        self._writes_since_purge = 0
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+
+class MemoryTTLCache:
+    """In-process LRU cache of at most maxsize entries, each expiring ttl seconds after it was written"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key -> (expiry, value), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+    
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries past maxsize"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -3,7 +3,9 @@ BTA Orchestrator - Improved Version
 Enhanced with better error handling, separation of concerns, and maintainability
 """
 
+import atexit
 import json
+import queue
 import signal
 import sys
 import schedule
@@ -12,7 +14,7 @@ from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from contextlib import contextmanager
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import threading
 from dataclasses import dataclass
 from enum import Enum
@@ -47,14 +49,16 @@ class CampaignResult:
 class LoggerSetup:
     """Centralized logging configuration"""
     
+    # Handlers run on this listener's thread; callers only enqueue records
+    _listener: Optional[QueueListener] = None
+    
     @staticmethod
     def configure_logging() -> logging.Logger:
         """Configure enhanced logging with file rotation"""
         logger = logging.getLogger(__name__)
-        logger.setLevel(logging.INFO)
         
-        # Remove existing handlers to avoid duplicates
-        logger.handlers.clear()
+        if LoggerSetup._listener is not None:
+            return logger
         
         # Create formatters
         detailed_formatter = logging.Formatter(
@@ -65,9 +69,10 @@ class LoggerSetup:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(detailed_formatter)
-        logger.addHandler(console_handler)
+        handlers = [console_handler]
         
         # File handler with rotation
+        file_handler_error = None
         try:
             file_handler = RotatingFileHandler(
                 'logs/bta_orchestrator.log',
@@ -76,9 +81,27 @@ class LoggerSetup:
             )
             file_handler.setLevel(logging.DEBUG)
             file_handler.setFormatter(detailed_formatter)
-            logger.addHandler(file_handler)
+            handlers.append(file_handler)
         except (OSError, IOError) as e:
-            logger.warning(f"Could not create log file handler: {e}")
+            file_handler_error = e
+        
+        # Collectors log from worker threads; route every logger through a queue
+        # so console and file I/O happen on the listener thread
+        log_queue = queue.Queue(-1)
+        root = logging.getLogger()
+        root.setLevel(logging.INFO)
+        
+        # Remove existing handlers to avoid duplicates
+        root.handlers.clear()
+        logger.handlers.clear()
+        root.addHandler(QueueHandler(log_queue))
+        
+        LoggerSetup._listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        LoggerSetup._listener.start()
+        atexit.register(LoggerSetup._listener.stop)
+        
+        if file_handler_error is not None:
+            logger.warning(f"Could not create log file handler: {file_handler_error}")
         
         return logger
 
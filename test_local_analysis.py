@@ -36,19 +36,19 @@ def test_analysis():
     print("\n📊 Testing individual analysis methods...")
     
     try:
-        # Test HIBP check
+        # Test HIBP check (check_* methods return Signal records; shown as dicts)
         print("Testing HIBP breach check...")
-        hibp_signals = analyzer.check_hibp_breaches(test_company)
+        hibp_signals = [signal.to_dict() for signal in analyzer.check_hibp_breaches(test_company)]
         print(f"HIBP signals found: {len(hibp_signals)}")
         
         # Test SERPAPI breach check
         print("Testing SERPAPI breach check...")
-        serpapi_signals = analyzer.check_breach_mentions_serpapi(test_company)
+        serpapi_signals = [signal.to_dict() for signal in analyzer.check_breach_mentions_serpapi(test_company)]
         print(f"SERPAPI signals found: {len(serpapi_signals)}")
         
         # Test GitHub exposure check
         print("Testing GitHub exposure check...")
-        github_signals = analyzer.check_github_exposures(test_company)
+        github_signals = [signal.to_dict() for signal in analyzer.check_github_exposures(test_company)]
         print(f"GitHub signals found: {len(github_signals)}")
         
         # Test Shodan exposure check
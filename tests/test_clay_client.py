@@ -0,0 +1,61 @@
+import os
+import sys
+
+import orjson
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import clay_client
+from clay_client import ClayClient
+
+
+class FakeResponse:
+    def __init__(self, status_code: int = 200, body=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self._body = body if body is not None else {}
+
+    def json(self):
+        return self._body
+
+
+class FakePost:
+    """Records posted payloads and answers with the queued status codes (200 once exhausted)"""
+
+    def __init__(self, statuses=()):
+        self.payloads = []
+        self._statuses = list(statuses)
+
+    def __call__(self, url, headers=None, data=None, json=None):
+        self.payloads.append(orjson.loads(data) if data is not None else json)
+        status = self._statuses.pop(0) if self._statuses else 200
+        return FakeResponse(status, {'added': len(self.payloads[-1]['rows'])})
+
+
+@pytest.fixture
+def client():
+    return ClayClient('test-key', 'test-workspace')
+
+
+class TestAddRows:
+    def test_posts_one_request_per_batch(self, client, monkeypatch):
+        post = FakePost()
+        monkeypatch.setattr(clay_client.requests, 'post', post)
+        rows = [{'domain': f'{i}.example'} for i in range(5)]
+
+        results = client.add_rows('pain_signals', rows, batch_size=2)
+
+        assert [len(payload['rows']) for payload in post.payloads] == [2, 2, 1]
+        assert results == [{'added': 2}, {'added': 2}, {'added': 1}]
+
+    def test_failed_batch_raises_after_the_rest_are_sent(self, client, monkeypatch):
+        post = FakePost(statuses=[200, 500, 200])
+        monkeypatch.setattr(clay_client.requests, 'post', post)
+        rows = [{'domain': f'{i}.example'} for i in range(5)]
+
+        with pytest.raises(requests.HTTPError, match='2 of 5 rows'):
+            client.add_rows('company_universe', rows, batch_size=2)
+
+        assert len(post.payloads) == 3
@@ -0,0 +1,374 @@
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from collectors import company_analyzer
+from collectors.company_analyzer import CompanyAnalyzer
+
+NETWORK_LOOKUPS = (
+    'check_hibp_breaches',
+    'check_breach_mentions',
+    'check_github_exposures',
+    'analyze_job_postings',
+    'check_shodan_exposures',
+)
+
+COMPANY = {'domain': 'quiet.example', 'company_name': 'Quiet Widgets', 'employee_count': 40}
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(company_analyzer, 'DATA_DIR', str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def analyzer(data_dir, monkeypatch):
+    analyzer = CompanyAnalyzer(clay_client=None)
+    analyzer._recent_signals_cache = {COMPANY['domain']: False}
+    monkeypatch.setattr(analyzer, 'probe_domain_security',
+                        lambda domain: {'tls_version': 'TLSv1.3', 'headers': []})
+    return analyzer
+
+
+def stub_lookups(analyzer, monkeypatch, results=None) -> list:
+    """Replace the third-party lookups with stubs; returns the names called, in order"""
+    calls = []
+    results = results or {}
+    for name in NETWORK_LOOKUPS:
+        def lookup(company, name=name):
+            calls.append(name)
+            return results.get(name, [])
+        monkeypatch.setattr(analyzer, name, lookup)
+    return calls
+
+
+class TestDeadDomains:
+    def test_no_network_hits_marks_domain_dead_then_skips_lookups(self, analyzer, monkeypatch):
+        calls = stub_lookups(analyzer, monkeypatch)
+
+        signals = analyzer._analyze_company(COMPANY)
+
+        # The always-on tech gap check still reports, but does not keep the domain alive
+        assert [s['signal_type'] for s in signals] == ['security_tech_gaps']
+        assert calls == list(NETWORK_LOOKUPS)
+        assert COMPANY['domain'] in analyzer._dead_domains
+
+        calls.clear()
+        signals = analyzer._analyze_company(COMPANY)
+
+        assert calls == []
+        assert [s['signal_type'] for s in signals] == ['security_tech_gaps']
+
+    def test_dead_domains_survive_a_restart(self, analyzer, monkeypatch):
+        stub_lookups(analyzer, monkeypatch)
+        analyzer._analyze_company(COMPANY)
+        analyzer._save_dead_domains()
+
+        assert COMPANY['domain'] in CompanyAnalyzer(clay_client=None)._dead_domains
+
+    def test_network_hit_keeps_domain_alive(self, analyzer, monkeypatch):
+        hit = {'signal_type': 'security_job_posting', 'signal_strength': 0.5}
+        stub_lookups(analyzer, monkeypatch, {'analyze_job_postings': [hit]})
+
+        analyzer._analyze_company(COMPANY)
+
+        assert COMPANY['domain'] not in analyzer._dead_domains
+
+    def test_incomplete_lookup_keeps_domain_alive(self, analyzer, monkeypatch):
+        stub_lookups(analyzer, monkeypatch)
+
+        def failed_lookup(company):
+            analyzer._mark_lookup_incomplete()
+            return []
+        monkeypatch.setattr(analyzer, 'check_github_exposures', failed_lookup)
+
+        analyzer._analyze_company(COMPANY)
+
+        assert COMPANY['domain'] not in analyzer._dead_domains
+
+    def test_early_exit_before_shodan_keeps_domain_alive(self, analyzer, monkeypatch):
+        calls = stub_lookups(analyzer, monkeypatch)
+        strong = {'signal_type': 'compliance_vulnerability', 'signal_strength': 0.9}
+        monkeypatch.setattr(analyzer, 'check_compliance_vulnerabilities', lambda company: [strong])
+
+        analyzer._analyze_company(COMPANY)
+
+        assert 'check_shodan_exposures' not in calls
+        assert COMPANY['domain'] not in analyzer._dead_domains
+
+
+class FakeClay:
+    """Records add_rows calls and answers query_table with no rows"""
+
+    def __init__(self, companies=()):
+        self.companies = list(companies)
+        self.added = []
+
+    def query_table(self, table_name, filters, projection=None):
+        return self.companies if table_name == 'company_universe' else []
+
+    def add_rows(self, table_name, rows, batch_size=50):
+        self.added.append((table_name, rows))
+        return []
+
+
+class TestSignalWrites:
+    def test_batch_signals_reach_clay_once_via_the_webhook(self, data_dir, monkeypatch):
+        clay = FakeClay([dict(COMPANY)])
+        analyzer = CompanyAnalyzer(clay_client=clay)
+        stub_lookups(analyzer, monkeypatch)
+        monkeypatch.setattr(analyzer, 'probe_domain_security',
+                            lambda domain: {'tls_version': 'TLSv1.3', 'headers': []})
+        sent = []
+        monkeypatch.setattr(analyzer, 'send_to_webhook', lambda data: sent.append(data) or True)
+
+        analyzer.run_analysis(batch_size=10)
+
+        # Only the analyzed flags go through add_rows; signals go out in the webhook
+        assert [table for table, _ in clay.added] == ['company_universe']
+        assert len(sent) == 1
+        pain_signals = sent[0]['data']['pain_signals']
+        assert [row['signal_type'] for row in pain_signals] == ['security_tech_gaps']
+        assert isinstance(pain_signals[0]['signal_epoch'], float)
+
+
+class FakeConnection:
+    """Stands in for http.client.HTTPSConnection; fails on connect when given an error.
+
+    responses maps host -> (status, headers) for the HEAD requests sent to it.
+    """
+
+    def __init__(self, error=None, headers=(), responses=None):
+        self.error = error
+        self.responses = responses or {}
+        self.default = (200, list(headers))
+        self.requests = []
+        self.host = None
+
+    def __call__(self, host, timeout=None, context=None):
+        connection = FakeConnection(self.error, responses=self.responses)
+        connection.default = self.default
+        connection.requests = self.requests
+        connection.host = host
+        return connection
+
+    @property
+    def sock(self):
+        return self
+
+    def version(self):
+        return 'TLSv1.3'
+
+    def connect(self):
+        if self.error:
+            raise self.error
+
+    def request(self, method, url, headers=None):
+        self.requests.append((self.host, url))
+        self.status, self.headers = self.responses.get((self.host, url), self.default)
+
+    def getresponse(self):
+        return self
+
+    def read(self):
+        return b''
+
+    def getheader(self, name):
+        return dict(self.headers).get(name)
+
+    def getheaders(self):
+        return self.headers
+
+    def close(self):
+        pass
+
+
+class TestProbeDomainSecurity:
+    def test_data_files_resolve_against_the_project_root(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        project_data = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+        assert company_analyzer.DATA_DIR == os.path.normpath(project_data)
+
+    def test_successful_probe_is_cached(self, data_dir, monkeypatch):
+        analyzer = CompanyAnalyzer(clay_client=None)
+        monkeypatch.setattr(company_analyzer.http.client, 'HTTPSConnection',
+                            FakeConnection(headers=[('Strict-Transport-Security', 'max-age=1')]))
+
+        probe = analyzer.probe_domain_security('up.example')
+
+        assert probe == {'tls_version': 'TLSv1.3', 'headers': ['strict-transport-security']}
+        assert analyzer.probe_cache.get('probe:up.example') == probe
+
+    def test_failed_probe_is_not_cached(self, data_dir, monkeypatch):
+        analyzer = CompanyAnalyzer(clay_client=None)
+        monkeypatch.setattr(company_analyzer.http.client, 'HTTPSConnection',
+                            FakeConnection(error=TimeoutError('timed out')))
+
+        probe = analyzer.probe_domain_security('slow.example')
+
+        assert probe == {'tls_version': None, 'headers': []}
+        assert analyzer.probe_cache.get('probe:slow.example') is None
+
+    def test_headers_come_from_one_same_site_redirect(self, data_dir, monkeypatch):
+        analyzer = CompanyAnalyzer(clay_client=None)
+        connection = FakeConnection(responses={
+            ('acme.example', '/'): (301, [('Location', 'https://www.acme.example/')]),
+            ('www.acme.example', '/'): (302, [('Location', '/en/'),
+                                              ('Strict-Transport-Security', 'max-age=1')]),
+        })
+        monkeypatch.setattr(company_analyzer.http.client, 'HTTPSConnection', connection)
+
+        probe = analyzer.probe_domain_security('acme.example')
+
+        assert connection.requests == [('acme.example', '/'), ('www.acme.example', '/')]
+        assert 'strict-transport-security' in probe['headers']
+
+    def test_redirects_off_site_or_to_http_are_not_followed(self, data_dir, monkeypatch):
+        analyzer = CompanyAnalyzer(clay_client=None)
+        connection = FakeConnection(responses={
+            ('acme.example', '/'): (301, [('Location', 'https://acme-cdn.example/')]),
+            ('globex.example', '/'): (301, [('Location', 'http://www.globex.example/')]),
+        })
+        monkeypatch.setattr(company_analyzer.http.client, 'HTTPSConnection', connection)
+
+        analyzer.probe_domain_security('acme.example')
+        analyzer.probe_domain_security('globex.example')
+
+        assert connection.requests == [('acme.example', '/'), ('globex.example', '/')]
+
+
+class FakeApiResponse:
+    def __init__(self, status_code: int, headers=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.headers = headers or {}
+
+
+class FakeApiSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        response = self.responses[self.calls]
+        self.calls += 1
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class TestThrottledGet:
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(company_analyzer.time, 'sleep', sleeps.append)
+        return sleeps
+
+    def test_throttle_slows_the_host_and_retries_after_retry_after(self, analyzer, sleeps):
+        analyzer.session = FakeApiSession(FakeApiResponse(429, {'Retry-After': '7'}),
+                                          FakeApiResponse(200))
+        host = 'api.github.com'
+        start_rate = analyzer.rate_limiter.get_rate(host)
+
+        analyzer._lookup_state.incomplete = False
+        response = analyzer._get(f'https://{host}/search/code')
+
+        assert response.status_code == 200
+        assert 7.0 in sleeps
+        assert analyzer.rate_limiter.get_rate(host) == pytest.approx(start_rate / 2)
+        assert not analyzer._lookup_state.incomplete
+
+    def test_retry_after_is_capped(self, analyzer, sleeps):
+        analyzer.session = FakeApiSession(FakeApiResponse(503, {'Retry-After': '3600'}),
+                                          FakeApiResponse(200))
+
+        analyzer._get('https://serpapi.com/search')
+
+        assert CompanyAnalyzer.MAX_RETRY_AFTER in sleeps
+
+    def test_exhausted_retries_mark_the_pass_incomplete(self, analyzer, sleeps):
+        analyzer.session = FakeApiSession(*[FakeApiResponse(429)] * 3)
+
+        analyzer._lookup_state.incomplete = False
+        response = analyzer._get('https://haveibeenpwned.com/api/v3/breaches')
+
+        assert response.status_code == 429
+        assert analyzer.session.calls == CompanyAnalyzer.MAX_THROTTLE_RETRIES + 1
+        assert analyzer._lookup_state.incomplete
+
+    def test_request_error_marks_the_pass_incomplete(self, analyzer, sleeps):
+        analyzer.session = FakeApiSession(requests.ConnectionError('reset'))
+
+        analyzer._lookup_state.incomplete = False
+        with pytest.raises(requests.ConnectionError):
+            analyzer._get('https://api.github.com/search/code')
+
+        assert analyzer._lookup_state.incomplete
+
+
+class RecordingClay:
+    """Answers pain_signals queries from a fixed row list and records each query"""
+
+    def __init__(self, rows=(), error=None):
+        self.rows = list(rows)
+        self.error = error
+        self.queries = []
+
+    def query_table(self, table_name, filters, projection=None):
+        self.queries.append((table_name, filters))
+        if self.error:
+            raise self.error
+        return self.rows
+
+
+class TestRecentSignalsPrefetch:
+    @pytest.fixture
+    def recent_rows(self):
+        now = datetime.utcnow()
+        return [
+            {'domain': 'old.example', 'signal_date': (now - timedelta(days=400)).isoformat()},
+            {'domain': 'hit.example', 'signal_date': (now - timedelta(days=400)).isoformat()},
+            {'domain': 'hit.example', 'signal_epoch': time.time() - 86400},
+            {'domain': 'iso.example', 'signal_date': (now - timedelta(days=3)).isoformat() + 'Z'},
+            {'domain': 'other.example', 'signal_epoch': time.time()},
+        ]
+
+    def test_one_query_answers_the_whole_batch(self, data_dir, recent_rows):
+        clay = RecordingClay(recent_rows)
+        analyzer = CompanyAnalyzer(clay_client=clay)
+        domains = ['old.example', 'hit.example', 'iso.example', 'none.example']
+
+        recent = analyzer.prefetch_recent_signals(domains)
+
+        assert recent == {'old.example': False, 'hit.example': True,
+                          'iso.example': True, 'none.example': False}
+        assert len(clay.queries) == 1
+        assert clay.queries[0][1]['domain'] == {'$in': domains}
+
+    def test_lookups_in_the_batch_are_served_from_the_prefetch(self, data_dir):
+        clay = RecordingClay()
+        analyzer = CompanyAnalyzer(clay_client=clay)
+        analyzer._recent_signals_cache = {'hit.example': True, 'none.example': False}
+
+        assert analyzer.has_recent_security_issues('hit.example')
+        assert not analyzer.has_recent_security_issues('none.example')
+        assert clay.queries == []
+
+    def test_failed_prefetch_falls_back_to_per_domain_lookups(self, data_dir, recent_rows):
+        analyzer = CompanyAnalyzer(clay_client=RecordingClay(error=RuntimeError('down')))
+        assert analyzer.prefetch_recent_signals(['hit.example']) == {}
+
+        clay = RecordingClay(recent_rows)
+        analyzer.clay_client = clay
+        analyzer._recent_signals_cache = {}
+
+        assert analyzer.has_recent_security_issues('hit.example')
+        assert clay.queries == [('pain_signals', {'domain': 'hit.example'})]
@@ -0,0 +1,150 @@
+import io
+import json
+import os
+import sys
+from datetime import datetime, timezone
+
+import ijson
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from collectors.free_darkweb_monitor import FreeThreatsMonitor
+from config.settings import config
+
+
+def iter_victims(payload) -> list:
+    """Run _iter_victims over a JSON body without building a configured monitor"""
+    monitor = object.__new__(FreeThreatsMonitor)
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    return list(monitor._iter_victims(io.BytesIO(body)))
+
+
+VICTIMS = [
+    {'post_title': 'Acme Corp', 'group_name': 'lockbit', 'discovered': '2024-05-01T10:00:00Z'},
+    {'post_title': 'Globex', 'group_name': 'akira', 'discovered': 1714557600},
+]
+
+
+class TestIterVictims:
+    def test_top_level_array(self):
+        assert iter_victims(VICTIMS) == VICTIMS
+
+    def test_victims_key(self):
+        assert iter_victims({'victims': VICTIMS, 'count': 2}) == VICTIMS
+
+    def test_data_key(self):
+        assert iter_victims({'data': VICTIMS}) == VICTIMS
+
+    def test_object_without_a_victim_list(self):
+        assert iter_victims({'status': 'ok', 'results': VICTIMS}) == []
+
+    def test_non_list_victims_value(self):
+        assert iter_victims({'victims': {'post_title': 'Acme Corp'}}) == []
+
+    def test_empty_body_is_a_json_error(self):
+        # check_ransomware_victims logs ijson.JSONError as an invalid response
+        with pytest.raises(ijson.JSONError):
+            iter_victims(b'')
+
+    def test_floats_are_not_decimals(self):
+        victims = iter_victims([{'post_title': 'Acme Corp', 'discovered': 1714557600.5}])
+
+        assert type(victims[0]['discovered']) is float
+
+    def test_array_items_are_yielded_as_they_are_parsed(self):
+        # A top-level array is not materialized: the first victim is
+        # available before the rest of the body has been parsed
+        monitor = object.__new__(FreeThreatsMonitor)
+        body = b'[' + json.dumps(VICTIMS[0]).encode() + b', {"post_title": '  # truncated
+        victims = monitor._iter_victims(io.BytesIO(body))
+
+        assert next(victims) == VICTIMS[0]
+
+
+class TestRunCollection:
+    def test_collects_and_counts_threats_without_a_webhook(self, monkeypatch, caplog):
+        monkeypatch.setattr(config, 'CLAY_WEBHOOK_URL', None)
+        monitor = object.__new__(FreeThreatsMonitor)
+        collected = []
+
+        def collect_all_threats():
+            for victim in VICTIMS:
+                collected.append(victim)
+                yield victim
+        monitor.collect_all_threats = collect_all_threats
+
+        with caplog.at_level('INFO'):
+            monitor.run_collection()
+
+        assert collected == VICTIMS
+        assert 'Found 2 threat signals' in caplog.text
+        assert 'will not be sent' in caplog.text
+
+
+class FakeRaw(io.BytesIO):
+    """urllib3-style raw body: a byte stream carrying the response headers"""
+
+    def __init__(self, body: bytes, headers: dict):
+        super().__init__(body)
+        self.headers = headers
+        self.decode_content = False
+
+
+class FakeStreamResponse:
+    def __init__(self, status_code: int, body: bytes = b'', headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.raw = FakeRaw(body, self.headers)
+        self.content = body
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None, stream=False):
+        self.requests.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+class TestRansomwareConditionalGet:
+    @pytest.fixture
+    def monitor(self):
+        monitor = FreeThreatsMonitor(None)
+        recent = [{'post_title': 'Acme Corp', 'group_name': 'lockbit',
+                   'discovered': datetime.now(timezone.utc).isoformat()}]
+        monitor.session = FakeSession(
+            FakeStreamResponse(200, json.dumps(recent).encode(), {'ETag': '"v1"'}),
+            FakeStreamResponse(304, headers={'ETag': '"v1"'}),
+        )
+        return monitor
+
+    def expire_cache(self, monitor):
+        monitor._response_cache = {
+            url: (0.0,) + entry[1:] for url, entry in monitor._response_cache.items()
+        }
+
+    def test_unchanged_list_is_revalidated_and_not_reparsed(self, monitor):
+        assert [s.company_name for s in monitor.check_ransomware_victims()] == ['Acme Corp']
+
+        self.expire_cache(monitor)
+        assert list(monitor.check_ransomware_victims()) == []
+        assert monitor.session.requests[1]['If-None-Match'] == '"v1"'
+
+    def test_fresh_validators_skip_the_request(self, monitor):
+        list(monitor.check_ransomware_victims())
+
+        assert list(monitor.check_ransomware_victims()) == []
+        assert len(monitor.session.requests) == 1
+
+    def test_partly_read_list_is_fetched_in_full_next_time(self, monitor):
+        victims = monitor.check_ransomware_victims()
+        next(victims)
+        victims.close()
+
+        assert monitor._response_cache == {}
@@ -0,0 +1,125 @@
+import os
+import re
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from collectors import insurance_intel
+from collectors.insurance_intel import InsuranceIntelCollector, _SEC_UNION, _capped_matches
+from collectors.rate_limit import AdaptiveRateLimiter
+
+# Two alternatives, each capturing its company name in its own named group
+UNION = re.compile(r'(?P<pre>[A-Z]\w+ Inc) was hacked|breach at (?P<post>[A-Z]\w+ Corp)')
+
+
+class CountingPattern:
+    """Wraps a compiled pattern and counts how many matches finditer handed out"""
+
+    def __init__(self, pattern):
+        self.groupindex = pattern.groupindex
+        self._pattern = pattern
+        self.consumed = 0
+
+    def finditer(self, text):
+        for match in self._pattern.finditer(text):
+            self.consumed += 1
+            yield match
+
+
+class TestCappedMatches:
+    def test_caps_each_alternative_separately(self):
+        text = ('Alpha Inc was hacked. Beta Inc was hacked. Gamma Inc was hacked. '
+                'breach at Delta Corp. breach at Omega Corp.')
+
+        assert list(_capped_matches(UNION, text, 2)) == [
+            'Alpha Inc', 'Beta Inc', 'Delta Corp', 'Omega Corp'
+        ]
+
+    def test_alternative_below_its_cap_keeps_matching(self):
+        text = 'Alpha Inc was hacked. Beta Inc was hacked. breach at Delta Corp.'
+
+        assert list(_capped_matches(UNION, text, 1)) == ['Alpha Inc', 'Delta Corp']
+
+    def test_stops_scanning_once_every_alternative_is_capped(self):
+        text = ('Alpha Inc was hacked. breach at Delta Corp. '
+                + 'Beta Inc was hacked. ' * 50)
+        pattern = CountingPattern(UNION)
+
+        assert list(_capped_matches(pattern, text, 1)) == ['Alpha Inc', 'Delta Corp']
+        assert pattern.consumed == 2
+
+    def test_no_matches(self):
+        assert list(_capped_matches(UNION, 'nothing to see here', 3)) == []
+
+    def test_extractor_union_matches_like_the_stdlib_engine(self):
+        # _SEC_UNION runs on RE2 when google-re2 is installed; it must report
+        # the same alternatives (via lastgroup) as the stdlib engine would
+        text = ('Acme Widgets Inc renewed its cyber insurance. '
+                'Our cyber liability review covered Globex Corp')
+        stdlib = re.compile(_SEC_UNION.pattern, re.IGNORECASE)
+
+        names = list(_capped_matches(_SEC_UNION, text, 3))
+        assert names == list(_capped_matches(stdlib, text, 3))
+        assert names[0] == 'Acme Widgets Inc'
+        assert len(names) == 2
+
+    def test_stdlib_fallback_is_case_insensitive(self, monkeypatch):
+        monkeypatch.setattr(insurance_intel, 're2', None)
+        pattern = insurance_intel._compile_extractor(
+            r'(?P<pre>[A-Z]\w+ Inc) was hacked|breach at (?P<post>[A-Z]\w+ Corp)'
+        )
+
+        assert isinstance(pattern, re.Pattern)
+        assert list(_capped_matches(pattern, 'alpha inc was hacked', 1)) == ['alpha inc']
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.responses = [FakeResponse(status, {'Retry-After': '5'}) for status in statuses]
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        response = self.responses[self.calls]
+        self.calls += 1
+        return response
+
+
+def collector_with(session) -> InsuranceIntelCollector:
+    """A collector wired to a fake session and an unpaced rate limiter"""
+    collector = object.__new__(InsuranceIntelCollector)
+    collector.session = session
+    collector.rate_limiter = AdaptiveRateLimiter(default_rate=1000.0, max_rate=1000.0)
+    return collector
+
+
+class TestThrottledGet:
+    def test_retries_a_throttled_request_after_retry_after(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr(insurance_intel.time, 'sleep', sleeps.append)
+        session = FakeSession([429, 200])
+
+        response = collector_with(session)._get('https://www.sec.gov/cgi-bin/browse-edgar')
+
+        assert response.status_code == 200
+        assert session.responses[0].closed
+        assert 5.0 in sleeps  # the rate limiter may also pace the retry
+
+    def test_gives_up_and_logs_after_the_retry_budget(self, monkeypatch, caplog):
+        monkeypatch.setattr(insurance_intel.time, 'sleep', lambda seconds: None)
+        session = FakeSession([503] * 3)
+
+        response = collector_with(session)._get('https://news.google.com/rss/search')
+
+        assert response.status_code == 503
+        assert session.calls == InsuranceIntelCollector.MAX_THROTTLE_RETRIES + 1
+        assert 'Giving up on https://news.google.com/rss/search' in caplog.text
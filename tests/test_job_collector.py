@@ -0,0 +1,144 @@
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from collectors.job_collector import JobPostingCollector
+from collectors.signal import SignalRecord
+
+
+class FakeClay:
+    """Records bulk upserts in the order they complete; the first call is slow"""
+
+    api_key = 'test-key'
+
+    def __init__(self):
+        self.upserts = []
+        self._lock = threading.Lock()
+        self._calls = 0
+
+    def bulk_upsert(self, table_name, rows, unique_key='domain'):
+        with self._lock:
+            self._calls += 1
+            first = self._calls == 1
+        if first:
+            time.sleep(0.05)
+        with self._lock:
+            self.upserts.append((table_name, list(rows)))
+        return {}
+
+
+def vacancy(domain: str, job_title: str) -> SignalRecord:
+    return SignalRecord(
+        domain=domain,
+        signal_type='skills_gap_moderate',
+        signal_date='2024-05-01T00:00:00',
+        signal_strength=0.5,
+        raw_data={'company_name': domain.split('.')[0].title(), 'job_title': job_title,
+                  'location': 'Remote'},
+        source='indeed'
+    )
+
+
+class TestBulkUpsertChunks:
+    def test_pain_signal_chunks_are_sent_in_order(self, monkeypatch):
+        monkeypatch.setattr(JobPostingCollector, 'UPSERT_CHUNK_SIZE', 2)
+        collector = JobPostingCollector(FakeClay())
+        # Two postings for the same domain land in different chunks
+        jobs = [vacancy('acme.com', 'Security Analyst'), vacancy('globex.com', 'SOC Manager'),
+                vacancy('acme.com', 'CISO')]
+
+        collector._bulk_upsert_chunks('pain_signals', jobs, 1)
+
+        assert [rows for _, rows in collector.clay_client.upserts] == [jobs[:2], jobs[2:]]
+
+    def test_company_chunks_go_out_concurrently(self, monkeypatch):
+        monkeypatch.setattr(JobPostingCollector, 'UPSERT_CHUNK_SIZE', 1)
+        collector = JobPostingCollector(FakeClay())
+        companies = [{'domain': 'acme.com'}, {'domain': 'globex.com'}]
+
+        collector._bulk_upsert_chunks('company_universe', companies, 2)
+
+        # The slow first chunk finishes last
+        assert [rows for _, rows in collector.clay_client.upserts] == [companies[1:], companies[:1]]
+
+    def test_push_upserts_companies_then_ordered_signals(self, monkeypatch):
+        monkeypatch.setattr(JobPostingCollector, 'UPSERT_CHUNK_SIZE', 2)
+        collector = JobPostingCollector(FakeClay())
+        jobs = [vacancy('acme.com', 'Security Analyst'), vacancy('globex.com', 'SOC Manager'),
+                vacancy('acme.com', 'CISO')]
+
+        collector.push_to_clay(jobs)
+
+        upserts = collector.clay_client.upserts
+        assert [table for table, _ in upserts] == ['company_universe', 'pain_signals', 'pain_signals']
+        assert [company['domain'] for company in upserts[0][1]] == ['acme.com', 'globex.com']
+        assert [rows for _, rows in upserts[1:]] == [jobs[:2], jobs[2:]]
+
+
+class TestVacancySignals:
+    def test_posting_becomes_one_pain_signal_row(self):
+        collector = JobPostingCollector(None)
+        job = {'company': 'Acme, Inc', 'jobtitle': 'Director of Security',
+               'formattedLocation': 'Austin, TX', 'date': '75 days ago', 'url': 'https://jobs.example/1'}
+
+        record = collector.process_job_posting(job)
+
+        assert isinstance(record, SignalRecord)
+        assert record.domain == 'acme.com'
+        assert record.signal_type == 'executive_vacancy_critical'
+        assert record.signal_strength == 0.8
+        assert record.source == 'indeed'
+        # raw_data holds only the posting details, not a copy of the signal fields
+        assert record.raw_data == {'company_name': 'Acme, Inc', 'job_title': 'Director of Security',
+                                   'location': 'Austin, TX', 'posted_date': '75 days ago',
+                                   'days_open': 75, 'url': 'https://jobs.example/1'}
+
+    def test_postings_of_one_company_share_the_interned_name(self):
+        collector = JobPostingCollector(None)
+        first = collector.process_job_posting({'company': ''.join(['Glo', 'bex']), 'date': 'today'})
+        second = collector.process_job_posting({'company': ''.join(['Globe', 'x']), 'date': 'today'})
+
+        assert first.raw_data['company_name'] is second.raw_data['company_name']
+        assert first.signal_type == 'recent_posting'
+
+
+LINKEDIN_HTML = '''
+<ul>
+  <li><div class="base-card job-search-card">
+    <h3 class="base-search-card__title job-search-card__title"> Chief Information Security Officer </h3>
+    <h4 class="job-search-card__subtitle"> Initech </h4>
+    <span class="job-search-card__location">Dallas, TX</span>
+    <time datetime="2020-01-01">Jan 2020</time>
+  </div></li>
+  <li><div class="job-search-card">
+    <h3 class="job-search-card__title">Security Engineer</h3>
+    <h4 class="job-search-card__subtitle">Hooli</h4>
+    <time datetime="2999-01-01">future</time>
+  </div></li>
+  <li><div class="job-search-card-ad">
+    <h3 class="job-search-card__title">Sponsored</h3>
+    <h4 class="job-search-card__subtitle">Ads Co</h4>
+    <time datetime="2020-01-01">Jan 2020</time>
+  </div></li>
+</ul>
+'''
+
+
+class TestParseLinkedInJobSearch:
+    def test_keeps_cards_open_more_than_30_days(self):
+        collector = JobPostingCollector(None)
+
+        records = collector.parse_linkedin_job_search(LINKEDIN_HTML, 'CISO')
+
+        assert [(r.domain, r.signal_type, r.source) for r in records] == [
+            ('initech.com', 'executive_vacancy_critical', 'linkedin_direct')
+        ]
+        assert records[0].raw_data['job_title'] == 'Chief Information Security Officer'
+        assert records[0].raw_data['location'] == 'Dallas, TX'
+        assert records[0].raw_data['search_term'] == 'CISO'
+
+    def test_empty_page_has_no_postings(self):
+        assert JobPostingCollector(None).parse_linkedin_job_search('', 'CISO') == []
@@ -0,0 +1,121 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from collectors import rate_limit
+from collectors.rate_limit import AdaptiveRateLimiter, TokenBucket
+
+
+class FakeClock:
+    """Stands in for time.monotonic/time.sleep; sleeping advances the clock"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limit.time, 'monotonic', fake.monotonic)
+    monkeypatch.setattr(rate_limit.time, 'sleep', fake.sleep)
+    return fake
+
+
+class TestTokenBucket:
+    def test_starts_full_and_allows_a_burst(self, clock):
+        bucket = TokenBucket(capacity=3, rate=1.0, last_refill=clock.now)
+
+        assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert clock.sleeps == []
+
+    def test_waits_for_the_next_token_once_empty(self, clock):
+        bucket = TokenBucket(capacity=1, rate=2.0, last_refill=clock.now)
+        bucket.acquire()
+
+        assert bucket.acquire() == pytest.approx(0.5)
+        assert clock.sleeps == [pytest.approx(0.5)]
+
+    def test_negative_tokens_reserve_future_slots_in_order(self, clock, monkeypatch):
+        # Callers that arrive together must not all wake at the same moment:
+        # each reservation pushes the next caller one refill interval later
+        monkeypatch.setattr(rate_limit.time, 'sleep', lambda seconds: None)
+        bucket = TokenBucket(capacity=1, rate=1.0, last_refill=clock.now)
+
+        delays = [bucket.acquire() for _ in range(4)]
+
+        assert delays == [0.0, pytest.approx(1.0), pytest.approx(2.0), pytest.approx(3.0)]
+        assert bucket.tokens == pytest.approx(-3.0)
+
+    def test_refill_is_capped_at_capacity(self, clock):
+        bucket = TokenBucket(capacity=2, rate=1.0, last_refill=clock.now)
+        bucket.acquire()
+        bucket.acquire()
+
+        clock.now += 100
+        assert [bucket.acquire() for _ in range(2)] == [0.0, 0.0]
+        assert bucket.acquire() == pytest.approx(1.0)
+
+
+class TestAdaptiveRateLimiter:
+    def test_uses_initial_rate_per_host_and_default_otherwise(self):
+        limiter = AdaptiveRateLimiter(initial_rates={'a.example': 0.5}, default_rate=2.0)
+
+        assert limiter.get_rate('a.example') == 0.5
+        assert limiter.get_rate('b.example') == 2.0
+
+    def test_throttle_halves_rate_down_to_min_rate(self):
+        limiter = AdaptiveRateLimiter(default_rate=1.0, min_rate=0.2)
+
+        limiter.record_throttle('h')
+        assert limiter.get_rate('h') == pytest.approx(0.5)
+        limiter.record_throttle('h')
+        limiter.record_throttle('h')
+        assert limiter.get_rate('h') == pytest.approx(0.2)
+
+    def test_success_streak_increases_rate_up_to_max_rate(self):
+        limiter = AdaptiveRateLimiter(default_rate=1.0, max_rate=1.15,
+                                      success_streak=3, increase_factor=1.1)
+
+        for _ in range(2):
+            limiter.record_success('h')
+        assert limiter.get_rate('h') == 1.0
+
+        limiter.record_success('h')
+        assert limiter.get_rate('h') == pytest.approx(1.1)
+
+        for _ in range(3):
+            limiter.record_success('h')
+        assert limiter.get_rate('h') == pytest.approx(1.15)
+
+    def test_throttle_resets_the_success_streak(self):
+        limiter = AdaptiveRateLimiter(default_rate=1.0, success_streak=3, increase_factor=2.0)
+
+        limiter.record_success('h')
+        limiter.record_success('h')
+        limiter.record_throttle('h')
+        limiter.record_success('h')
+        limiter.record_success('h')
+        assert limiter.get_rate('h') == pytest.approx(0.5)
+
+        limiter.record_success('h')
+        assert limiter.get_rate('h') == pytest.approx(1.0)
+
+    def test_wait_spaces_requests_per_host(self, clock):
+        limiter = AdaptiveRateLimiter(initial_rates={'slow': 0.5, 'fast': 4.0})
+
+        limiter.wait('slow')
+        limiter.wait('fast')
+        limiter.wait('slow')
+
+        assert clock.sleeps == [pytest.approx(2.0)]
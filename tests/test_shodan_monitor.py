@@ -0,0 +1,119 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from collectors import shodan_monitor
+from collectors.shodan_monitor import ShodanMonitor
+
+RESULTS = [
+    {'ip_str': '10.0.0.1', 'port': 3306, 'product': 'MySQL',
+     'data': 'mysql_native_password anonymous login allowed'},
+    {'ip_str': '10.0.0.2', 'port': 22, 'product': 'OpenSSH', 'data': 'SSH-2.0-OpenSSH_8.9'},
+    {'ip_str': '10.0.0.3', 'port': 502, 'product': 'Modbus gateway',
+     'data': 'Device with default password and a backdoor'},
+    {'ip_str': '10.0.0.4', 'port': 443, 'product': 'nginx', 'data': 'HTTP/1.1 200 OK'},
+]
+
+
+@pytest.fixture(params=['automaton', 'substring'])
+def monitor(request, monkeypatch):
+    if request.param == 'substring':
+        monkeypatch.setattr(shodan_monitor, 'ahocorasick', None)
+    return ShodanMonitor('test-key')
+
+
+def categorize(monitor, results) -> tuple:
+    exposures, critical_findings = {}, []
+    for result in results:
+        monitor._categorize_exposures(exposures, critical_findings, dict(result))
+    return exposures, critical_findings
+
+
+class TestCategorizeExposures:
+    def test_uses_the_automaton_when_available(self, monitor):
+        assert (monitor._exposure_automaton is None) == (shodan_monitor.ahocorasick is None)
+
+    def test_categories_and_critical_findings(self, monitor):
+        exposures, critical_findings = categorize(monitor, RESULTS)
+
+        assert [(e['ip'], e['type']) for e in exposures['databases']] == [('10.0.0.1', 'mysql')]
+        assert [(e['ip'], e['type']) for e in exposures['remote_access']] == [('10.0.0.2', 'ssh')]
+        assert [(e['ip'], e['type']) for e in exposures['industrial_systems']] == [('10.0.0.3', 'modbus')]
+        assert [(f['type'], f['ip']) for f in critical_findings] == [
+            ('exposed_database', '10.0.0.1'),
+            ('iot_vulnerability', '10.0.0.3'),
+            ('iot_vulnerability', '10.0.0.3'),
+        ]
+        assert [f['description'] for f in critical_findings[1:]] == [
+            'IoT device with default_password', 'IoT device with backdoor'
+        ]
+
+    def test_remote_access_only_matches_the_banner(self, monitor):
+        # 'ssh' in the product alone is not a remote access exposure
+        exposures, _ = categorize(monitor, [{'ip_str': '10.0.0.5', 'port': 22,
+                                             'product': 'ssh-proxy', 'data': 'ready'}])
+
+        assert 'remote_access' not in exposures
+
+    def test_keyword_straddling_product_and_banner_is_not_matched(self, monitor):
+        exposures, _ = categorize(monitor, [{'ip_str': '10.0.0.6', 'port': 6379,
+                                             'product': 'red', 'data': 'is up'}])
+
+        assert exposures == {}
+
+    def test_precomputed_haystack_matches_the_raw_fields(self, monitor):
+        signals = monitor._analyze_shodan_results([dict(r) for r in RESULTS],
+                                                  {'company_name': 'Acme', 'domain': 'acme.example'})
+
+        assert sorted(s['signal_type'] for s in signals) == [
+            'exposed_database', 'exposed_databases', 'exposed_industrial_systems',
+            'exposed_remote_access', 'iot_vulnerability', 'iot_vulnerability',
+        ]
+
+
+class FakeShodanApi:
+    """Records search calls and answers with fixed port facets"""
+
+    def __init__(self, port_facets):
+        self.port_facets = port_facets
+        self.searches = []
+
+    def search(self, query, **kwargs):
+        self.searches.append((query, kwargs))
+        return {'matches': [], 'total': 0, 'facets': {'port': self.port_facets}}
+
+
+class TestScanCriticalPorts:
+    @pytest.fixture
+    def api(self, monitor):
+        monitor.api = FakeShodanApi([
+            {'value': 443, 'count': 12},
+            {'value': 3389, 'count': 2},
+            {'value': 8080, 'count': 5},  # not a critical port
+            {'value': 22, 'count': 1},
+        ])
+        return monitor.api
+
+    def test_one_faceted_search_per_domain(self, monitor, api):
+        signals = monitor.scan_critical_ports('acme.example')
+
+        assert api.searches == [('hostname:acme.example', {'limit': 1, 'facets': [('port', 25)]})]
+        assert [(s['raw_data']['port'], s['raw_data']['exposure_count'], s['raw_data']['severity'])
+                for s in signals] == [('22', 1, 'MEDIUM'), ('443', 12, 'MEDIUM'), ('3389', 2, 'HIGH')]
+
+    def test_repeat_scan_is_served_from_the_query_cache(self, monitor, api):
+        monitor.scan_critical_ports('acme.example')
+        monitor.scan_critical_ports('acme.example')
+
+        assert len(api.searches) == 1
+
+    def test_api_error_yields_no_signals(self, monitor):
+        class FailingApi:
+            def search(self, query, **kwargs):
+                raise shodan_monitor.shodan.exception.APIError('Invalid API key')
+        monitor.api = FailingApi()
+
+        assert monitor.scan_critical_ports('acme.example') == []
@@ -0,0 +1,112 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from collectors import ttl_cache
+from collectors.ttl_cache import DiskTTLCache, MemoryTTLCache
+
+
+class FakeClock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestDiskTTLCache:
+    def test_get_returns_stored_value(self, tmp_path):
+        cache = DiskTTLCache(str(tmp_path / 'cache.db'), ttl=60)
+        cache.set('probe:a.com', {'tls_version': 'TLSv1.3', 'headers': []})
+
+        assert cache.get('probe:a.com') == {'tls_version': 'TLSv1.3', 'headers': []}
+        assert cache.get('probe:missing') is None
+
+    def test_expired_row_is_deleted_on_get(self, tmp_path, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(ttl_cache.time, 'time', clock)
+        cache = DiskTTLCache(str(tmp_path / 'cache.db'), ttl=60)
+        cache.set('probe:a.com', {'headers': []})
+
+        clock.now += 60
+        assert cache.get('probe:a.com') == {'headers': []}
+
+        clock.now += 1
+        assert cache.get('probe:a.com') is None
+        assert len(cache) == 0
+
+    def test_expired_rows_are_purged_at_open(self, tmp_path, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(ttl_cache.time, 'time', clock)
+        path = str(tmp_path / 'cache.db')
+        cache = DiskTTLCache(path, ttl=60)
+        cache.set('old', 1)
+        clock.now += 30
+        cache.set('new', 2)
+
+        clock.now += 45
+        reopened = DiskTTLCache(path, ttl=60)
+        assert len(reopened) == 1
+        assert reopened.get('new') == 2
+
+    def test_periodic_purge_on_set(self, tmp_path, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(ttl_cache.time, 'time', clock)
+        monkeypatch.setattr(DiskTTLCache, 'PURGE_EVERY', 3)
+        cache = DiskTTLCache(str(tmp_path / 'cache.db'), ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+
+        clock.now += 61
+        cache.set('c', 3)
+
+        assert len(cache) == 1
+        assert cache.get('c') == 3
+
+    def test_max_entries_keeps_newest_rows(self, tmp_path, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(ttl_cache.time, 'time', clock)
+        cache = DiskTTLCache(str(tmp_path / 'cache.db'), ttl=60, max_entries=2)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key)
+            clock.now += 1
+
+        cache.purge()
+        assert len(cache) == 2
+        assert cache.get('a') is None
+        assert cache.get('c') == 'c'
+
+
+class TestMemoryTTLCache:
+    def test_get_returns_stored_value(self):
+        cache = MemoryTTLCache(maxsize=10, ttl=60)
+        cache.set('search:x', {'matches': [1]})
+
+        assert cache.get('search:x') == {'matches': [1]}
+        assert cache.get('search:missing') is None
+
+    def test_entry_expires_after_ttl(self, monkeypatch):
+        clock = FakeClock()
+        monkeypatch.setattr(ttl_cache.time, 'monotonic', clock)
+        cache = MemoryTTLCache(maxsize=10, ttl=60)
+        cache.set('host:1.2.3.4', {'ports': [22]})
+
+        clock.now += 59
+        assert cache.get('host:1.2.3.4') == {'ports': [22]}
+
+        clock.now += 1
+        assert cache.get('host:1.2.3.4') is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used_past_maxsize(self):
+        cache = MemoryTTLCache(maxsize=2, ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert len(cache) == 2
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3